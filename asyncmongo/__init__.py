@@ -1,5 +1,27 @@
-__all__ = ["AsyncMongoClient", "AsyncMongoConnection", "Database"]
+__all__ = [
+    "AsyncMongoClient",
+    "AsyncMongoConnection",
+    "CommandListener",
+    "Database",
+    "DeleteMany",
+    "DeleteOne",
+    "InsertOne",
+    "ReadPreference",
+    "ReplaceOne",
+    "UpdateMany",
+    "UpdateOne",
+]
 
 from .client import AsyncMongoClient
 from .connection import AsyncMongoConnection
 from .database import Database
+from .monitoring import CommandListener
+from .operations import (
+    DeleteMany,
+    DeleteOne,
+    InsertOne,
+    ReplaceOne,
+    UpdateMany,
+    UpdateOne,
+)
+from .read_preferences import ReadPreference
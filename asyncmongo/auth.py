@@ -1,6 +1,9 @@
 from .utils.saslprep import saslprep
+import asyncio
+import functools
 import hashlib
 import hmac
+import logging
 import os
 import typing
 from base64 import standard_b64encode, standard_b64decode
@@ -10,6 +13,8 @@ from asyncmongo.exceptions import AuthenticationFailedError
 
 from .utils import _xor
 
+logger = logging.getLogger(__name__)
+
 
 MongoCredential = namedtuple(
     "MongoCredential",
@@ -18,6 +23,91 @@ MongoCredential = namedtuple(
 """A hashable namedtuple of values used for authentication."""
 
 
+def _derive_keys(password: bytes, salt: bytes, iterations: int) -> tuple[bytes, bytes]:
+    """
+    Derives the SCRAM-SHA-256 client and server keys. This is the expensive part
+    of authentication and is meant to run in an executor.
+
+    Args:
+        password (bytes): The SASLprep'ed, UTF-8 encoded password.
+        salt (bytes): The decoded salt sent by the server.
+        iterations (int): The iteration count sent by the server.
+
+    Returns:
+        tuple[bytes, bytes]: The client key and the server key.
+    """
+    salted_pass = hashlib.pbkdf2_hmac("sha256", password, salt, iterations)
+    client_key = hmac.HMAC(salted_pass, b"Client Key", hashlib.sha256).digest()
+    server_key = hmac.HMAC(salted_pass, b"Server Key", hashlib.sha256).digest()
+    return client_key, server_key
+
+
+def _check_reply(resp: dict):
+    """
+    Raises the error of a failed step of the SASL conversation, e.g. bad credentials.
+
+    Args:
+        resp (dict): The reply to `saslStart` or `saslContinue`.
+
+    Raises:
+        AuthenticationFailedError: If the server failed the command.
+    """
+    if not resp.get("ok"):
+        raise AuthenticationFailedError(
+            f"{resp.get('errmsg', 'Authentication failed')} (code {resp.get('code')})"
+        )
+
+
+class ScramCache:
+    """
+    Caches SCRAM keys per (password, salt, iterations), so connections opened after
+    the first one authenticate without re-running PBKDF2.
+    """
+
+    def __init__(self):
+        self._keys: dict[tuple[bytes, bytes, int], tuple[bytes, bytes]] = {}
+        self._pending: dict[tuple[bytes, bytes, int], asyncio.Future] = {}
+
+    async def get_keys(
+        self, password: bytes, salt: bytes, iterations: int
+    ) -> tuple[bytes, bytes]:
+        """
+        Returns the client and server keys, deriving them in the loop's default
+        executor on a cache miss. Concurrent misses for the same key share one
+        derivation.
+
+        Args:
+            password (bytes): The SASLprep'ed, UTF-8 encoded password.
+            salt (bytes): The decoded salt sent by the server.
+            iterations (int): The iteration count sent by the server.
+
+        Returns:
+            tuple[bytes, bytes]: The client key and the server key.
+        """
+        key = (password, salt, iterations)
+        if key in self._keys:
+            return self._keys[key]
+
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                None, _derive_keys, password, salt, iterations
+            )
+            future.add_done_callback(functools.partial(self._on_derived, key))
+            self._pending[key] = future
+
+        # Shielded so a cancelled caller does not cancel the derivation for the others
+        return await asyncio.shield(future)
+
+    def _on_derived(self, key: tuple[bytes, bytes, int], future: asyncio.Future):
+        """
+        Stores the keys once a derivation finishes successfully.
+        """
+        del self._pending[key]
+        if not future.cancelled() and future.exception() is None:
+            self._keys[key] = future.result()
+
+
 async def try_authenticate(connection, credentials: MongoCredential):
     username = credentials.username
     user = username.encode("utf-8").replace(b"=", b"=3D").replace(b",", b"=2C")
@@ -38,8 +128,9 @@ async def try_authenticate(connection, credentials: MongoCredential):
         resp = await connection.command(command=cmd, database_name=credentials.source)
     except Exception as e:
         raise AuthenticationFailedError(e)
+    _check_reply(resp)
 
-    print(resp)
+    logger.debug("Started SCRAM conversation %s", resp.get("conversationId"))
     server_first = resp["payload"]
 
     # make as a new function parse
@@ -55,33 +146,55 @@ async def try_authenticate(connection, credentials: MongoCredential):
     salt = parsed[b"s"]
     rnonce = parsed[b"r"]
     without_proof = b"c=biws,r=" + rnonce
-    client_key, csalt, citerations = None, None, None
     data = saslprep(credentials.password).encode("utf-8")
 
     _hmac = hmac.HMAC
     digestmod = hashlib.sha256
 
     # Salt and / or iterations could change for a number of different
-    # reasons. Either changing invalidates the cache.
-    if not client_key or salt != csalt or iterations != citerations:
-        salted_pass = hashlib.pbkdf2_hmac(
-            "sha256", data, standard_b64decode(salt), iterations
+    # reasons. Either changing misses the cache.
+    cache = credentials.cache if isinstance(credentials.cache, ScramCache) else None
+    if cache is not None:
+        client_key, server_key = await cache.get_keys(
+            data, standard_b64decode(salt), iterations
+        )
+    else:
+        client_key, server_key = await asyncio.get_running_loop().run_in_executor(
+            None, _derive_keys, data, standard_b64decode(salt), iterations
         )
-        client_key = _hmac(salted_pass, b"Client Key", digestmod).digest()
-        # server_key = _hmac(salted_pass, b"Server Key", digestmod).digest()
-        # cache.data = (client_key, server_key, salt, iterations)
     stored_key = digestmod(client_key).digest()
     auth_msg = b",".join((first_bare, server_first, without_proof))
     client_sig = _hmac(stored_key, auth_msg, digestmod).digest()
     client_proof = b"p=" + standard_b64encode(_xor(client_key, client_sig))
     client_final = b",".join((without_proof, client_proof))
-    # server_sig = standard_b64encode(_hmac(server_key, auth_msg, digestmod).digest())
+    server_sig = standard_b64encode(_hmac(server_key, auth_msg, digestmod).digest())
     cmd = {
         "saslContinue": 1,
         "conversationId": resp["conversationId"],
         "payload": client_final,
     }
     resp = await connection.command(command=cmd, database_name="admin")
+    _check_reply(resp)
+
+    parsed = dict(
+        typing.cast(typing.Tuple[bytes, bytes], item.split(b"=", 1))
+        for item in resp.get("payload", b"").split(b",")
+        if b"=" in item
+    )
+    if not hmac.compare_digest(parsed.get(b"v", b""), server_sig):
+        raise AuthenticationFailedError("Server returned an invalid signature.")
+
+    # Servers that ignore skipEmptyExchange expect one more, empty, round trip
+    if not resp.get("done"):
+        cmd = {
+            "saslContinue": 1,
+            "conversationId": resp["conversationId"],
+            "payload": b"",
+        }
+        resp = await connection.command(command=cmd, database_name="admin")
+        _check_reply(resp)
 
     if not resp.get("done"):
         raise Exception("Could not authenticate with server")
+
+    logger.debug("Authenticated as %s on %s", username, credentials.source)
@@ -0,0 +1,261 @@
+import logging
+
+from asyncmongo.cursor import AggregateCursor
+from asyncmongo.exceptions import ConnectionClosedError, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Server error codes after which a change stream can resume on another cursor
+_RESUMABLE_CODES = frozenset(
+    [
+        6,  # HostUnreachable
+        7,  # HostNotFound
+        43,  # CursorNotFound
+        63,  # StaleShardVersion
+        89,  # NetworkTimeout
+        91,  # ShutdownInProgress
+        133,  # FailedToSatisfyReadPreference
+        150,  # StaleEpoch
+        189,  # PrimarySteppedDown
+        234,  # RetryChangeStream
+        262,  # ExceededTimeLimit
+        9001,  # SocketException
+        10107,  # NotWritablePrimary
+        11600,  # InterruptedAtShutdown
+        11602,  # InterruptedDueToReplStateChange
+        13388,  # StaleConfig
+        13435,  # NotPrimaryNoSecondaryOk
+        13436,  # NotPrimaryOrSecondary
+    ]
+)
+
+
+def _is_resumable(error: Exception) -> bool:
+    """
+    Whether a change stream may resume after an error.
+
+    Args:
+        error (Exception): The error raised while fetching changes.
+
+    Returns:
+        bool: True for network errors and for resumable server errors.
+    """
+    if isinstance(error, (OSError, ConnectionClosedError)):
+        return True
+    if isinstance(error, OperationFailure):
+        labels = (error.details or {}).get("errorLabels", [])
+        return "ResumableChangeStreamError" in labels or error.code in _RESUMABLE_CODES
+    return False
+
+
+class ChangeStream:
+    """
+    Iterates over the changes made to a collection or database, tailing a
+    `$changeStream` aggregation cursor:
+
+        async with client.exampleDB.users.watch() as stream:
+            async for change in stream:
+                print(change["operationType"], change["documentKey"])
+
+    The stream keeps track of the resume token of the last change it returned. After
+    a network error or a resumable server error it opens a new cursor resuming after
+    that token, so no change is missed or returned twice. The token can also be
+    saved and passed to `watch(resume_after=...)` to continue in a later process.
+    """
+
+    def __init__(
+        self,
+        collection,
+        pipeline: list[dict] | None = None,
+        full_document: str | None = None,
+        resume_after: dict | None = None,
+        start_after: dict | None = None,
+        max_await_time_ms: int | None = None,
+        batch_size: int = 0,
+        aggregate: str | int | None = None,
+    ):
+        """
+        Initializes a ChangeStream instance. The cursor is opened by `async with`
+        or by the first call to `try_next`.
+
+        Args:
+            collection: The collection to watch.
+            pipeline (list[dict] | None): Stages applied to the change events, e.g.
+                                          a `$match`. Defaults to None.
+            full_document (str | None): "updateLookup" to include the current version
+                        of the document in update events. Defaults to None.
+            resume_after (dict | None): Start after the change with this resume token.
+                        Defaults to None.
+            start_after (dict | None): Like `resume_after`, but may also start after
+                        an invalidate event. Defaults to None.
+            max_await_time_ms (int | None): How long the server waits for new changes
+                        before returning an empty batch. Defaults to None (server default).
+            batch_size (int): Maximum number of changes per batch. Defaults to 0
+                        (server default).
+            aggregate (str | int | None): The target of the `aggregate` command.
+                        Defaults to None, the collection; 1 watches the whole database.
+        """
+        self._collection = collection
+        self._pipeline = list(pipeline or [])
+        self._full_document = full_document
+        self._resume_after = resume_after
+        self._start_after = start_after
+        self._max_await_time_ms = max_await_time_ms
+        self._batch_size = batch_size
+        self._aggregate = aggregate
+
+        self._resume_token = start_after or resume_after
+        self._returned_change = False
+        self._cursor: AggregateCursor | None = None
+        self._closed = False
+
+    @property
+    def resume_token(self) -> dict | None:
+        """
+        The token to resume the stream from, after the last change returned.
+
+        Returns:
+            dict | None: The token, or None before the server returned any.
+        """
+        return self._resume_token
+
+    @property
+    def alive(self) -> bool:
+        """
+        Whether the stream may still return changes.
+
+        Returns:
+            bool: False once the stream was closed or invalidated, e.g. because
+                  the collection was dropped.
+        """
+        return not self._closed and (self._cursor is None or self._cursor.alive)
+
+    def _create_cursor(self) -> AggregateCursor:
+        """
+        Creates the `$changeStream` cursor, resuming after the current resume token.
+
+        Returns:
+            AggregateCursor: The cursor. Its `aggregate` command runs on the first refresh.
+        """
+        options = {}
+        if self._full_document is not None:
+            options["fullDocument"] = self._full_document
+        if self._resume_token is not None:
+            # startAfter is only needed until the first change, which may follow
+            # an invalidate event resumeAfter cannot start after
+            if self._start_after is not None and not self._returned_change:
+                options["startAfter"] = self._resume_token
+            else:
+                options["resumeAfter"] = self._resume_token
+
+        return AggregateCursor(
+            self._collection,
+            [{"$changeStream": options}] + self._pipeline,
+            batch_size=self._batch_size,
+            max_await_time_ms=self._max_await_time_ms,
+            read_preference=self._collection.read_preference,
+            aggregate=self._aggregate,
+        )
+
+    async def _refresh(self):
+        """
+        Fetches the next batch of changes, resuming once on a new cursor if the
+        current one failed with a resumable error. The failed cursor is killed
+        first, so it does not linger on the server until garbage collected.
+        """
+        cursor = self._cursor
+        # The previous batch was consumed, e.g. the empty first batch of the
+        # `aggregate`, so its token is the position to resume from
+        if not cursor._data and cursor._post_batch_resume_token is not None:
+            self._resume_token = cursor._post_batch_resume_token
+        try:
+            await cursor._refresh()
+        except Exception as e:
+            if not _is_resumable(e):
+                raise
+            logger.debug("Resuming change stream after %r", e)
+            try:
+                await cursor.close()
+            except Exception:
+                logger.debug("Failed to kill the change stream cursor", exc_info=True)
+            self._cursor = self._create_cursor()
+            await self._cursor._refresh()
+
+    async def try_next(self) -> dict | None:
+        """
+        Returns the next change, waiting at most one `getMore` for it.
+
+        Returns:
+            dict | None: The change, or None if none arrived within `max_await_time_ms`.
+
+        Raises:
+            OperationFailure: If the server failed the command, or if a change has
+                              no resume token because the pipeline removed its `_id`.
+        """
+        if self._closed:
+            return None
+        if self._cursor is None:
+            self._cursor = self._create_cursor()
+        if not self._cursor._data and self._cursor.alive:
+            await self._refresh()
+
+        cursor = self._cursor
+        if not cursor._data:
+            if cursor._post_batch_resume_token is not None:
+                self._resume_token = cursor._post_batch_resume_token
+            return None
+
+        change = cursor._data.popleft()
+        if "_id" not in change:
+            await self.close()
+            raise OperationFailure(
+                "Cannot provide resume functionality when the resume token is missing"
+            )
+        self._resume_token = change["_id"]
+        self._returned_change = True
+        # Once the batch is consumed, the batch's token is at least as recent
+        if not cursor._data and cursor._post_batch_resume_token is not None:
+            self._resume_token = cursor._post_batch_resume_token
+        return change
+
+    def __aiter__(self) -> "ChangeStream":
+        return self
+
+    async def __anext__(self) -> dict:
+        """
+        Waits for the next change.
+
+        Returns:
+            dict: The change event.
+
+        Raises:
+            StopAsyncIteration: Once the stream is closed or invalidated.
+        """
+        while self.alive:
+            change = await self.try_next()
+            if change is not None:
+                return change
+        raise StopAsyncIteration
+
+    async def close(self):
+        """
+        Closes the stream, killing its cursor on the server.
+        """
+        self._closed = True
+        if self._cursor is not None:
+            await self._cursor.close()
+
+    async def __aenter__(self) -> "ChangeStream":
+        """
+        Opens the change stream, so changes made from now on are returned.
+
+        Returns:
+            ChangeStream: The stream.
+        """
+        if self._cursor is None:
+            self._cursor = self._create_cursor()
+            await self._refresh()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -1,8 +1,15 @@
+import contextlib
+from typing import AsyncIterator
+
 from asyncmongo.connection import AsyncMongoConnection
 from asyncmongo.database import Database
+from asyncmongo.exceptions import ConnectionClosedError
+from asyncmongo.monitoring import CommandLatencies
+from asyncmongo.read_preferences import ReadPreference
+from asyncmongo.topology import Topology
 from asyncmongo.uri_parser import parse_uri
 
-from .client_options import ClientOptions
+from .client_options import ClientOptions, parse_uri_options
 
 
 class AsyncMongoClient:
@@ -10,20 +17,24 @@ class AsyncMongoClient:
     Represents an asynchronous MongoDB client, providing connection management and database access.
     """
 
-    connection: AsyncMongoConnection
+    options: ClientOptions
+    topology: Topology
 
     @classmethod
     async def create(
-        cls, host: str | None = "localhost", port: int | None = 27017
+        cls, host: str | None = "localhost", port: int | None = 27017, **kwargs
     ) -> "AsyncMongoClient":
         """
         Creates an instance of AsyncMongoClient, initializing the connection to MongoDB.
 
         Args:
             host (str | None): The hostname or URI of the MongoDB server. Defaults to "localhost".
-                              If a URI is provided, it will be parsed to extract connection details.
+                              If a URI is provided, it will be parsed to extract connection details,
+                              including a seed list of several hosts.
             port (int | None): The port number for the MongoDB server. Defaults to 27017.
                               Ignored if `host` is a URI.
+            **kwargs: Additional ClientOptions fields such as `max_pool_size` or
+                      `min_pool_size`. These take precedence over options given in the URI.
 
         Returns:
             AsyncMongoClient: An instance of the MongoDB client.
@@ -34,19 +45,74 @@ class AsyncMongoClient:
         # Case where host is a URI
         if "://" in host:
             uri_dict = parse_uri(host)
-            host, port = uri_dict.get("nodelist")
+            seeds = uri_dict.get("nodelist")
+            kwargs = {**parse_uri_options(uri_dict.get("options")), **kwargs}
             options = ClientOptions(
                 username=uri_dict.get("username"),
                 password=uri_dict.get("password"),
                 database=uri_dict.get("database"),
                 options=uri_dict.get("options"),
+                **kwargs,
             )
         else:
-            options = ClientOptions()
+            seeds = [(host, port)]
+            options = ClientOptions(**kwargs)
 
-        self.connection = await AsyncMongoConnection.create(host, port, options)
+        self.options = options
+        self.topology = await Topology.create(seeds, options)
         return self
 
+    async def close(self):
+        """
+        Closes every connection held by the client.
+        """
+        await self.topology.close()
+
+    @property
+    def command_latencies(self) -> CommandLatencies:
+        """
+        Latency histograms of every command the client has run, by command name:
+
+            client.command_latencies["find"].percentile(99)
+
+        Returns:
+            CommandLatencies: The client's histograms.
+        """
+        return self.options.command_latencies
+
+    @contextlib.asynccontextmanager
+    async def _get_connection(
+        self,
+        address: tuple[str, int] | None = None,
+        read_preference: ReadPreference | None = None,
+    ) -> AsyncIterator[AsyncMongoConnection]:
+        """
+        Selects a server and checks a connection out of its pool.
+
+        A network error raised in the `async with` block marks the server as
+        unknown, so later operations fail over to another server.
+
+        Args:
+            address (tuple[str, int] | None): Use this server instead of selecting
+                one, e.g. to reach the server holding a cursor. Defaults to None.
+            read_preference (ReadPreference | None): Select a server for a read with
+                this preference. Defaults to None, which selects a writable server.
+
+        Yields:
+            AsyncMongoConnection: A connection, returned to the pool on exit.
+        """
+        if address is None:
+            server = await self.topology.select_server(read_preference)
+        else:
+            server = self.topology.get_server(address)
+
+        try:
+            async with server.pool.checkout() as conn:
+                yield conn
+        except (OSError, ConnectionClosedError) as e:
+            self.topology.mark_unknown(server, e)
+            raise
+
     def __getattr__(self, name: str) -> Database:
         """
         Accesses a database instance using attribute-style access.
@@ -1,4 +1,31 @@
-from dataclasses import dataclass
+import logging
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from asyncmongo.auth import MongoCredential, ScramCache
+from asyncmongo.compression import registered_compressors
+from asyncmongo.monitoring import CommandLatencies, CommandListener
+from asyncmongo.read_preferences import PRIMARY, ReadPreference, parse_tag_set
+from asyncmongo.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Maps the (case-insensitive) URI option names onto ClientOptions fields
+_URI_OPTIONS = {
+    "maxpoolsize": ("max_pool_size", int),
+    "minpoolsize": ("min_pool_size", int),
+    "waitqueuetimeoutms": ("wait_queue_timeout_ms", int),
+    "maxidletimems": ("max_idle_time_ms", int),
+    "compressors": ("compressors", lambda value: value.split(",")),
+    "zlibcompressionlevel": ("zlib_compression_level", int),
+    "replicaset": ("replica_set", str),
+    "directconnection": ("direct_connection", lambda value: value.lower() == "true"),
+    "localthresholdms": ("local_threshold_ms", int),
+    "heartbeatfrequencyms": ("heartbeat_frequency_ms", int),
+    "serverselectiontimeoutms": ("server_selection_timeout_ms", int),
+    "connecttimeoutms": ("connect_timeout_ms", int),
+}
 
 
 @dataclass
@@ -7,3 +34,117 @@ class ClientOptions:
     password: str | None = None
     database: str | None = None
     options: dict | None = None
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    wait_queue_timeout_ms: int | None = None
+    max_idle_time_ms: int | None = None
+    compressors: list[str] | None = None
+    zlib_compression_level: int | None = None
+    compression_min_size: int = 0
+    event_listeners: list[CommandListener] = field(default_factory=list)
+    replica_set: str | None = None
+    direct_connection: bool | None = None
+    local_threshold_ms: int = 15
+    heartbeat_frequency_ms: int = 10000
+    server_selection_timeout_ms: int = 30000
+    connect_timeout_ms: int = 20000
+    read_preference: ReadPreference = PRIMARY
+    # Replies of at least decode_threshold bytes are decoded in this executor so they
+    # do not block the event loop. A ThreadPoolExecutor suits the pure Python decoder,
+    # which lets the loop run between bytecodes; a ProcessPoolExecutor also works but
+    # unpickling the decoded reply holds the GIL for about as long as decoding it
+    decode_executor: Executor | None = None
+    decode_threshold: int = 1 << 20
+
+    @cached_property
+    def credentials(self) -> MongoCredential | None:
+        """
+        The credentials connections authenticate with. Built once per client, so
+        every connection shares the same SCRAM key cache.
+
+        Returns:
+            MongoCredential | None: The credentials, or None without a username and password.
+        """
+        if not (self.username and self.password):
+            return None
+        return MongoCredential(
+            mechanism="SCRAM-SHA-256",
+            source=self.database,
+            username=self.username,
+            password=self.password,
+            mechanism_properties="",
+            cache=ScramCache(),
+        )
+
+    @cached_property
+    def wire_compressors(self) -> list[str]:
+        """
+        The compressors offered to the server in `hello`: those of `compressors`
+        that are registered. The others are skipped with a warning, as the server
+        could otherwise pick a compressor the client cannot use.
+
+        Returns:
+            list[str]: The compressor names, in order of preference.
+        """
+        names = self.compressors or []
+        supported = registered_compressors(names)
+        unsupported = [name for name in names if name not in supported]
+        if unsupported:
+            logger.warning(
+                "Ignoring unsupported compressors %s; register them with "
+                "asyncmongo.compression.register_compressor",
+                ", ".join(unsupported),
+            )
+        return supported
+
+    @cached_property
+    def command_latencies(self) -> CommandLatencies:
+        """
+        The latency histograms of every command run by connections using these
+        options, shared by all connections of a client.
+
+        Returns:
+            CommandLatencies: The histograms by command name.
+        """
+        return CommandLatencies()
+
+    @cached_property
+    def result_caches(self) -> dict[str, ResultCache]:
+        """
+        The result caches enabled with `Collection.enable_cache`, by namespace, so
+        every Collection instance of a client shares them.
+
+        Returns:
+            dict[str, ResultCache]: The caches by "database.collection" name.
+        """
+        return {}
+
+
+def parse_uri_options(options: dict | None) -> dict:
+    """
+    Translates the options of a MongoDB URI into ClientOptions keyword arguments.
+
+    Args:
+        options (dict | None): The raw options parsed from the URI query string.
+
+    Returns:
+        dict: Keyword arguments for ClientOptions. Unknown options are ignored.
+    """
+    kwargs = {}
+    read_preference = {}
+    for key, value in (options or {}).items():
+        if key.lower() in _URI_OPTIONS:
+            name, cast = _URI_OPTIONS[key.lower()]
+            kwargs[name] = cast(value)
+        elif key.lower() == "readpreference":
+            read_preference["mode"] = value
+        elif key.lower() == "readpreferencetags":
+            # Repeated in the URI, one value per tag set in order of preference
+            values = value if isinstance(value, list) else [value]
+            read_preference["tag_sets"] = [parse_tag_set(v) for v in values]
+        elif key.lower() == "maxstalenessseconds":
+            read_preference["max_staleness_seconds"] = int(value)
+
+    if read_preference:
+        kwargs["read_preference"] = ReadPreference(**read_preference)
+    return kwargs
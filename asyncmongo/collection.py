@@ -1,4 +1,67 @@
-from asyncmongo.cursor import Cursor
+import asyncio
+import ctypes
+from typing import AsyncIterator
+
+import bson
+
+from asyncmongo.change_stream import ChangeStream
+from asyncmongo.cursor import AggregateCursor, Cursor
+from asyncmongo.exceptions import DocumentTooLargeError
+from asyncmongo.message import MORE_TO_COME, OP_MSG, sequence_overhead
+from asyncmongo.prepared import PreparedFindOne
+from asyncmongo.read_preferences import ReadPreference
+from asyncmongo.result_cache import ResultCache
+
+# Write commands and the field holding their documents
+_WRITE_COMMANDS = {"insert": "documents", "update": "updates", "delete": "deletes"}
+
+
+def _write_flags(cmd: dict, write_concern: dict | None) -> int:
+    """
+    Adds a write concern to a write command.
+
+    Args:
+        cmd (dict): The write command, updated in place.
+        write_concern (dict | None): The write concern, e.g. {"w": 0}. Defaults to
+                                     the server's when None.
+
+    Returns:
+        int: The OP_MSG flags to send the command with: `MORE_TO_COME` for
+        unacknowledged writes, so the server sends no reply, else 0.
+    """
+    if write_concern is None:
+        return 0
+    cmd["writeConcern"] = write_concern
+    if write_concern.get("w") == 0 and not write_concern.get("j"):
+        return MORE_TO_COME
+    return 0
+
+
+def _split_batches(
+    documents: list[bytes], max_count: int, max_size: int
+) -> list[tuple[int, list[bytes]]]:
+    """
+    Splits encoded documents into batches that respect the server's write limits.
+
+    Args:
+        documents (list[bytes]): BSON-encoded documents, in order.
+        max_count (int): Maximum number of documents per batch.
+        max_size (int): Maximum total size in bytes of the documents in a batch.
+
+    Returns:
+        list[tuple[int, list[bytes]]]: Each batch together with the index of its
+        first document in `documents`.
+    """
+    batches = []
+    start, size = 0, 0
+    for index, doc in enumerate(documents):
+        if index > start and (index - start == max_count or size + len(doc) > max_size):
+            batches.append((start, documents[start:index]))
+            start, size = index, 0
+        size += len(doc)
+    if start < len(documents):
+        batches.append((start, documents[start:]))
+    return batches
 
 
 class Collection:
@@ -6,32 +69,391 @@ class Collection:
     Represents a MongoDB collection, providing methods to perform CRUD operations.
     """
 
-    def __init__(self, database, name: str):
+    def __init__(
+        self, database, name: str, read_preference: ReadPreference | None = None
+    ):
         """
         Initializes a Collection instance.
 
         Args:
             database: The database instance containing this collection.
             name (str): Name of the collection.
+            read_preference (ReadPreference | None): The read preference of reads from
+                the collection. Defaults to None, which uses the database's.
         """
         self._name = name
         self._database = database
+        self._read_preference = read_preference
+
+    @property
+    def read_preference(self) -> ReadPreference:
+        """
+        The read preference of reads from the collection.
+
+        Returns:
+            ReadPreference: The collection's read preference, or the database's if unset.
+        """
+        return self._read_preference or self._database.read_preference
+
+    @property
+    def cache(self) -> ResultCache | None:
+        """
+        The result cache of the collection, shared by every Collection instance of
+        the same namespace on a client.
+
+        Returns:
+            ResultCache | None: The cache, or None unless `enable_cache` was called.
+        """
+        return self._database._client.options.result_caches.get(self._full_name)
+
+    @property
+    def _full_name(self) -> str:
+        return f"{self._database.name}.{self._name}"
+
+    def enable_cache(
+        self, max_entries: int = 1024, ttl: float = 60.0, max_documents: int = 100
+    ) -> ResultCache:
+        """
+        Caches the results of `find_one` and of finds returning few documents, e.g.
+        for hot reference data:
+
+            countries = client.exampleDB.countries
+            countries.enable_cache(ttl=300)
+            await countries.find_one({"code": "IN"})  # Queries the server
+            await countries.find_one({"code": "IN"})  # Answered from the cache
+            countries.cache.stats.hits  # 1
+
+        Writes through any Collection of this namespace on the client invalidate the
+        cache. Writes by other clients are only seen once entries expire. Raw finds
+        and prepared `find_one` commands bypass the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached queries. Defaults to 1024.
+            ttl (float): Seconds a result stays cached. Defaults to 60.
+            max_documents (int): Finds returning more documents are not cached.
+                                 Defaults to 100.
 
-    async def insert_one(self, doc) -> dict:
+        Returns:
+            ResultCache: The new cache, replacing any previous one.
+        """
+        cache = ResultCache(max_entries, ttl, max_documents)
+        self._database._client.options.result_caches[self._full_name] = cache
+        return cache
+
+    def disable_cache(self):
+        """
+        Stops caching the results of queries on the collection.
+        """
+        self._database._client.options.result_caches.pop(self._full_name, None)
+
+    def _invalidate_cache(self):
+        cache = self.cache
+        if cache is not None:
+            cache.invalidate()
+
+    def with_options(
+        self, read_preference: ReadPreference | None = None
+    ) -> "Collection":
+        """
+        Returns a copy of the collection with different options, e.g.:
+
+            events = client.exampleDB.events.with_options(read_preference=NEAREST)
+
+        Args:
+            read_preference (ReadPreference | None): The new read preference.
+                                                     Defaults to None (unchanged).
+
+        Returns:
+            Collection: The new Collection instance.
+        """
+        return Collection(
+            self._database, self._name, read_preference or self._read_preference
+        )
+
+    async def insert_one(self, doc, write_concern: dict | None = None) -> dict | None:
         """
         Inserts a single document into the collection.
 
         Args:
             doc (dict): The document to insert.
+            write_concern (dict | None): The write concern, e.g. {"w": "majority"}.
+                With {"w": 0} the insert is not acknowledged: it returns as soon as
+                it is written to the socket, and errors are not reported.
+                Defaults to None (server default).
 
         Returns:
-            dict: The result of the insert operation.
+            dict | None: The result of the insert operation, or None if unacknowledged.
         """
         cmd = {"insert": self._name, "ordered": True, "documents": [doc]}
-        conn = self._database._get_connection()
-        return await conn.command(command=cmd, database_name=self._database.name)
+        flag_bits = _write_flags(cmd, write_concern)
+        try:
+            async with self._database._get_connection() as conn:
+                return await conn.command(
+                    command=cmd, database_name=self._database.name, flag_bits=flag_bits
+                )
+        finally:
+            self._invalidate_cache()
+
+    async def insert_many(
+        self, docs: list[dict], ordered: bool = True, write_concern: dict | None = None
+    ) -> dict | None:
+        """
+        Inserts multiple documents into the collection.
+
+        The documents are sent as an OP_MSG document sequence and split into as many
+        `insert` commands as the server's `maxWriteBatchSize` and `maxMessageSizeBytes`
+        require.
+
+        Args:
+            docs (list[dict]): The documents to insert.
+            ordered (bool): If True, stop at the first failed insert. If False, attempt
+                            every insert regardless of failures. Defaults to True.
+            write_concern (dict | None): The write concern. With {"w": 0} the batches
+                are not acknowledged: the call returns once they are written to the
+                socket, and errors are not reported. Defaults to None (server default).
+
+        Returns:
+            dict | None: The combined result, with the total `n` inserted and any
+                         `writeErrors` indexed relative to `docs`, or None if
+                         unacknowledged.
+
+        Raises:
+            DocumentTooLargeError: If a document exceeds the server's `maxBsonObjectSize`.
+        """
+        cmd = {"insert": self._name, "ordered": ordered}
+        documents = [bson.dumps(doc) for doc in docs]
+        try:
+            return await self._write_batches(
+                cmd, "documents", documents, ordered, write_concern=write_concern
+            )
+        finally:
+            self._invalidate_cache()
+
+    async def bulk_write(self, requests: list, ordered: bool = True) -> dict:
+        """
+        Executes a mix of insert, update, replace and delete operations.
+
+        Operations of the same kind are coalesced into a single `insert`, `update` or
+        `delete` command, split by the server's size limits. In ordered mode only
+        consecutive operations are coalesced, they run one after another and execution
+        stops at the first error. In unordered mode all operations of a kind are
+        coalesced and every resulting batch is sent concurrently.
+
+        Args:
+            requests (list): InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne
+                             and DeleteMany operations from `asyncmongo.operations`.
+            ordered (bool): Whether to execute the operations in order. Defaults to True.
+
+        Returns:
+            dict: The combined result with `nInserted`, `nMatched`, `nModified`,
+                  `nRemoved`, `nUpserted`, `upserted` and `writeErrors` indexed
+                  relative to `requests`.
+
+        Raises:
+            TypeError: If a request is not a supported operation.
+            DocumentTooLargeError: If a document exceeds the server's `maxBsonObjectSize`.
+        """
+        # Group the operations into runs of (command name, indexes into requests)
+        runs: list[tuple[str, list[int]]] = []
+        for index, request in enumerate(requests):
+            command = getattr(request, "_command", None)
+            if command not in _WRITE_COMMANDS:
+                raise TypeError(f"{request!r} is not a valid bulk write operation")
+            if ordered:
+                if not runs or runs[-1][0] != command:
+                    runs.append((command, []))
+                runs[-1][1].append(index)
+            else:
+                run = next((run for run in runs if run[0] == command), None)
+                if run is None:
+                    run = (command, [])
+                    runs.append(run)
+                run[1].append(index)
+
+        async def execute(command: str, indexes: list[int]) -> tuple[str, dict]:
+            cmd = {command: self._name, "ordered": ordered}
+            documents = [bson.dumps(requests[i]._to_document()) for i in indexes]
+            identifier = _WRITE_COMMANDS[command]
+            return command, await self._write_batches(
+                cmd, identifier, documents, ordered, indexes
+            )
+
+        try:
+            if ordered:
+                results = []
+                for command, indexes in runs:
+                    results.append(await execute(command, indexes))
+                    if not results[-1][1].get("ok") or "writeErrors" in results[-1][1]:
+                        break
+            else:
+                results = await asyncio.gather(
+                    *[execute(command, indexes) for command, indexes in runs]
+                )
+        finally:
+            self._invalidate_cache()
+
+        bulk_result = {
+            "ok": 1.0,
+            "nInserted": 0,
+            "nUpserted": 0,
+            "nMatched": 0,
+            "nModified": 0,
+            "nRemoved": 0,
+            "upserted": [],
+            "writeErrors": [],
+        }
+        for command, result in results:
+            upserted = result.get("upserted", [])
+            if command == "insert":
+                bulk_result["nInserted"] += result["n"]
+            elif command == "update":
+                bulk_result["nMatched"] += result["n"] - len(upserted)
+                bulk_result["nModified"] += result.get("nModified", 0)
+                bulk_result["nUpserted"] += len(upserted)
+                bulk_result["upserted"].extend(upserted)
+            else:
+                bulk_result["nRemoved"] += result["n"]
+            bulk_result["writeErrors"].extend(result.get("writeErrors", []))
+            if "writeConcernErrors" in result:
+                bulk_result.setdefault("writeConcernErrors", []).extend(
+                    result["writeConcernErrors"]
+                )
+            if not result.get("ok"):
+                bulk_result.update(
+                    {k: result[k] for k in ("ok", "errmsg", "code") if k in result}
+                )
+        bulk_result["writeErrors"].sort(key=lambda error: error["index"])
+        bulk_result["upserted"].sort(key=lambda upsert: upsert["index"])
+        return bulk_result
+
+    async def _write_batches(
+        self,
+        cmd: dict,
+        identifier: str,
+        documents: list[bytes],
+        ordered: bool,
+        indexes: list[int] | None = None,
+        write_concern: dict | None = None,
+    ) -> dict | None:
+        """
+        Runs a write command over batches of documents and merges the replies.
+
+        Ordered writes run their batches one after another on a single connection
+        and stop after the first batch reporting an error. Unordered writes send
+        every batch concurrently, each on its own pooled connection, so they run as
+        far in parallel as the pool allows. Unacknowledged
+        writes are written one after another to a single connection, their pace set
+        by how fast the socket drains.
 
-    def find(self, filter: dict | None = None, skip: int = 0, limit: int = 0) -> Cursor:
+        Args:
+            cmd (dict): The write command without its documents, e.g. {"insert": name}.
+            identifier (str): The command field the documents belong to.
+            documents (list[bytes]): The BSON-encoded documents.
+            ordered (bool): Whether the batches must run in order.
+            indexes (list[int] | None): The index reported for each document in
+                                        `writeErrors` and `upserted`. Defaults to its
+                                        position in `documents`.
+            write_concern (dict | None): The write concern. Defaults to None.
+
+        Returns:
+            dict | None: The combined result of all batches, or None if unacknowledged.
+
+        Raises:
+            DocumentTooLargeError: If a document exceeds the server's `maxBsonObjectSize`.
+        """
+        if indexes is None:
+            indexes = list(range(len(documents)))
+        cmd = dict(cmd)
+        flag_bits = _write_flags(cmd, write_concern)
+
+        async def run(conn, batch: list[bytes]) -> dict | None:
+            return await conn.command(
+                database_name=self._database.name,
+                command=dict(cmd),
+                sequences={identifier: batch},
+                flag_bits=flag_bits,
+            )
+
+        async def run_on_new_connection(batch: list[bytes]) -> dict:
+            async with self._database._get_connection() as conn:
+                return await run(conn, batch)
+
+        replies = []
+        async with self._database._get_connection() as conn:
+            for doc in documents:
+                if len(doc) > conn.max_bson_object_size:
+                    raise DocumentTooLargeError(
+                        f"Document of {len(doc)} bytes exceeds the server's "
+                        f"maxBsonObjectSize of {conn.max_bson_object_size} bytes"
+                    )
+
+            # Leave room for the header, the command itself and the sequence header
+            overhead = (
+                ctypes.sizeof(OP_MSG)
+                + len(bson.dumps({**cmd, "$db": self._database.name}))
+                + sequence_overhead(identifier)
+            )
+            batches = _split_batches(
+                documents,
+                conn.max_write_batch_size,
+                conn.max_message_size_bytes - overhead,
+            )
+
+            if flag_bits & MORE_TO_COME:
+                for _, batch in batches:
+                    await run(conn, batch)
+                return None
+            if ordered or len(batches) <= 1:
+                for offset, batch in batches:
+                    reply = await run(conn, batch)
+                    replies.append((offset, reply))
+                    if not reply.get("ok") or "writeErrors" in reply:
+                        break
+
+        if not replies and len(batches) > 1:
+            # Each batch checks out its own connection. This one was returned to the
+            # pool first: holding it while waiting for others deadlocks a full pool
+            results = await asyncio.gather(
+                *[run_on_new_connection(batch) for _, batch in batches]
+            )
+            replies = list(zip([offset for offset, _ in batches], results))
+
+        result = {"n": 0, "ok": 1.0}
+        for offset, reply in replies:
+            if not reply.get("ok"):
+                result.update(
+                    {k: v for k, v in reply.items() if k not in ("n", "writeErrors")}
+                )
+                continue
+
+            for key, value in reply.items():
+                if key in ("writeErrors", "upserted"):
+                    for item in value:
+                        item["index"] = indexes[offset + item["index"]]
+                    result.setdefault(key, []).extend(value)
+                elif key in ("n", "nModified"):
+                    result[key] = result.get(key, 0) + value
+                elif key == "writeConcernError":
+                    result.setdefault("writeConcernErrors", []).append(value)
+
+        return result
+
+    def find(
+        self,
+        filter: dict | None = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = 0,
+        prefetch: int = 0,
+        raw: bool = False,
+        read_preference: ReadPreference | None = None,
+        projection: dict | list[str] | None = None,
+        sort=None,
+        hint: str | list | dict | None = None,
+        max_time_ms: int | None = None,
+        comment=None,
+        exhaust: bool = False,
+    ) -> Cursor:
         """
         Queries the collection for documents matching a filter.
 
@@ -39,19 +461,82 @@ class Collection:
             filter (dict | None): The filter criteria. Defaults to None (no filtering).
             skip (int): Number of documents to skip. Defaults to 0.
             limit (int): Maximum number of documents to return. Defaults to 0 (no limit).
+            batch_size (int): Number of documents per batch. Defaults to 0 (server default).
+            prefetch (int): Number of batches to fetch ahead in the background while
+                            the current one is processed. Defaults to 0 (disabled).
+            raw (bool): Yield RawBSONDocuments backed by the reply buffer, decoding fields
+                        only when accessed, instead of dicts. Defaults to False.
+            read_preference (ReadPreference | None): The members the query may run on.
+                        Defaults to None, which uses the collection's.
+            projection (dict | list[str] | None): The fields to return, as a projection
+                        document or a list of field names. Defaults to None (all).
+            sort: The order of the results, as a list of (field, direction) pairs or
+                  a dict. Defaults to None (natural order).
+            hint (str | list | dict | None): The index to use, by name or key.
+                        Defaults to None.
+            max_time_ms (int | None): Time limit of the query on the server.
+                        Defaults to None (no limit).
+            comment: A comment attached to the query in the server's logs and
+                     profiler. Defaults to None.
+            exhaust (bool): After the first batch, have the server stream the
+                     remaining batches over a dedicated connection without a
+                     round trip per batch. Suits large sequential reads.
+                     Defaults to False.
 
         Returns:
             Cursor: A cursor to iterate over the results.
+
+        Raises:
+            TypeError: If an option has the wrong type.
+            ValueError: If a sort or hint direction is not 1, -1 or a document.
         """
-        return Cursor(self, filter=filter, skip=skip, limit=limit)
+        cursor = Cursor(
+            self,
+            filter=filter,
+            skip=skip,
+            limit=limit,
+            batch_size=batch_size,
+            prefetch=prefetch,
+            raw=raw,
+            read_preference=read_preference or self.read_preference,
+            max_time_ms=max_time_ms,
+            comment=comment,
+            exhaust=exhaust,
+        )
+        if projection is not None:
+            cursor.projection(projection)
+        if sort is not None:
+            cursor.sort(sort)
+        if hint is not None:
+            cursor.hint(hint)
+        return cursor
 
-    async def find_one(self, filter: dict | None = None, skip: int = 0) -> dict | None:
+    async def find_one(
+        self,
+        filter: dict | None = None,
+        skip: int = 0,
+        read_preference: ReadPreference | None = None,
+        projection: dict | list[str] | None = None,
+        sort=None,
+        hint: str | list | dict | None = None,
+        max_time_ms: int | None = None,
+        comment=None,
+    ) -> dict | None:
         """
         Queries the collection for a single document matching a filter.
 
         Args:
             filter (dict | None): The filter criteria. Defaults to None (no filtering).
             skip (int): Number of documents to skip. Defaults to 0.
+            read_preference (ReadPreference | None): The members the query may run on.
+                        Defaults to None, which uses the collection's.
+            projection (dict | list[str] | None): The fields to return. Defaults to None (all).
+            sort: The order in which the first document is picked, as a list of
+                  (field, direction) pairs or a dict. Defaults to None (natural order).
+            hint (str | list | dict | None): The index to use. Defaults to None.
+            max_time_ms (int | None): Time limit of the query on the server.
+                        Defaults to None (no limit).
+            comment: A comment attached to the query. Defaults to None.
 
         Returns:
             dict | None: The first document matching the filter, or None if no match is found.
@@ -59,13 +544,301 @@ class Collection:
         if filter is not None and not isinstance(filter, dict):
             filter = {"_id": filter}
 
-        res = self.find(filter, skip, limit=1)
+        res = self.find(
+            filter,
+            skip,
+            limit=-1,
+            read_preference=read_preference,
+            projection=projection,
+            sort=sort,
+            hint=hint,
+            max_time_ms=max_time_ms,
+            comment=comment,
+        )
 
         async for each in res:
             return each
 
         return None
 
+    async def parallel_scan(
+        self,
+        partitions: int,
+        filter: dict | None = None,
+        batch_size: int = 0,
+        projection: dict | list[str] | None = None,
+        raw: bool = False,
+        sample_size: int | None = None,
+    ) -> list[Cursor]:
+        """
+        Splits a scan of the collection into cursors over disjoint `_id` ranges,
+        which can be consumed concurrently, each on its own pooled connection:
+
+            cursors = await collection.parallel_scan(4)
+            await asyncio.gather(*(export(cursor) for cursor in cursors))
+
+        The range boundaries are quantiles of a random sample of `_id`s, so the
+        partitions hold roughly the same number of documents. Range queries only
+        match `_id`s of the same BSON type as the boundaries, so every document
+        should have an `_id` of the same type, e.g. all ObjectIds.
+
+        Args:
+            partitions (int): The number of cursors wanted. Fewer are returned for
+                              collections too small to split that many ways.
+            filter (dict | None): The filter criteria. Defaults to None (no filtering).
+            batch_size (int): Number of documents per batch. Defaults to 0 (server default).
+            projection (dict | list[str] | None): The fields to return. Defaults to None (all).
+            raw (bool): Yield RawBSONDocuments instead of dicts. Defaults to False.
+            sample_size (int | None): The number of `_id`s sampled to place the
+                        boundaries. Defaults to None, 16 per partition.
+
+        Returns:
+            list[Cursor]: One cursor per partition, in `_id` order.
+
+        Raises:
+            ValueError: If `partitions` is smaller than 1.
+        """
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+
+        boundaries = []
+        if partitions > 1:
+            size = sample_size or partitions * 16
+            pipeline = [
+                {"$sample": {"size": size}},
+                {"$project": {"_id": 1}},
+                {"$sort": {"_id": 1}},
+            ]
+            ids = [doc["_id"] for doc in await self.aggregate(pipeline).to_list()]
+            for i in range(1, partitions if ids else 0):
+                boundary = ids[i * len(ids) // partitions]
+                if not boundaries or boundary != boundaries[-1]:
+                    boundaries.append(boundary)
+
+        cursors = []
+        for lower, upper in zip([None] + boundaries, boundaries + [None]):
+            id_range = {}
+            if lower is not None:
+                id_range["$gte"] = lower
+            if upper is not None:
+                id_range["$lt"] = upper
+            partition_filter = filter
+            if id_range:
+                partition_filter = {"_id": id_range}
+                if filter:
+                    partition_filter = {"$and": [filter, partition_filter]}
+            cursors.append(
+                self.find(
+                    partition_filter,
+                    batch_size=batch_size,
+                    projection=projection,
+                    raw=raw,
+                )
+            )
+        return cursors
+
+    async def parallel_find(
+        self,
+        partitions: int,
+        filter: dict | None = None,
+        batch_size: int = 0,
+        projection: dict | list[str] | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Scans the collection over several connections at once, see `parallel_scan`,
+        yielding the documents of every partition as their batches arrive:
+
+            async for doc in collection.parallel_find(4):
+                write(doc)
+
+        Documents come in no particular order. At most one batch per partition is
+        buffered ahead of the consumer.
+
+        Args:
+            partitions (int): The number of concurrent cursors.
+            filter (dict | None): The filter criteria. Defaults to None (no filtering).
+            batch_size (int): Number of documents per batch. Defaults to 0 (server default).
+            projection (dict | list[str] | None): The fields to return. Defaults to None (all).
+            raw (bool): Yield RawBSONDocuments instead of dicts. Defaults to False.
+
+        Yields:
+            dict: The matching documents.
+        """
+        cursors = await self.parallel_scan(
+            partitions, filter, batch_size=batch_size, projection=projection, raw=raw
+        )
+        queue = asyncio.Queue(len(cursors))
+
+        async def drain(cursor: Cursor):
+            try:
+                async for batch in cursor.batches():
+                    await queue.put(batch)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(drain(cursor)) for cursor in cursors]
+        try:
+            running = len(tasks)
+            while running:
+                batch = await queue.get()
+                if batch is None:
+                    running -= 1
+                elif isinstance(batch, Exception):
+                    raise batch
+                else:
+                    for doc in batch:
+                        yield doc
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def prepare_find_one(
+        self, fields: list[str] = ("_id",), raw: bool = False
+    ) -> PreparedFindOne:
+        """
+        Prepares a `find_one` on a fixed set of filter fields for repeated use.
+
+        The command is encoded once, so each call only serializes the filter values:
+
+            by_id = collection.prepare_find_one()
+            doc = await by_id(some_id)
+
+            by_name = collection.prepare_find_one(fields=["first", "last"])
+            doc = await by_name("James", "Bond")
+
+        Args:
+            fields (list[str]): The names of the filter fields, in the order their
+                                values are passed. Defaults to ("_id",).
+            raw (bool): Return RawBSONDocuments instead of dicts. Defaults to False.
+
+        Returns:
+            PreparedFindOne: An awaitable callable taking one value per field.
+        """
+        return PreparedFindOne(self, fields, raw=raw)
+
+    def aggregate(
+        self,
+        pipeline: list[dict],
+        allow_disk_use: bool | None = None,
+        batch_size: int = 0,
+        max_time_ms: int | None = None,
+        raw: bool = False,
+        read_preference: ReadPreference | None = None,
+    ) -> AggregateCursor:
+        """
+        Runs an aggregation pipeline on the server and iterates over its results:
+
+            totals = collection.aggregate(
+                [{"$group": {"_id": "$country", "count": {"$sum": 1}}}]
+            )
+            async for total in totals:
+                print(total["_id"], total["count"])
+
+        A pipeline ending in `$out` or `$merge` writes its results to a collection
+        instead and returns no documents; it runs on the primary once the returned
+        cursor is awaited or iterated:
+
+            await collection.aggregate([..., {"$out": "totals"}])
+
+        Args:
+            pipeline (list[dict]): The aggregation stages.
+            allow_disk_use (bool | None): Whether stages may write temporary files,
+                        e.g. to sort more data than fits in memory. Defaults to None
+                        (server default).
+            batch_size (int): Number of documents per batch. Defaults to 0 (server default).
+            max_time_ms (int | None): Time limit of the aggregation on the server.
+                        Defaults to None (no limit).
+            raw (bool): Yield RawBSONDocuments that decode fields on access instead of
+                        dicts. Defaults to False.
+            read_preference (ReadPreference | None): The members the aggregation may
+                        run on. Defaults to None, which uses the collection's. Ignored
+                        for `$out` and `$merge` pipelines.
+
+        Returns:
+            AggregateCursor: A cursor over the results, driven by `getMore`.
+        """
+        output = self._output_namespace(pipeline)
+        if output is None:
+            read_preference = read_preference or self.read_preference
+        else:
+            # Pipelines that write run on a writable server, like other writes
+            read_preference = None
+        return AggregateCursor(
+            self,
+            pipeline,
+            batch_size=batch_size,
+            raw=raw,
+            read_preference=read_preference,
+            allow_disk_use=allow_disk_use,
+            max_time_ms=max_time_ms,
+            output=output,
+        )
+
+    def _output_namespace(self, pipeline: list[dict]) -> str | None:
+        """
+        Returns the "database.collection" written by the `$out` or `$merge` stage
+        ending a pipeline, or None if the pipeline does not write.
+        """
+        last = pipeline[-1] if pipeline else {}
+        if "$out" in last:
+            target = last["$out"]
+        elif "$merge" in last:
+            target = last["$merge"]
+            if isinstance(target, dict):
+                target = target["into"]
+        else:
+            return None
+        if isinstance(target, dict):
+            return f"{target.get('db', self._database.name)}.{target['coll']}"
+        return f"{self._database.name}.{target}"
+
+    def watch(
+        self,
+        pipeline: list[dict] | None = None,
+        full_document: str | None = None,
+        resume_after: dict | None = None,
+        start_after: dict | None = None,
+        max_await_time_ms: int | None = None,
+        batch_size: int = 0,
+    ) -> ChangeStream:
+        """
+        Watches the changes made to the collection:
+
+            async with collection.watch([{"$match": {"operationType": "insert"}}]) as stream:
+                async for change in stream:
+                    print(change["fullDocument"])
+
+        Args:
+            pipeline (list[dict] | None): Stages applied to the change events, e.g.
+                                          a `$match`. Defaults to None.
+            full_document (str | None): "updateLookup" to include the current version
+                        of the document in update events. Defaults to None.
+            resume_after (dict | None): Start after the change with this resume token,
+                        e.g. a saved `ChangeStream.resume_token`. Defaults to None.
+            start_after (dict | None): Like `resume_after`, but may also start after
+                        an invalidate event. Defaults to None.
+            max_await_time_ms (int | None): How long the server waits for new changes
+                        before returning an empty batch. Defaults to None (server default).
+            batch_size (int): Maximum number of changes per batch. Defaults to 0
+                        (server default).
+
+        Returns:
+            ChangeStream: The stream, opened by `async with` or when first iterated.
+        """
+        return ChangeStream(
+            self,
+            pipeline,
+            full_document=full_document,
+            resume_after=resume_after,
+            start_after=start_after,
+            max_await_time_ms=max_await_time_ms,
+            batch_size=batch_size,
+        )
+
     async def drop_collection(self):
         """
         Drops the collection from the database.
@@ -73,22 +846,36 @@ class Collection:
         Returns:
             None
         """
-        conn = self._database._get_connection()
         cmd = {"drop": self._name}
-        await conn.command(command=cmd, database_name=self._database.name)
+        try:
+            async with self._database._get_connection() as conn:
+                await conn.command(command=cmd, database_name=self._database.name)
+        finally:
+            self._invalidate_cache()
 
-    async def update_one(self, filter: dict, doc: dict):
+    async def update_one(
+        self, filter: dict, doc: dict, write_concern: dict | None = None
+    ):
         """
         Updates a single document in the collection.
 
         Args:
             filter (dict): The filter criteria to find the document to update.
             doc (dict): The updated document. `_id` will be removed if present.
+            write_concern (dict | None): The write concern. With {"w": 0} the update
+                is not acknowledged and returns once written to the socket.
+                Defaults to None (server default).
 
         Returns:
             None
         """
         doc.pop("_id", None)
-        conn = self._database._get_connection()
         cmd = {"update": self._name, "updates": [{"q": filter, "u": doc}]}
-        await conn.command(command=cmd, database_name=self._database.name)
+        flag_bits = _write_flags(cmd, write_concern)
+        try:
+            async with self._database._get_connection() as conn:
+                await conn.command(
+                    command=cmd, database_name=self._database.name, flag_bits=flag_bits
+                )
+        finally:
+            self._invalidate_cache()
@@ -0,0 +1,318 @@
+"""
+Builds NumPy arrays from query results without materializing each document.
+
+NumPy is an optional dependency, imported only when columns are built:
+
+    pip install asyncmongo[numpy]
+"""
+
+import re
+from datetime import datetime, timezone
+
+from asyncmongo.raw_bson import RawBSONDocument, _decode_value, _iter_elements
+
+# Width and little-endian NumPy type of the fixed-width BSON values read in bulk
+_FIXED_TYPES = {
+    0x01: (8, "<f8"),  # double
+    0x07: (12, "V12"),  # ObjectId, as raw bytes: S12 would strip trailing NULs
+    0x08: (1, "?"),  # boolean
+    0x09: (8, "<i8"),  # UTC datetime, as milliseconds since the epoch
+    0x10: (4, "<i4"),  # int32
+    0x12: (8, "<i8"),  # int64
+}
+_INT_TYPES = frozenset([0x10, 0x12])
+# bson.loads decodes ObjectIds to their 24 lowercase hex digits, as bytes. It
+# decodes binary values to bytes too, which are only mistaken for ObjectIds if
+# they hold exactly such digits
+_OBJECT_ID_HEX = re.compile(rb"[0-9a-f]{24}")
+_MISSING = 0x00  # Not a BSON type, marks fields absent from a document
+_NULL = 0x0A
+
+
+def _import_numpy():
+    """
+    Imports NumPy on first use.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "to_columns requires NumPy, install it with: pip install asyncmongo[numpy]"
+        ) from e
+    return numpy
+
+
+def _infer_dtype(np, types: set[int]):
+    """
+    Picks the column type for the BSON types seen in a field.
+
+    Args:
+        np: The NumPy module.
+        types (set[int]): The BSON element types of the field's values, without nulls.
+
+    Returns:
+        numpy.dtype: float64 for doubles (mixed with integers or not), int64 for
+        integers, bool, datetime64[ms], V12 for ObjectIds, and object otherwise.
+    """
+    if types <= _INT_TYPES:
+        return np.dtype("int64")
+    if types <= _INT_TYPES | {0x01}:
+        return np.dtype("float64")
+    if types == {0x08}:
+        return np.dtype("bool")
+    if types == {0x09}:
+        return np.dtype("datetime64[ms]")
+    if types == {0x07}:
+        return np.dtype("V12")
+    return np.dtype("object")
+
+
+def _element_type(value) -> int | None:
+    """
+    Returns the BSON element type a decoded value was read from, for the types
+    stored in fixed-width columns, so both paths infer the same dtype.
+
+    Args:
+        value: A value of a decoded document, not None.
+
+    Returns:
+        int | None: The BSON element type, or None for other values.
+    """
+    if isinstance(value, bool):
+        return 0x08
+    if isinstance(value, int):
+        return 0x12
+    if isinstance(value, float):
+        return 0x01
+    if isinstance(value, datetime):
+        return 0x09
+    if isinstance(value, bytes) and _OBJECT_ID_HEX.fullmatch(value):
+        return 0x07
+    return None
+
+
+def _scalar(value, dtype):
+    """
+    Converts a decoded value to what a column of `dtype` stores: the 12 bytes of
+    an ObjectId decoded to hex, or the naive UTC time of a datetime.
+    """
+    if dtype.kind == "O":
+        return value
+    if dtype.kind == "V" and isinstance(value, bytes):
+        return bytes.fromhex(value.decode("ascii"))
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _filled(np, dtype, length: int):
+    """
+    Returns an array of missing values: NaN, NaT, None, or zeros for other dtypes.
+    """
+    values = np.zeros(length, dtype)
+    if dtype.kind == "f":
+        values[:] = np.nan
+    elif dtype.kind == "M":
+        values[:] = np.datetime64("NaT")
+    elif dtype.kind == "O":
+        values[:] = None
+    return values
+
+
+class ColumnBuilder:
+    """
+    Accumulates the values of some top-level fields, batch by batch, into arrays.
+
+    Fields of RawBSONDocuments are located by walking the reply buffer, and the
+    numeric, boolean, datetime and ObjectId values of a whole batch are then copied
+    out of it in a single vectorized operation. Other values, and the fields of
+    documents that were already decoded into dicts, are converted one by one.
+    """
+
+    def __init__(
+        self, fields: list[str], dtypes: dict | None = None, mask: bool = True
+    ):
+        """
+        Initializes a ColumnBuilder instance.
+
+        Args:
+            fields (list[str]): The top-level fields to extract.
+            dtypes (dict | None): NumPy dtypes by field. Fields without one get a
+                                  type inferred from their first values.
+                                  Defaults to None.
+            mask (bool): Return masked arrays for fields that are missing or null in
+                         some documents. Otherwise those entries hold NaN, NaT, None
+                         or zero depending on the dtype. Defaults to True.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        self._np = np = _import_numpy()
+        self._fields = list(fields)
+        self._names = {field.encode("utf-8"): i for i, field in enumerate(fields)}
+        self._dtypes = [
+            np.dtype(dtypes[field]) if dtypes and field in dtypes else None
+            for field in fields
+        ]
+        self._mask = mask
+        # Per field, the arrays of each batch, or the length of batches in which
+        # the field never had a value before its dtype was known
+        self._chunks: list[list] = [[] for _ in fields]
+        self._missing: list[list] = [[] for _ in fields]
+
+    def add(self, documents: list):
+        """
+        Adds the values of a batch of documents.
+
+        Args:
+            documents (list): RawBSONDocuments sharing a reply buffer, or dicts.
+
+        Raises:
+            TypeError: If a value cannot be stored in its field's dtype.
+        """
+        if not documents:
+            return
+        for column in range(len(self._fields)):
+            self._missing[column].append(None)
+        if isinstance(documents[0], RawBSONDocument):
+            self._add_raw(documents)
+        else:
+            self._add_decoded(documents)
+
+    def build(self) -> dict:
+        """
+        Joins the batches into one array per field.
+
+        Returns:
+            dict: The arrays by field name, masked where values are missing if
+                  masking is enabled.
+        """
+        np = self._np
+        columns = {}
+        for column, field in enumerate(self._fields):
+            dtype = self._dtypes[column] or np.dtype("object")
+            chunks = [
+                _filled(np, dtype, chunk) if isinstance(chunk, int) else chunk
+                for chunk in self._chunks[column]
+            ]
+            values = np.concatenate(chunks) if chunks else np.empty(0, dtype)
+            missing = (
+                np.concatenate(self._missing[column]) if chunks else np.zeros(0, bool)
+            )
+            if self._mask and missing.any():
+                values = np.ma.MaskedArray(values, missing)
+            columns[field] = values
+        return columns
+
+    def _store(self, column: int, values, missing):
+        self._chunks[column].append(values)
+        self._missing[column][-1] = missing
+
+    def _add_raw(self, documents: list):
+        """
+        Locates the requested fields in the reply buffer, then converts each
+        field of the whole batch at once.
+        """
+        np = self._np
+        count, length = len(self._fields), len(documents)
+        # Plain lists are faster to fill element by element than arrays
+        types = [[_MISSING] * length for _ in range(count)]
+        starts = [[0] * length for _ in range(count)]
+        ends = [[0] * length for _ in range(count)]
+        names = self._names
+        for row, document in enumerate(documents):
+            found = 0
+            for name, (element_type, start, end) in _iter_elements(
+                document._buffer, document._start, document._end
+            ):
+                column = names.get(name)
+                if column is not None:
+                    types[column][row] = element_type
+                    starts[column][row] = start
+                    ends[column][row] = end
+                    found += 1
+                    if found == count:
+                        break
+
+        buffer = documents[0]._buffer
+        data = None
+        for column in range(count):
+            column_types = np.array(types[column], np.uint8)
+            missing = (column_types == _MISSING) | (column_types == _NULL)
+            present = set(np.unique(column_types[~missing]).tolist())
+            dtype = self._dtypes[column]
+            if dtype is None:
+                if not present:
+                    self._store(column, length, missing)
+                    continue
+                dtype = self._dtypes[column] = _infer_dtype(np, present)
+
+            if dtype.kind != "O" and not present <= _FIXED_TYPES.keys():
+                raise TypeError(
+                    f"Field {self._fields[column]!r} holds values that cannot be "
+                    f"stored as {dtype}"
+                )
+            values = _filled(np, dtype, length)
+            if dtype.kind == "O":
+                for row in np.flatnonzero(~missing).tolist():
+                    values[row] = _decode_value(
+                        buffer,
+                        types[column][row],
+                        starts[column][row],
+                        ends[column][row],
+                    )
+                self._store(column, values, missing)
+                continue
+
+            if data is None:
+                data = np.frombuffer(buffer, np.uint8)
+            column_starts = np.array(starts[column], np.int64)
+            for element_type in present:
+                rows = np.flatnonzero(column_types == element_type)
+                width, source = _FIXED_TYPES[element_type]
+                raw = data[column_starts[rows, None] + np.arange(width)]
+                raw = raw.view(source).reshape(-1)
+                if element_type == 0x09:
+                    raw = raw.view("datetime64[ms]")
+                try:
+                    values[rows] = raw.astype(dtype, casting="same_kind")
+                except TypeError as e:
+                    raise TypeError(
+                        f"Field {self._fields[column]!r} holds values that cannot "
+                        f"be stored as {dtype}"
+                    ) from e
+            self._store(column, values, missing)
+
+    def _add_decoded(self, documents: list):
+        """
+        Converts the requested fields of documents already decoded into dicts.
+        """
+        np = self._np
+        for column, field in enumerate(self._fields):
+            present = [document.get(field) for document in documents]
+            missing = np.array([value is None for value in present])
+            dtype = self._dtypes[column]
+            if dtype is None:
+                if missing.all():
+                    self._store(column, len(documents), missing)
+                    continue
+                types = {_element_type(v) for v in present if v is not None}
+                if None in types:
+                    # Strings, subdocuments, arrays and other variable-size values
+                    dtype = np.dtype("object")
+                else:
+                    dtype = _infer_dtype(np, types)
+                self._dtypes[column] = dtype
+
+            values = _filled(np, dtype, len(documents))
+            for row in np.flatnonzero(~missing).tolist():
+                try:
+                    values[row] = _scalar(present[row], dtype)
+                except (TypeError, ValueError) as e:
+                    raise TypeError(
+                        f"Field {field!r} holds values that cannot be stored as {dtype}"
+                    ) from e
+            self._store(column, values, missing)
@@ -0,0 +1,123 @@
+import zlib
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Compressor:
+    """
+    A wire protocol compressor that can be negotiated with the server.
+    """
+
+    name: str
+    compressor_id: int
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+_COMPRESSORS: dict[str, Compressor] = {}
+
+# Commands whose messages must never be compressed, per the compression spec
+UNCOMPRESSIBLE_COMMANDS = frozenset(
+    [
+        "hello",
+        "ismaster",
+        "saslstart",
+        "saslcontinue",
+        "getnonce",
+        "authenticate",
+        "createuser",
+        "updateuser",
+        "copydbsaslstart",
+        "copydbgetnonce",
+        "copydb",
+    ]
+)
+
+
+def register_compressor(
+    name: str,
+    compressor_id: int,
+    compress: Callable[[bytes], bytes],
+    decompress: Callable[[bytes], bytes],
+):
+    """
+    Registers a compressor so it can be listed in the `compressors` client option.
+
+    zlib is registered by default. Other codecs supported by the server can be
+    plugged in from third-party packages, e.g. zstd (id 3) with `zstandard`:
+
+        register_compressor("zstd", 3, zstd.compress, zstd.decompress)
+
+    Args:
+        name (str): The name the server knows the compressor by, e.g. "snappy".
+        compressor_id (int): The compressorId used in OP_COMPRESSED messages.
+        compress (Callable[[bytes], bytes]): Compresses a message body.
+        decompress (Callable[[bytes], bytes]): Decompresses a message body.
+    """
+    _COMPRESSORS[name] = Compressor(name, compressor_id, compress, decompress)
+
+
+def get_compressor(name: str, zlib_compression_level: int | None = None) -> Compressor:
+    """
+    Looks up a registered compressor by name.
+
+    Args:
+        name (str): The name of the compressor.
+        zlib_compression_level (int | None): The level to use if `name` is "zlib".
+                                             Defaults to zlib's default level.
+
+    Returns:
+        Compressor: The compressor.
+
+    Raises:
+        ValueError: If no compressor with that name is registered.
+    """
+    try:
+        compressor = _COMPRESSORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown compressor {name!r}") from None
+
+    if name == "zlib" and zlib_compression_level is not None:
+        return Compressor(
+            name,
+            compressor.compressor_id,
+            lambda data: zlib.compress(data, zlib_compression_level),
+            compressor.decompress,
+        )
+    return compressor
+
+
+def registered_compressors(names: list[str]) -> list[str]:
+    """
+    Keeps the names of registered compressors, in order.
+
+    Args:
+        names (list[str]): Compressor names, e.g. from the `compressors` option.
+
+    Returns:
+        list[str]: The names that `get_compressor` can look up.
+    """
+    return [name for name in names if name in _COMPRESSORS]
+
+
+def get_compressor_by_id(compressor_id: int) -> Compressor:
+    """
+    Looks up a registered compressor by the id found in an OP_COMPRESSED message.
+
+    Args:
+        compressor_id (int): The compressorId of the message.
+
+    Returns:
+        Compressor: The compressor.
+
+    Raises:
+        ValueError: If no compressor with that id is registered.
+    """
+    for compressor in _COMPRESSORS.values():
+        if compressor.compressor_id == compressor_id:
+            return compressor
+    raise ValueError(f"Unknown compressor id {compressor_id}")
+
+
+register_compressor("zlib", 2, zlib.compress, zlib.decompress)
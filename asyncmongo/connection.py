@@ -1,27 +1,193 @@
 import asyncio
-import ctypes
-from asyncio.streams import StreamReader, StreamWriter
+import logging
+import struct
+import time
 
 import bson
 
-from asyncmongo.auth import MongoCredential, try_authenticate
-from asyncmongo.message import OP_MSG
+from asyncmongo.auth import try_authenticate
+from asyncmongo.compression import (
+    UNCOMPRESSIBLE_COMMANDS,
+    Compressor,
+    get_compressor,
+)
+from asyncmongo.exceptions import (
+    ConnectionClosedError,
+    OperationFailure,
+    ProtocolError,
+)
+from asyncmongo.message import MORE_TO_COME, OP_COMPRESSED, OP_MSG
+from asyncmongo.monitoring import (
+    SENSITIVE_COMMANDS,
+    CommandFailedEvent,
+    CommandStartedEvent,
+    CommandSucceededEvent,
+)
+from asyncmongo.raw_bson import RawBSONDocument
+
 from .client_options import ClientOptions
 
+logger = logging.getLogger(__name__)
+
+# messageLength, requestID, responseTo, opCode
+_MSG_HEADER = struct.Struct("<iiii")
+# flagBits, following the header of an OP_MSG
+_FLAG_BITS = struct.Struct("<I")
+# Offset of the kind-0 body of an OP_MSG reply: header, flagBits and kind byte
+_OP_MSG_BODY_OFFSET = 21
+# The server only compresses replies to compressed requests, so these commands are
+# compressed regardless of compression_min_size to get their batches compressed
+_CURSOR_COMMANDS = frozenset(["find", "getmore", "aggregate"])
+
+
+def _streamed_reply_id(frame: bytes | bytearray) -> int | None:
+    """
+    Returns the requestID of an OP_MSG reply with the `MORE_TO_COME` flag, which
+    the next reply streamed by the server responds to.
+
+    Args:
+        frame (bytes | bytearray): The complete, decompressed reply message.
+
+    Returns:
+        int | None: The requestID, or None if the server sends no further reply.
+    """
+    if len(frame) < _OP_MSG_BODY_OFFSET:
+        return None
+    if not _FLAG_BITS.unpack_from(frame, _MSG_HEADER.size)[0] & MORE_TO_COME:
+        return None
+    return _MSG_HEADER.unpack_from(frame)[1]
+
+
+class _MongoProtocol(asyncio.BufferedProtocol):
+    """
+    Splits the incoming byte stream into complete wire protocol messages.
+
+    Small messages are received into a reusable scratch buffer and copied out once
+    complete. As soon as the header of a message that does not fit is known, a buffer
+    of exactly its size is allocated and the transport receives the rest of the
+    message directly into it, so large replies are neither short-read nor copied.
+    """
+
+    scratch_size = 64 * 1024
+
+    def __init__(self, on_message, on_lost):
+        """
+        Initializes the protocol.
+
+        Args:
+            on_message: Called with every complete message as bytes or bytearray.
+            on_lost: Called with the exception that closed the connection, if any.
+        """
+        self._on_message = on_message
+        self._on_lost = on_lost
+        self.transport: asyncio.Transport | None = None
+        self.closed = False
+
+        self._scratch = bytearray(self.scratch_size)
+        self._scratch_used = 0
+        # The message currently received directly into its own buffer
+        self._frame: bytearray | None = None
+        self._frame_used = 0
+
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+
+    def connection_lost(self, exc: Exception | None):
+        self.closed = True
+        self._can_write.set()
+        self._on_lost(exc)
+
+    def pause_writing(self):
+        self._can_write.clear()
+
+    def resume_writing(self):
+        self._can_write.set()
+
+    async def drain(self):
+        """
+        Waits until the transport's write buffer is below its high-water mark.
+
+        Raises:
+            ConnectionClosedError: If the connection is closed.
+        """
+        await self._can_write.wait()
+        if self.closed:
+            raise ConnectionClosedError("Connection closed")
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self._frame is not None:
+            return memoryview(self._frame)[self._frame_used :]
+        return memoryview(self._scratch)[self._scratch_used :]
+
+    def buffer_updated(self, nbytes: int):
+        if self._frame is not None:
+            self._frame_used += nbytes
+            if self._frame_used == len(self._frame):
+                frame, self._frame = self._frame, None
+                self._on_message(frame)
+            return
+
+        self._scratch_used += nbytes
+        with memoryview(self._scratch) as scratch:
+            position = 0
+            while self._scratch_used - position >= 4:
+                length = int.from_bytes(scratch[position : position + 4], "little")
+                if length < _MSG_HEADER.size:
+                    self.transport.abort()
+                    self._on_lost(ProtocolError(f"Invalid message length {length}"))
+                    return
+                available = self._scratch_used - position
+                if available >= length:
+                    self._on_message(bytes(scratch[position : position + length]))
+                    position += length
+                elif length > len(self._scratch):
+                    # Too large for the scratch buffer, receive the rest in place
+                    self._frame = bytearray(length)
+                    self._frame[:available] = scratch[position : self._scratch_used]
+                    self._frame_used = available
+                    position = self._scratch_used
+                else:
+                    break
+
+            # Move the start of a partial message to the front of the scratch buffer
+            remaining = self._scratch_used - position
+            if remaining and position:
+                scratch[:remaining] = scratch[position : self._scratch_used]
+            self._scratch_used = remaining
+
 
 class AsyncMongoConnection:
     """
     Manages an asynchronous connection to a MongoDB server,
     enabling communication and authentication for database operations.
+
+    Any number of commands may be in flight on the connection at once. Every
+    outgoing message carries a unique requestID and the protocol routes each
+    reply to the waiting caller by its responseTo field.
+
+    The connection is built on `asyncio.BufferedProtocol` rather than streams,
+    so it also runs unchanged on alternative event loops such as uvloop.
     """
 
     def __init__(self):
         """
-        Initializes an AsyncMongoConnection instance with uninitialized reader, writer, and options.
+        Initializes an AsyncMongoConnection instance with uninitialized transport and options.
         """
-        self.reader: StreamReader | None = None
-        self.writer: StreamWriter | None = None
+        self._transport: asyncio.Transport | None = None
+        self._protocol: _MongoProtocol | None = None
         self.options: ClientOptions | None = None
+        self.address: tuple[str, int] | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self.hello: dict = {}
+        self.compressor: Compressor | None = None
+        # requestID of the last reply read, while the server streams more replies to it
+        self._stream_id: int | None = None
+        # Streamed replies by the requestID of the reply they follow. Server and
+        # client requestIDs are distinct sequences, so they are kept apart from _pending
+        self._streamed: dict[int, asyncio.Future] = {}
 
     @classmethod
     async def create(
@@ -43,14 +209,67 @@ class AsyncMongoConnection:
 
         """
         self = cls()
-        self.options = options
-        self.reader, self.writer = await asyncio.open_connection(host, port)
-        if options and options.username and options.password:
+        self.options = options or ClientOptions()
+        self.address = (host, port)
+        loop = asyncio.get_running_loop()
+        self._transport, self._protocol = await loop.create_connection(
+            lambda: _MongoProtocol(self._on_message, self._on_connection_lost),
+            host,
+            port,
+        )
+        await self._handshake()
+        if self.options.username and self.options.password:
             await self._authenticate()
 
-        print(f"Connected to MongoDB at {host} port {port}")
+        logger.debug("Connected to MongoDB at %s port %s", host, port)
         return self
 
+    async def _handshake(self):
+        """
+        Sends the initial `hello` command, records the server's limits and
+        negotiates wire compression.
+        """
+        cmd = {"hello": 1}
+        if self.options.wire_compressors:
+            cmd.update({"compression": self.options.wire_compressors})
+
+        self.hello = await self.command("admin", cmd) or {}
+
+        # The server answers with the compressors it supports, in our order of preference
+        for name in self.hello.get("compression", []):
+            self.compressor = get_compressor(name, self.options.zlib_compression_level)
+            break
+
+    @property
+    def max_bson_object_size(self) -> int:
+        """
+        The largest BSON document the server accepts.
+
+        Returns:
+            int: Size in bytes, as reported by `hello`.
+        """
+        return self.hello.get("maxBsonObjectSize", 16 * 1024 * 1024)
+
+    @property
+    def max_message_size_bytes(self) -> int:
+        """
+        The largest wire protocol message the server accepts.
+
+        Returns:
+            int: Size in bytes, as reported by `hello`.
+        """
+        return self.hello.get("maxMessageSizeBytes", 48000000)
+
+    @property
+    def max_write_batch_size(self) -> int:
+        """
+        The largest number of write operations the server accepts in one command.
+
+        Returns:
+            int: The batch size, as reported by `hello`.
+        """
+        return self.hello.get("maxWriteBatchSize", 100000)
+
     async def _authenticate(self):
         """
         Authenticates the connection using the provided credentials.
@@ -58,76 +277,423 @@ class AsyncMongoConnection:
         Raises:
             Exception: If authentication fails.
         """
-        creds = MongoCredential(
-            mechanism="SCRAM-SHA-256",
-            source=self.options.database,
-            username=self.options.username,
-            password=self.options.password,
-            mechanism_properties="",
-            cache="",
-        )
-        await try_authenticate(self, credentials=creds)
+        await try_authenticate(self, credentials=self.options.credentials)
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the connection can no longer be used to send commands.
+
+        Returns:
+            bool: True once the connection is closed or lost.
+        """
+        return self._protocol is None or self._protocol.closed
+
+    @property
+    def more_to_come(self) -> bool:
+        """
+        Whether the server streams more replies to the last one read, e.g. to a
+        `getMore` sent with `EXHAUST_ALLOWED`. They must be consumed with `read`
+        before the connection can be used for other commands.
+
+        Returns:
+            bool: True if the last reply read had the `MORE_TO_COME` flag.
+        """
+        return self._stream_id is not None
+
+    async def close(self):
+        """
+        Closes the connection, failing any commands still waiting for a reply.
+        """
+        self._fail_pending(ConnectionClosedError("Connection closed"))
+        if self._transport is not None:
+            self._transport.close()
+
+    async def send(
+        self, payload: bytes | list[bytes], raw: bool = False
+    ) -> dict | RawBSONDocument | None:
+        """
+        Sends a payload to the MongoDB server and waits for the matching response.
+
+        The payload is sent as is, without compression or command monitoring; see
+        `send_command` for both.
+
+        Args:
+            payload (bytes | list[bytes]): The serialized payload to send, either as one
+                                           buffer or as the parts from `OP_MSG.new_parts`.
+            raw (bool): Return the reply as a lazily decoded RawBSONDocument. Defaults to False.
+
+        Returns:
+            dict | RawBSONDocument | None: The parsed response document, or None if no data is received.
 
-    async def send(self, payload: bytes) -> list | None:
+        Raises:
+            ConnectionClosedError: If the connection is closed before the reply arrives.
         """
-        Sends a payload to the MongoDB server and reads the response.
+        frame, _ = await self._round_trip(payload)
+        return await self._decode_reply(frame, raw)
+
+    async def read(self, raw: bool = False) -> dict | RawBSONDocument | None:
+        """
+        Waits for the next reply the server streams while `more_to_come` is set,
+        without sending a request. Streamed replies are not reported to command
+        listeners; the command that started the stream is.
+
+        The connection stops reading from the socket while a streamed reply waits
+        to be read, so the server only sends as fast as the caller consumes.
 
         Args:
-            payload (bytes): The serialized payload to send.
+            raw (bool): Return the reply as a lazily decoded RawBSONDocument. Defaults to False.
 
         Returns:
-            list | None: The parsed response documents, or None if no data is received.
+            dict | RawBSONDocument | None: The parsed response document.
+
+        Raises:
+            ProtocolError: If the server is not streaming replies.
+            ConnectionClosedError: If the connection is closed before the reply arrives.
         """
-        self.writer.write(payload)
-        await self.writer.drain()
-        return await self.read()
+        if self._stream_id is None:
+            raise ProtocolError("No more replies are expected from the server")
+        if self.closed:
+            raise ConnectionClosedError("Connection closed")
+
+        # Registered when the previous reply arrived, so none can be missed
+        future = self._streamed[self._stream_id]
+        # Reading was paused when the previous reply arrived
+        self._transport.resume_reading()
+        try:
+            frame, _ = await future
+        finally:
+            self._streamed.pop(self._stream_id, None)
+        self._stream_id = _streamed_reply_id(frame)
+        return await self._decode_reply(frame, raw)
 
-    async def read(self) -> list | None:
+    async def _round_trip(
+        self, payload: bytes | list[bytes]
+    ) -> tuple[bytes | bytearray, int]:
         """
-        Reads a response from the MongoDB server.
+        Writes a message and waits for the reply to it.
+
+        Args:
+            payload (bytes | list[bytes]): The serialized message.
 
         Returns:
-            list | None: A list of BSON documents parsed from the server response, or None if no data is received.
+            tuple[bytes | bytearray, int]: The reply, decompressed, and its size on the wire.
+
+        Raises:
+            ConnectionClosedError: If the connection is closed before the reply arrives.
         """
-        op_msg_size = ctypes.sizeof(OP_MSG)
-        header_data = await self.reader.read(op_msg_size)
-        if not header_data:
-            print("No data received for header")
-            return None
+        parts = [payload] if isinstance(payload, (bytes, bytearray)) else payload
+        request_id = _MSG_HEADER.unpack_from(parts[0])[1]
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._write(parts)
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
 
-        op_msg = OP_MSG.from_buffer_copy(header_data)
+    async def _write(self, parts: list[bytes]):
+        """
+        Writes a message, waiting while the transport's write buffer is full.
 
-        # Calculate the size of the documents field
-        documents_size = op_msg.messageLength - op_msg_size
-        if documents_size <= 0:
-            print("No documents present or invalid message length")
-            return None
+        Args:
+            parts (list[bytes]): The serialized message.
 
-        # Read the documents data
-        documents_data = await self.reader.read(documents_size)
-        if not documents_data:
-            print("No data received for documents")
+        Raises:
+            ConnectionClosedError: If the connection is closed.
+        """
+        if self.closed:
+            raise ConnectionClosedError("Connection closed")
+        self._transport.writelines(parts)
+        await self._protocol.drain()
+
+    async def _decode_reply(
+        self, frame: bytes | bytearray, raw: bool
+    ) -> dict | RawBSONDocument | None:
+        """
+        Decodes a reply, in the decode executor if one is configured and the reply
+        is at least `decode_threshold` bytes. Raw replies are always decoded inline,
+        as that only indexes the buffer.
+
+        Args:
+            frame (bytes | bytearray): The complete reply message.
+            raw (bool): Return a RawBSONDocument instead of a dict.
+
+        Returns:
+            dict | RawBSONDocument | None: The reply document, or None if the reply is empty.
+        """
+        executor = self.options.decode_executor
+        if executor is None or raw or len(frame) < self.options.decode_threshold:
+            return self._decode(frame, raw)
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, self._decode, frame, raw
+        )
+
+    @staticmethod
+    def _decode(frame: bytes | bytearray, raw: bool) -> dict | RawBSONDocument | None:
+        """
+        Decodes the body of an OP_MSG reply without copying it out of the frame.
+
+        Args:
+            frame (bytes | bytearray): The complete reply message.
+            raw (bool): Return a RawBSONDocument instead of a dict.
+
+        Returns:
+            dict | RawBSONDocument | None: The reply document, or None if the reply is empty.
+        """
+        if len(frame) <= _OP_MSG_BODY_OFFSET:
             return None
+        if raw:
+            return RawBSONDocument(frame, _OP_MSG_BODY_OFFSET)
 
         # Parse the BSON documents
-        documents = bson.loads(documents_data)
+        if isinstance(frame, bytes):
+            documents = bson.decode_document(frame, _OP_MSG_BODY_OFFSET)[1]
+        else:
+            # Decode from bytes so binary fields come back as bytes, not bytearrays
+            documents = bson.loads(bytes(memoryview(frame)[_OP_MSG_BODY_OFFSET:]))
 
         if not documents:
             return None
 
         return documents
 
-    async def command(self, database_name: str, command: dict) -> list | None:
+    def _on_message(self, frame: bytes | bytearray):
+        """
+        Resolves the future of the request a complete reply responds to.
+
+        Args:
+            frame (bytes | bytearray): The complete reply message.
+        """
+        _, _, response_to, op_code = _MSG_HEADER.unpack_from(frame)
+        future = self._streamed.get(response_to) or self._pending.pop(response_to, None)
+        if future is None or future.done():
+            return
+
+        wire_size = len(frame)
+        if op_code == 2012:
+            try:
+                frame = OP_COMPRESSED.decompress(frame)
+            except Exception as e:
+                future.set_exception(e)
+                return
+
+        stream_id = _streamed_reply_id(frame)
+        if stream_id is not None:
+            # The server streams the next reply in response to this one
+            streamed = future.get_loop().create_future()
+            # Retrieve the exception of a stream abandoned by closing the connection
+            streamed.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._streamed[stream_id] = streamed
+            # Stop reading until this reply is consumed, so a slow consumer makes
+            # the server wait instead of the whole result piling up in memory
+            self._transport.pause_reading()
+        future.set_result((frame, wire_size))
+
+    def _on_connection_lost(self, exc: Exception | None):
+        """
+        Fails every pending command once the connection is gone.
+
+        Args:
+            exc (Exception | None): The error that closed the connection, if any.
+        """
+        error = ConnectionClosedError(
+            f"Connection lost: {exc!r}" if exc else "Connection closed"
+        )
+        error.__cause__ = exc
+        self._fail_pending(error)
+
+    def _fail_pending(self, error: Exception):
+        """
+        Fails every command still waiting for a reply.
+
+        Args:
+            error (Exception): The exception to raise in the waiting callers.
+        """
+        pending, self._pending = self._pending, {}
+        streamed, self._streamed = self._streamed, {}
+        for future in [*pending.values(), *streamed.values()]:
+            if not future.done():
+                future.set_exception(error)
+
+    async def command(
+        self,
+        database_name: str,
+        command: dict,
+        sequences: dict[str, list[bytes]] | None = None,
+        raw: bool = False,
+        flag_bits: int = 0,
+    ) -> dict | RawBSONDocument | None:
         """
         Sends a command to the MongoDB server.
 
         Args:
             database_name (str): The name of the database for the command.
             command (dict): The command to execute.
+            sequences (dict[str, list[bytes]] | None): BSON-encoded documents sent as
+                kind-1 sections, keyed by command field. Defaults to None.
+            raw (bool): Return the reply as a lazily decoded RawBSONDocument. Defaults to False.
+            flag_bits (int): OP_MSG flags. With `MORE_TO_COME`, the command is only
+                written and None is returned, as the server does not reply.
+                Defaults to 0.
 
         Returns:
-            list | None: The response from the server, parsed as a list of BSON documents.
+            dict | RawBSONDocument | None: The response from the server, parsed as a BSON document.
         """
         command.update({"$db": database_name})
-        payload = OP_MSG.new(command)
-        return await self.send(payload)
+        payload = OP_MSG.new_parts(command, sequences=sequences, flag_bits=flag_bits)
+        return await self.send_command(
+            next(iter(command)), database_name, payload, raw=raw, command=command
+        )
+
+    async def send_command(
+        self,
+        command_name: str,
+        database_name: str,
+        payload: list[bytes],
+        raw: bool = False,
+        command: dict | None = None,
+    ) -> dict | RawBSONDocument | None:
+        """
+        Sends an already serialized command, compressing it if compression was
+        negotiated, and reports it to the client's command listeners and latency
+        histograms.
+
+        Args:
+            command_name (str): The name of the command, e.g. "find".
+            database_name (str): The database the command runs against.
+            payload (list[bytes]): The serialized OP_MSG, e.g. from `OP_MSG.new_parts`.
+            raw (bool): Return the reply as a lazily decoded RawBSONDocument. Defaults to False.
+            command (dict | None): The command document, passed on to listeners.
+                                   Defaults to None.
+
+        Returns:
+            dict | RawBSONDocument | None: The response from the server, parsed as a BSON
+                document, or None if the message has the `MORE_TO_COME` flag. Such
+                messages get no reply, so the call returns once the message is written.
+
+        Raises:
+            ConnectionClosedError: If the connection is closed before the reply arrives.
+        """
+        more_to_come = _FLAG_BITS.unpack_from(payload[0], _MSG_HEADER.size)[0]
+        more_to_come &= MORE_TO_COME
+        if self.compressor is not None:
+            payload = self._compress(command_name.lower(), payload)
+
+        listeners = self.options.event_listeners
+        histogram = self.options.command_latencies[command_name]
+        request_id = _MSG_HEADER.unpack_from(payload[0])[1]
+        bytes_sent = sum(len(part) for part in payload)
+        sensitive = command_name.lower() in SENSITIVE_COMMANDS
+
+        if listeners:
+            event = CommandStartedEvent(
+                command_name,
+                database_name,
+                request_id,
+                self.address,
+                {} if sensitive else command,
+                bytes_sent,
+            )
+            self._publish("started", event)
+
+        start = time.perf_counter()
+        try:
+            if more_to_come:
+                await self._write(payload)
+                frame, bytes_received, reply = b"", 0, None
+            else:
+                frame, bytes_received = await self._round_trip(payload)
+                self._stream_id = _streamed_reply_id(frame)
+                reply = await self._decode_reply(frame, raw)
+        except BaseException as e:
+            histogram.failures += 1
+            if listeners:
+                event = CommandFailedEvent(
+                    command_name,
+                    database_name,
+                    request_id,
+                    self.address,
+                    time.perf_counter() - start,
+                    bytes_sent,
+                    e,
+                )
+                self._publish("failed", event)
+            raise
+
+        duration = time.perf_counter() - start
+        if reply is not None and not reply.get("ok"):
+            # The server answered, but the command failed
+            histogram.failures += 1
+            if listeners:
+                failure = OperationFailure(
+                    reply.get("errmsg", "Command failed"),
+                    reply.get("code"),
+                    {} if sensitive else reply,
+                )
+                event = CommandFailedEvent(
+                    command_name,
+                    database_name,
+                    request_id,
+                    self.address,
+                    duration,
+                    bytes_sent,
+                    failure,
+                )
+                self._publish("failed", event)
+            return reply
+
+        histogram.record(duration)
+        if listeners:
+            if more_to_come:
+                # Unacknowledged writes are reported with a synthetic reply
+                reply = {"ok": 1}
+            event = CommandSucceededEvent(
+                command_name,
+                database_name,
+                request_id,
+                self.address,
+                duration,
+                bytes_sent,
+                bytes_received,
+                max(len(frame) - _OP_MSG_BODY_OFFSET, 0),
+                {} if sensitive else reply,
+            )
+            self._publish("succeeded", event)
+        return None if more_to_come else reply
+
+    def _publish(self, method: str, event):
+        """
+        Hands an event to every command listener. Listener errors are logged and
+        never interrupt the command.
+
+        Args:
+            method (str): The listener method to call: "started", "succeeded" or "failed".
+            event: The event to publish.
+        """
+        for listener in self.options.event_listeners:
+            try:
+                getattr(listener, method)(event)
+            except Exception:
+                logger.exception("Command listener %r raised", listener)
+
+    def _compress(self, command_name: str, payload: list[bytes]) -> list[bytes]:
+        """
+        Compresses an outgoing message with the negotiated compressor, unless the
+        command must not be compressed or the message is below `compression_min_size`.
+
+        Args:
+            command_name (str): The lowercased name of the command being sent.
+            payload (list[bytes]): The serialized OP_MSG.
+
+        Returns:
+            list[bytes]: The message to send, compressed or not.
+        """
+        if command_name in UNCOMPRESSIBLE_COMMANDS:
+            return payload
+        if (
+            command_name not in _CURSOR_COMMANDS
+            and sum(len(part) for part in payload) < self.options.compression_min_size
+        ):
+            return payload
+        return OP_COMPRESSED.new(payload, self.compressor)
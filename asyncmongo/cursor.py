@@ -1,12 +1,113 @@
+import asyncio
+import warnings
 from collections import deque
+from typing import AsyncIterator
+
+from asyncmongo.columns import ColumnBuilder
+from asyncmongo.exceptions import (
+    ConnectionClosedError,
+    InvalidOperation,
+    OperationFailure,
+)
+from asyncmongo.message import EXHAUST_ALLOWED
+from asyncmongo.read_preferences import PRIMARY, ReadPreference
+from asyncmongo.result_cache import cache_key
+
+
+# Index key types other than ascending and descending
+_INDEX_TYPES = frozenset(["2d", "2dsphere", "geoHaystack", "hashed", "text"])
+
+
+def _index_spec(key_or_list, direction=None, index_types: bool = False) -> dict:
+    """
+    Normalizes a sort or index specification to an ordered document.
+
+    Args:
+        key_or_list: A field name, a list of (field, direction) pairs or a dict.
+        direction: The direction of a single field, 1 (ascending, the default) or -1
+                   (descending), or a document such as {"$meta": "textScore"}.
+        index_types (bool): Also accept index types such as "2dsphere" or "hashed"
+                            as directions, for index keys. Defaults to False.
+
+    Returns:
+        dict: The specification, e.g. {"age": -1, "name": 1}.
+
+    Raises:
+        TypeError: If the specification is not a string, list or dict.
+        ValueError: If a direction is not 1, -1, a document or an allowed index type.
+    """
+    if isinstance(key_or_list, str):
+        spec = {key_or_list: 1 if direction is None else direction}
+    elif isinstance(key_or_list, (list, tuple, dict)):
+        spec = dict(key_or_list)
+    else:
+        raise TypeError("Expected a field name, a list of (field, direction) or a dict")
+    for value in spec.values():
+        if index_types and value in _INDEX_TYPES:
+            continue
+        if value not in (1, -1) and not isinstance(value, dict):
+            raise ValueError(
+                f"Invalid direction {value!r}, expected 1, -1 or a document"
+            )
+    return spec
+
+
+# killCursors tasks scheduled for garbage collected cursors, referenced until done
+_kill_tasks: set[asyncio.Task] = set()
+
+
+async def _kill_cursor(
+    database, address: tuple[str, int], collection_name: str, cursor_id: int
+):
+    """
+    Kills a server cursor. Network errors are ignored, as the server then discards
+    the cursor on its own once it times out.
+
+    Args:
+        database: The database the cursor belongs to.
+        address (tuple[str, int]): The server holding the cursor.
+        collection_name (str): The collection the cursor iterates, as named by the server.
+        cursor_id (int): The id of the cursor.
+    """
+    cmd = {"killCursors": collection_name, "cursors": [cursor_id]}
+    try:
+        async with database._get_connection(address) as conn:
+            await conn.command(command=cmd, database_name=database.name)
+    except (OSError, ConnectionClosedError):
+        pass
+
+
+def _schedule_kill(database, address, collection_name: str, cursor_id: int):
+    task = asyncio.ensure_future(
+        _kill_cursor(database, address, collection_name, cursor_id)
+    )
+    _kill_tasks.add(task)
+    task.add_done_callback(_kill_tasks.discard)
 
 
 class Cursor:
     """
     Represents a cursor for iterating over query results from a MongoDB collection.
     Supports asynchronous iteration and query options such as skip and limit.
+
+    With a prefetch depth, the cursor keeps issuing `getMore` commands in a
+    background task while the caller processes the documents already received,
+    buffering up to that many batches ahead.
+
+    A cursor that is not read to the end keeps server resources until it is closed,
+    so prefer `async with` when the loop may stop early:
+
+        async with collection.find(filter) as cursor:
+            async for doc in cursor:
+                if done(doc):
+                    break
+
+    Cursors garbage collected while still open are killed in the background.
     """
 
+    # Whether results may be served from the collection's result cache
+    _cacheable = True
+
     def __init__(
         self,
         collection,
@@ -14,6 +115,15 @@ class Cursor:
         limit: int = 0,
         batch_size: int = 0,
         filter: dict | None = None,
+        prefetch: int = 0,
+        raw: bool = False,
+        read_preference: ReadPreference = PRIMARY,
+        projection: dict | None = None,
+        sort: dict | None = None,
+        hint: str | dict | None = None,
+        max_time_ms: int | None = None,
+        comment=None,
+        exhaust: bool = False,
     ):
         """
         Initializes a Cursor instance.
@@ -22,8 +132,23 @@ class Cursor:
             collection: The collection to query.
             skip (int): Number of documents to skip. Defaults to 0.
             limit (int): Maximum number of documents to retrieve. Defaults to 0 (no limit).
-            batch_size (int): Number of documents to retrieve per batch (currently unused). Defaults to 0.
+            batch_size (int): Number of documents to retrieve per batch. Defaults to 0 (server default).
             filter (dict | None): Query filter to apply. Defaults to None.
+            prefetch (int): Number of batches to fetch ahead in the background. Defaults to 0 (disabled).
+            raw (bool): Yield RawBSONDocuments that decode fields on access instead of dicts.
+                        Defaults to False.
+            read_preference (ReadPreference): The members the query may run on.
+                        Defaults to primary.
+            projection (dict | None): The fields to return. Defaults to None (all).
+            sort (dict | None): The order of the results. Defaults to None (natural order).
+            hint (str | dict | None): The index to use, by name or key. Defaults to None.
+            max_time_ms (int | None): Time limit of the query on the server.
+                        Defaults to None (no limit).
+            comment: A comment attached to the query in the server's logs and
+                     profiler. Defaults to None.
+            exhaust (bool): After the first batch, have the server stream every
+                     remaining batch over a dedicated connection instead of
+                     answering one `getMore` per batch. Defaults to False.
         """
 
         self._collection = collection
@@ -31,11 +156,41 @@ class Cursor:
         self._limit = limit
         self._batch_size = batch_size
         self._filter = filter
+        self._prefetch = prefetch
+        self._raw = raw
+        self._read_preference = read_preference
+        self._projection = projection
+        self._sort = sort
+        self._hint = hint
+        self._max_time_ms = max_time_ms
+        self._comment = comment
+        self._exhaust = exhaust
 
         self._id: str | None = None  # id of the cursor
+        # The collection getMore runs against, as named by the server
+        self._collection_name = collection._name
+        # The resume token of the last batch, only returned for change streams
+        self._post_batch_resume_token = None
+        self._address: tuple[str, int] | None = None  # server holding the cursor
         self._data: deque = deque()
-        self._connection = None
         self._killed: bool = False
+        # Batches fetched ahead by the prefetch or exhaust task, ending with None once
+        # the server cursor is exhausted, or with the exception that stopped it
+        self._batches: asyncio.Queue | None = None
+        self._prefetch_task: asyncio.Task | None = None
+        # The loop the cursor runs on, to kill it from `__del__`
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def alive(self) -> bool:
+        """
+        Whether the cursor may still return documents.
+
+        Returns:
+            bool: True while documents are buffered locally, in prefetched batches,
+                  or may still be fetched from the server.
+        """
+        return bool(self._data) or not self._killed or self._batches is not None
 
     def __aiter__(self) -> "Cursor":
         """
@@ -55,41 +210,215 @@ class Cursor:
         """
 
         if self._id and self._id != 0:
-            return {"getMore": self._id, "collection": self._collection._name}
+            cmd = {"getMore": self._id, "collection": self._collection_name}
+            if self._batch_size:
+                cmd.update({"batchSize": self._batch_size})
+            return cmd
+
+        cmd = self._query_command()
+        if (
+            self._read_preference is not None
+            and self._read_preference.mode != "primary"
+        ):
+            cmd.update({"$readPreference": self._read_preference.document})
+
+        return cmd
 
+    def _query_command(self) -> dict:
+        """
+        Creates the `find` command of the query.
+
+        Returns:
+            dict: The command, without a read preference.
+        """
         cmd = {"find": self._collection._name}
 
         if self._filter:
             cmd.update({"filter": self._filter})
+        if self._projection:
+            cmd.update({"projection": self._projection})
+        if self._sort:
+            cmd.update({"sort": self._sort})
+        if self._hint:
+            cmd.update({"hint": self._hint})
         if self._skip:
             cmd.update({"skip": self._skip})
-        if self._limit:
+        if self._limit > 0:
             cmd.update({"limit": self._limit})
+        elif self._limit < 0:
+            # A negative limit returns a single batch without a server cursor
+            cmd.update({"limit": -self._limit, "singleBatch": True})
+        if self._batch_size:
+            cmd.update({"batchSize": self._batch_size})
+        if self._max_time_ms is not None:
+            cmd.update({"maxTimeMS": self._max_time_ms})
+        if self._comment is not None:
+            cmd.update({"comment": self._comment})
 
         return cmd
 
-    async def _refresh(self):
+    async def _fetch_batch(self) -> list:
         """
-        Fetches the next batch of documents from the server.
+        Runs the next `find` or `getMore` command.
+
+        Returns:
+            list: The documents of the batch returned by the server.
         """
+        cmd = self._create_command()
 
-        if self._killed:
-            return False
+        # Finds on a cached collection are answered from the cache when possible,
+        # and cached when the first batch holds the whole result
+        cache = None
+        if self._cacheable and self._id is None and not self._raw:
+            cache = self._collection.cache
+        if cache is not None:
+            key = cache_key(cmd)
+            try:
+                documents = cache.get(key)
+            except TypeError:  # Unhashable values in the filter
+                cache = None
+            else:
+                if documents is not None:
+                    self._id = 0
+                    self._killed = True
+                    return documents
+                generation = cache.generation
+
+        self._loop = asyncio.get_running_loop()
+        async with self._collection._database._get_connection(
+            self._address, self._read_preference
+        ) as conn:
+            # getMore must reach the server that created the cursor
+            self._address = conn.address
+            res = await conn.command(
+                command=cmd,
+                database_name=self._collection._database.name,
+                raw=self._raw,
+            )
+
+        documents = self._read_reply(res)
+        if cache is not None and self._id == 0:
+            cache.put(key, documents, generation)
+        return documents
+
+    def _read_reply(self, res) -> list:
+        """
+        Updates the cursor from the reply to a `find`, `aggregate` or `getMore`.
 
-        cmd = self._create_command()
-        if not self._connection:
-            self._connection = self._collection._database._get_connection()
-        res = await self._connection.command(
-            command=cmd, database_name=self._collection._database.name
-        )
+        Args:
+            res (dict | RawBSONDocument): The reply.
 
-        self._id = res["cursor"]["id"]
+        Returns:
+            list: The documents of the batch.
+
+        Raises:
+            OperationFailure: If the command failed.
+        """
+        if not res.get("ok"):
+            self._killed = True
+            raise OperationFailure(
+                res.get("errmsg", "Query failed"), res.get("code"), res
+            )
+
+        cursor = res["cursor"]
+        self._id = cursor["id"]
         if self._id == 0:
             self._killed = True
+        self._post_batch_resume_token = cursor.get("postBatchResumeToken")
+
+        if "firstBatch" in cursor:
+            if "ns" in cursor:
+                self._collection_name = cursor["ns"].split(".", 1)[1]
+            return cursor["firstBatch"]
+        return cursor["nextBatch"]
+
+    async def _exhaust_batches(self):
+        """
+        Sends a single `getMore` allowing an exhaust reply, then queues every batch
+        the server streams back until the server cursor is exhausted.
+
+        The connection is dedicated to the stream for its whole duration. It is
+        closed rather than returned to the pool if the stream is abandoned, as
+        the server keeps sending batches on it.
+        """
+        try:
+            async with self._collection._database._get_connection(
+                self._address
+            ) as conn:
+                try:
+                    res = await conn.command(
+                        command=self._create_command(),
+                        database_name=self._collection._database.name,
+                        raw=self._raw,
+                        flag_bits=EXHAUST_ALLOWED,
+                    )
+                    await self._batches.put(self._read_reply(res))
+                    while conn.more_to_come:
+                        res = await conn.read(raw=self._raw)
+                        await self._batches.put(self._read_reply(res))
+                finally:
+                    if conn.more_to_come:
+                        await conn.close()
+        except Exception as e:
+            self._killed = True
+            await self._batches.put(e)
+        else:
+            await self._batches.put(None)
+
+    async def _prefetch_batches(self):
+        """
+        Fetches batches ahead of the consumer until the server cursor is exhausted.
+        """
+        try:
+            while not self._killed:
+                await self._batches.put(await self._fetch_batch())
+        except Exception as e:
+            self._killed = True
+            await self._batches.put(e)
+        else:
+            await self._batches.put(None)
 
-        results = list(res["cursor"].values())
-        self._data.extend(results[0])
+    async def _next_batch(self) -> list:
+        """
+        Fetches the next batch of documents, from the prefetched batches if
+        prefetching is enabled, otherwise from the server.
 
+        Returns:
+            list: The batch, empty once the cursor is exhausted.
+        """
+
+        if self._batches is not None:
+            batch = await self._batches.get()
+            if batch is None or isinstance(batch, Exception):
+                self._batches = None
+                if batch is not None:
+                    raise batch
+                return []
+            return batch
+
+        if self._killed:
+            return []
+
+        batch = await self._fetch_batch()
+
+        if self._exhaust and not self._killed:
+            self._batches = asyncio.Queue(max(self._prefetch, 1))
+            self._prefetch_task = asyncio.create_task(self._exhaust_batches())
+        elif self._prefetch and not self._killed:
+            self._batches = asyncio.Queue(self._prefetch)
+            self._prefetch_task = asyncio.create_task(self._prefetch_batches())
+
+        return batch
+
+    async def _refresh(self):
+        """
+        Buffers the next batch of documents.
+
+        Returns:
+            int: The number of buffered documents.
+        """
+
+        self._data.extend(await self._next_batch())
         return len(self._data)
 
     async def __anext__(self):
@@ -103,25 +432,171 @@ class Cursor:
             StopAsyncIteration: If no more documents are available.
         """
 
-        if len(self._data):
-            return self._data.popleft()
+        while not self._data:
+            if not self.alive:
+                raise StopAsyncIteration
+            await self._refresh()
 
-        is_refreshed = await self._refresh()
+        return self._data.popleft()
 
-        if not is_refreshed:
-            raise StopAsyncIteration
+    async def close(self):
+        """
+        Closes the cursor: stops prefetching, discards buffered documents and kills
+        the server cursor if the server still has results for it.
+        """
 
-        return self._data.popleft()
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self._data.clear()
+        self._batches = None
+        self._killed = True
+        if self._id:
+            cursor_id, self._id = self._id, 0
+            await _kill_cursor(
+                self._collection._database,
+                self._address,
+                self._collection_name,
+                cursor_id,
+            )
+
+    async def __aenter__(self) -> "Cursor":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __del__(self):
+        """
+        Kills the server cursor of a cursor abandoned before it was exhausted.
+        """
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+        if not self._id or self._loop is None or self._loop.is_closed():
+            return
+        try:
+            self._loop.call_soon_threadsafe(
+                _schedule_kill,
+                self._collection._database,
+                self._address,
+                self._collection_name,
+                self._id,
+            )
+        except RuntimeError:  # The loop closed in the meantime
+            pass
+
+    async def batches(self) -> AsyncIterator[list]:
+        """
+        Iterates over the results one server batch at a time, which avoids the
+        per-document cost of `async for doc in cursor` on large scans:
+
+            async for batch in collection.find(batch_size=1000).batches():
+                process(batch)
+
+        Documents already buffered, e.g. by an earlier `__anext__`, come first.
+        Batches are empty only on tailable cursors such as change streams.
+
+        Yields:
+            list: The documents of each batch.
+        """
+
+        if self._data:
+            batch = list(self._data)
+            self._data.clear()
+            yield batch
+        while self.alive:
+            batch = await self._next_batch()
+            if batch or self.alive:
+                yield batch
+
+    async def to_list(self, length: int | None = None) -> list:
+        """
+        Collects the results into a list, a batch at a time.
+
+        Args:
+            length (int | None): The maximum number of documents to return. The rest
+                                 stay available to later calls. Defaults to None (all).
+
+        Returns:
+            list: The documents.
+
+        Raises:
+            ValueError: If `length` is negative.
+        """
+
+        if length is not None and length < 0:
+            raise ValueError("length must be >= 0")
+
+        documents = []
+        while length is None or len(documents) < length:
+            if self._data:
+                batch = list(self._data)
+                self._data.clear()
+            elif self.alive:
+                batch = await self._next_batch()
+            else:
+                break
+
+            if length is not None and len(documents) + len(batch) > length:
+                keep = length - len(documents)
+                self._data.extend(batch[keep:])
+                batch = batch[:keep]
+            documents.extend(batch)
+
+        return documents
+
+    async def to_columns(
+        self, fields: list[str], dtypes: dict | None = None, mask: bool = True
+    ) -> dict:
+        """
+        Collects top-level fields of the results into NumPy arrays, one per field:
+
+            columns = await collection.find({}, projection=["price", "ts"]).to_columns(
+                ["price", "ts"], dtypes={"price": "float64"}
+            )
+            columns["price"].mean()
+
+        Unless the cursor already ran, it switches to raw results, so the documents
+        are never decoded into dicts: numbers, booleans, datetimes and ObjectIds are
+        copied out of each reply in bulk. Datetimes become datetime64[ms] and
+        ObjectIds their 12 bytes (V12); other values are stored as objects.
+
+        Requires NumPy, an optional dependency.
+
+        Args:
+            fields (list[str]): The top-level fields to collect.
+            dtypes (dict | None): NumPy dtypes by field, inferred from the values of
+                                  fields without one. Defaults to None.
+            mask (bool): Return masked arrays for fields missing or null in some
+                         documents, instead of filling those entries with NaN, NaT,
+                         None or zero. Defaults to True.
+
+        Returns:
+            dict: The arrays by field name.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            TypeError: If a value cannot be stored in its field's dtype.
+        """
+
+        builder = ColumnBuilder(fields, dtypes, mask)
+        if self._id is None:
+            self._raw = True
+        async for batch in self.batches():
+            builder.add(batch)
+        return builder.build()
 
     def _check_okay_to_chain(self):
         """
         Checks if chaining methods like `skip` or `limit` is allowed.
 
         Raises:
-            Exception: If the cursor has already been executed.
+            InvalidOperation: If the cursor has already been executed.
         """
         if self._id is not None:
-            return Exception("Cannot set options after executing query")
+            raise InvalidOperation("Cannot set options after executing query")
 
     def skip(self, skip: int) -> "Cursor":
         """
@@ -153,7 +628,9 @@ class Cursor:
         Sets the maximum number of documents to retrieve.
 
         Args:
-            limit (int): Maximum number of documents to retrieve.
+            limit (int): Maximum number of documents to retrieve. A negative limit
+                         returns at most that many documents in a single batch and
+                         closes the server cursor right away.
 
         Returns:
             Cursor: The current cursor instance.
@@ -169,3 +646,365 @@ class Cursor:
 
         self._limit = limit
         return self
+
+    def batch_size(self, batch_size: int) -> "Cursor":
+        """
+        Sets the number of documents the server returns per batch.
+
+        Args:
+            batch_size (int): Number of documents per batch, or 0 for the server default.
+
+        Returns:
+            Cursor: The current cursor instance.
+
+        Raises:
+            TypeError: If `batch_size` is not an integer.
+            ValueError: If `batch_size` is negative.
+        """
+
+        if not isinstance(batch_size, int):
+            raise TypeError("batch_size must be an integer")
+        if batch_size < 0:
+            raise ValueError("batch_size must be >= 0")
+
+        self._check_okay_to_chain()
+
+        self._batch_size = batch_size
+        return self
+
+    def projection(self, projection: dict | list[str]) -> "Cursor":
+        """
+        Sets the fields the server returns, so that only they are sent and decoded:
+
+            cursor.projection(["name", "age"])  # Plus _id
+            cursor.projection({"_id": 0, "name": 1})
+
+        Args:
+            projection (dict | list[str]): A projection document, or the names of
+                                           the fields to include.
+
+        Returns:
+            Cursor: The current cursor instance.
+
+        Raises:
+            TypeError: If `projection` is not a dict or a list.
+            InvalidOperation: If the cursor has already been executed.
+        """
+
+        if isinstance(projection, (list, tuple)):
+            projection = {field: 1 for field in projection}
+        if not isinstance(projection, dict):
+            raise TypeError("projection must be a dict or a list of field names")
+
+        self._check_okay_to_chain()
+
+        self._projection = projection
+        return self
+
+    def sort(self, key_or_list, direction: int | None = None) -> "Cursor":
+        """
+        Sets the order of the results:
+
+            cursor.sort("age", -1)
+            cursor.sort([("age", -1), ("name", 1)])
+
+        Args:
+            key_or_list: A field name, a list of (field, direction) pairs or a dict.
+            direction (int | None): The direction when sorting on a single field,
+                                    1 or -1. Defaults to None (ascending).
+
+        Returns:
+            Cursor: The current cursor instance.
+
+        Raises:
+            TypeError: If the sort specification is not a string, list or dict.
+            ValueError: If a direction is not 1, -1 or a document.
+            InvalidOperation: If the cursor has already been executed.
+        """
+
+        sort = _index_spec(key_or_list, direction)
+
+        self._check_okay_to_chain()
+
+        self._sort = sort
+        return self
+
+    def hint(self, index: str | list | dict) -> "Cursor":
+        """
+        Forces the query to use an index.
+
+        Args:
+            index (str | list | dict): The name of the index, or its key as a list of
+                                       (field, direction) pairs or a dict. Directions
+                                       may also be index types, e.g. "2dsphere".
+
+        Returns:
+            Cursor: The current cursor instance.
+
+        Raises:
+            TypeError: If the index is not a string, list or dict.
+            ValueError: If a direction is not 1, -1 or an index type.
+            InvalidOperation: If the cursor has already been executed.
+        """
+
+        if not isinstance(index, str):
+            index = _index_spec(index, index_types=True)
+
+        self._check_okay_to_chain()
+
+        self._hint = index
+        return self
+
+    def max_time_ms(self, max_time_ms: int | None) -> "Cursor":
+        """
+        Sets a time limit for the query on the server.
+
+        Args:
+            max_time_ms (int | None): The limit in milliseconds, or None for no limit.
+
+        Returns:
+            Cursor: The current cursor instance.
+
+        Raises:
+            TypeError: If `max_time_ms` is not an integer or None.
+            InvalidOperation: If the cursor has already been executed.
+        """
+
+        if max_time_ms is not None and not isinstance(max_time_ms, int):
+            raise TypeError("max_time_ms must be an integer or None")
+
+        self._check_okay_to_chain()
+
+        self._max_time_ms = max_time_ms
+        return self
+
+    def comment(self, comment) -> "Cursor":
+        """
+        Attaches a comment to the query, shown in the server's logs and profiler.
+
+        Args:
+            comment: The comment, usually a string.
+
+        Returns:
+            Cursor: The current cursor instance.
+
+        Raises:
+            InvalidOperation: If the cursor has already been executed.
+        """
+
+        self._check_okay_to_chain()
+
+        self._comment = comment
+        return self
+
+    async def explain(self, verbosity: str = "queryPlanner") -> dict:
+        """
+        Returns the server's plan for the query, e.g. to check that it uses an index.
+
+        Args:
+            verbosity (str): "queryPlanner", "executionStats" or "allPlansExecution".
+                             Defaults to "queryPlanner".
+
+        Returns:
+            dict: The explain output.
+
+        Raises:
+            InvalidOperation: If the cursor has already been executed.
+            OperationFailure: If the server failed the command.
+        """
+
+        self._check_okay_to_chain()
+
+        cmd = {"explain": self._query_command(), "verbosity": verbosity}
+        if (
+            self._read_preference is not None
+            and self._read_preference.mode != "primary"
+        ):
+            cmd.update({"$readPreference": self._read_preference.document})
+        async with self._collection._database._get_connection(
+            read_preference=self._read_preference
+        ) as conn:
+            res = await conn.command(
+                command=cmd, database_name=self._collection._database.name
+            )
+        if not res.get("ok"):
+            raise OperationFailure(
+                res.get("errmsg", "Explain failed"), res.get("code"), res
+            )
+        return res
+
+
+def _find_only(name: str, stage: str):
+    """
+    Creates a Cursor method that aggregations reject, as the option is a stage of
+    their pipeline instead.
+
+    Args:
+        name (str): The name of the method.
+        stage (str): The pipeline stage to use instead.
+
+    Returns:
+        The method, raising InvalidOperation.
+    """
+
+    def method(self, *args, **kwargs):
+        raise InvalidOperation(
+            f"{name}() does not apply to aggregations, add a {stage} stage to the "
+            "pipeline instead"
+        )
+
+    method.__name__ = name
+    method.__doc__ = f"Not supported by aggregations, use a `{stage}` stage instead."
+    return method
+
+
+class AggregateCursor(Cursor):
+    """
+    A cursor over the results of an `aggregate` command, driven by `getMore` like
+    a find cursor. Options of finds such as `projection` or `sort` are expressed as
+    pipeline stages instead, and their methods raise InvalidOperation. `hint`,
+    `comment`, `max_time_ms` and `batch_size` apply to the `aggregate` command.
+    """
+
+    _cacheable = False
+
+    skip = _find_only("skip", "$skip")
+    limit = _find_only("limit", "$limit")
+    projection = _find_only("projection", "$project")
+    sort = _find_only("sort", "$sort")
+
+    def __init__(
+        self,
+        collection,
+        pipeline: list[dict],
+        batch_size: int = 0,
+        max_await_time_ms: int | None = None,
+        raw: bool = False,
+        read_preference: ReadPreference | None = PRIMARY,
+        aggregate: str | int | None = None,
+        allow_disk_use: bool | None = None,
+        max_time_ms: int | None = None,
+        output: str | None = None,
+    ):
+        """
+        Initializes an AggregateCursor instance.
+
+        Args:
+            collection: The collection to aggregate.
+            pipeline (list[dict]): The aggregation pipeline.
+            batch_size (int): Number of documents per batch. Defaults to 0 (server default).
+            max_await_time_ms (int | None): How long a `getMore` on a tailable cursor
+                        waits for new results. Defaults to None (server default).
+            raw (bool): Yield RawBSONDocuments that decode fields on access instead of dicts.
+                        Defaults to False.
+            read_preference (ReadPreference | None): The members the aggregation may
+                        run on. Defaults to primary; None selects a writable server.
+            aggregate (str | int | None): The target of the `aggregate` command.
+                        Defaults to None, the collection's name; 1 aggregates the
+                        whole database.
+            allow_disk_use (bool | None): Whether stages may write temporary files.
+                        Defaults to None (server default).
+            max_time_ms (int | None): Time limit of the `aggregate` command.
+                        Defaults to None (no limit).
+            output (str | None): The "database.collection" written by a `$out` or
+                        `$merge` stage, whose result cache is invalidated once the
+                        aggregation ran. Defaults to None.
+        """
+        super().__init__(
+            collection, batch_size=batch_size, raw=raw, read_preference=read_preference
+        )
+        self._pipeline = pipeline
+        self._max_await_time_ms = max_await_time_ms
+        self._aggregate = collection._name if aggregate is None else aggregate
+        self._allow_disk_use = allow_disk_use
+        self._max_time_ms = max_time_ms
+        self._output = output
+
+    def _create_command(self):
+        """
+        Creates the `aggregate` command, or the `getMore` command once it ran.
+
+        Returns:
+            dict: The command to execute.
+        """
+        cmd = super()._create_command()
+        if self._id and self._max_await_time_ms is not None:
+            cmd.update({"maxTimeMS": self._max_await_time_ms})
+        return cmd
+
+    def _query_command(self) -> dict:
+        """
+        Creates the `aggregate` command of the pipeline.
+
+        Returns:
+            dict: The command, without a read preference.
+        """
+        cmd = {"aggregate": self._aggregate, "pipeline": self._pipeline, "cursor": {}}
+        if self._batch_size:
+            cmd["cursor"].update({"batchSize": self._batch_size})
+        if self._allow_disk_use is not None:
+            cmd.update({"allowDiskUse": self._allow_disk_use})
+        if self._max_time_ms is not None:
+            cmd.update({"maxTimeMS": self._max_time_ms})
+        if self._hint:
+            cmd.update({"hint": self._hint})
+        if self._comment is not None:
+            cmd.update({"comment": self._comment})
+
+        return cmd
+
+    def __await__(self):
+        """
+        Runs the aggregation without iterating over it, as pipelines ending in `$out`
+        or `$merge` are run for their writes:
+
+            await collection.aggregate([..., {"$out": "totals"}])
+
+        Returns:
+            AggregateCursor: The cursor, with the first batch of results buffered.
+        """
+        return self._run().__await__()
+
+    async def _run(self) -> "AggregateCursor":
+        """
+        Runs the `aggregate` command unless the cursor already ran or was closed.
+
+        Returns:
+            AggregateCursor: The current cursor instance.
+        """
+        if self._id is None and not self._killed:
+            await self._refresh()
+        return self
+
+    def __del__(self):
+        """
+        Warns about a `$out` or `$merge` pipeline that was never run, then kills
+        the server cursor of an abandoned aggregation.
+        """
+        if self._output is not None and self._id is None and not self._killed:
+            warnings.warn(
+                f"aggregation writing to {self._output!r} was never run, await or "
+                "iterate the cursor returned by aggregate()",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        super().__del__()
+
+    async def _fetch_batch(self) -> list:
+        """
+        Runs the next `aggregate` or `getMore` command, then invalidates the result
+        cache of the collection written by a `$out` or `$merge` stage.
+
+        Returns:
+            list: The documents of the batch returned by the server.
+        """
+        if self._output is None or self._id is not None:
+            return await super()._fetch_batch()
+
+        try:
+            return await super()._fetch_batch()
+        finally:
+            caches = self._collection._database._client.options.result_caches
+            cache = caches.get(self._output)
+            if cache is not None:
+                cache.invalidate()
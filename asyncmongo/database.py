@@ -1,5 +1,9 @@
+from contextlib import AbstractAsyncContextManager
+
+from asyncmongo.change_stream import ChangeStream
 from asyncmongo.collection import Collection
 from asyncmongo.connection import AsyncMongoConnection
+from asyncmongo.read_preferences import ReadPreference
 
 
 class Database:
@@ -7,17 +11,22 @@ class Database:
     Represents a MongoDB database, providing access to collections and database-level operations.
     """
 
-    def __init__(self, client, name: str) -> None:
+    def __init__(
+        self, client, name: str, read_preference: ReadPreference | None = None
+    ) -> None:
         """
         Initializes a Database instance.
 
         Args:
             client: The client instance managing the connection to the MongoDB server.
             name (str): The name of the database.
+            read_preference (ReadPreference | None): The read preference of reads from
+                the database. Defaults to None, which uses the client's.
         """
 
         self._name = name
         self._client = client
+        self._read_preference = read_preference
 
     def __getattr__(self, name: str) -> Collection:
         """
@@ -43,15 +52,103 @@ class Database:
 
         return self._name
 
-    def _get_connection(self) -> AsyncMongoConnection:
+    @property
+    def read_preference(self) -> ReadPreference:
         """
-        Retrieves the connection instance associated with the database.
+        The read preference of reads from the database.
 
         Returns:
-            AsyncMongoConnection: The connection instance.
+            ReadPreference: The database's read preference, or the client's if unset,
+            which becomes primaryPreferred on a direct connection to a replica set
+            member.
         """
 
-        return self._client.connection
+        if self._read_preference is not None:
+            return self._read_preference
+        return self._client.topology.read_preference(
+            self._client.options.read_preference
+        )
+
+    def with_options(self, read_preference: ReadPreference | None = None) -> "Database":
+        """
+        Returns a copy of the database with different options, e.g.:
+
+            analytics = client.exampleDB.with_options(read_preference=SECONDARY)
+
+        Args:
+            read_preference (ReadPreference | None): The new read preference.
+                                                     Defaults to None (unchanged).
+
+        Returns:
+            Database: The new Database instance.
+        """
+
+        return Database(
+            self._client, self._name, read_preference or self._read_preference
+        )
+
+    def _get_connection(
+        self,
+        address: tuple[str, int] | None = None,
+        read_preference: ReadPreference | None = None,
+    ) -> AbstractAsyncContextManager[AsyncMongoConnection]:
+        """
+        Checks a connection out of the client's pool for a single operation.
+
+        Args:
+            address (tuple[str, int] | None): The server to use instead of selecting
+                one, e.g. the one holding a cursor. Defaults to None.
+            read_preference (ReadPreference | None): Select a server for a read with
+                this preference. Defaults to None, which selects a writable server.
+
+        Returns:
+            AbstractAsyncContextManager[AsyncMongoConnection]: A context manager yielding
+            the connection and returning it to the pool on exit.
+        """
+
+        return self._client._get_connection(address, read_preference)
+
+    def watch(
+        self,
+        pipeline: list[dict] | None = None,
+        full_document: str | None = None,
+        resume_after: dict | None = None,
+        start_after: dict | None = None,
+        max_await_time_ms: int | None = None,
+        batch_size: int = 0,
+    ) -> ChangeStream:
+        """
+        Watches the changes made to every collection of the database. Change events
+        name their collection in `ns`.
+
+        Args:
+            pipeline (list[dict] | None): Stages applied to the change events, e.g.
+                                          a `$match`. Defaults to None.
+            full_document (str | None): "updateLookup" to include the current version
+                        of the document in update events. Defaults to None.
+            resume_after (dict | None): Start after the change with this resume token,
+                        e.g. a saved `ChangeStream.resume_token`. Defaults to None.
+            start_after (dict | None): Like `resume_after`, but may also start after
+                        an invalidate event. Defaults to None.
+            max_await_time_ms (int | None): How long the server waits for new changes
+                        before returning an empty batch. Defaults to None (server default).
+            batch_size (int): Maximum number of changes per batch. Defaults to 0
+                        (server default).
+
+        Returns:
+            ChangeStream: The stream, opened by `async with` or when first iterated.
+        """
+        # Database-wide aggregations run against the virtual $cmd.aggregate collection
+        return ChangeStream(
+            Collection(self, "$cmd.aggregate"),
+            pipeline,
+            full_document=full_document,
+            resume_after=resume_after,
+            start_after=start_after,
+            max_await_time_ms=max_await_time_ms,
+            batch_size=batch_size,
+            aggregate=1,
+        )
 
     async def list_collection_names(self) -> list[str]:
         """
@@ -64,8 +161,8 @@ class Database:
             Any exception that occurs during the command execution.
         """
 
-        conn = self._get_connection()
         _cmd = {"listCollections": 1, "cursor": {}}
-        resp = await conn.command(self._name, _cmd)
+        async with self._get_connection() as conn:
+            resp = await conn.command(self._name, _cmd)
         names = [item["name"] for item in resp["cursor"]["firstBatch"]]
         return names
@@ -1 +1,11 @@
-from .exceptions import AuthenticationFailedError  # noqa
+from .exceptions import (  # noqa
+    AuthenticationFailedError,
+    ConfigurationError,
+    ConnectionClosedError,
+    DocumentTooLargeError,
+    InvalidOperation,
+    OperationFailure,
+    ProtocolError,
+    ServerSelectionTimeoutError,
+    WaitQueueTimeoutError,
+)
@@ -1,2 +1,37 @@
 class AuthenticationFailedError(Exception):
     pass
+
+
+class ConnectionClosedError(Exception):
+    pass
+
+
+class WaitQueueTimeoutError(Exception):
+    pass
+
+
+class DocumentTooLargeError(Exception):
+    pass
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class ServerSelectionTimeoutError(Exception):
+    pass
+
+
+class InvalidOperation(Exception):
+    pass
+
+
+class ConfigurationError(ValueError):
+    pass
+
+
+class OperationFailure(Exception):
+    def __init__(self, message: str, code: int | None = None, details=None):
+        super().__init__(message)
+        self.code = code
+        self.details = details
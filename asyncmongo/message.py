@@ -1,6 +1,12 @@
 import ctypes
+import itertools
+import struct
+
 import bson
 
+from asyncmongo.compression import Compressor, get_compressor_by_id
+from asyncmongo.exceptions import ProtocolError
+
 """
 struct Section {
         uint8 payloadType;
@@ -24,6 +30,14 @@ struct OP_MSG {
         uint32      flagBits;
         Section+    sections;
         [uint32     checksum;]
+        };
+
+struct OP_COMPRESSED {
+        MsgHeader header;           // opCode = 2012
+        int32  originalOpcode;
+        int32  uncompressedSize;    // size of the message minus its header
+        uint8  compressorId;
+        char  *compressedMessage;
         };"""
 
 """
@@ -32,6 +46,57 @@ sample header we should go for:
     (16, 0, 0, 2013)
 """
 
+# messageLength, requestID, responseTo and opCode
+_MSG_HEADER_SIZE = 16
+
+# flagBits of an OP_MSG: the sender will not wait for a reply to this message
+MORE_TO_COME = 1 << 1
+# flagBits of an OP_MSG: the sender accepts replies streamed with MORE_TO_COME
+EXHAUST_ALLOWED = 1 << 16
+
+# requestID is an int32 on the wire, keep it positive and wrap around
+_MAX_REQUEST_ID = 0x7FFFFFFF
+_request_ids = itertools.count()
+
+
+def next_request_id() -> int:
+    """
+    Returns the next request id to use for an outgoing message.
+
+    Returns:
+        int: A monotonically increasing id in the range [1, 2**31 - 1].
+    """
+    return next(_request_ids) % _MAX_REQUEST_ID + 1
+
+
+def sequence_overhead(identifier: str) -> int:
+    """
+    Returns the bytes a kind-1 section adds on top of the documents it carries.
+
+    Args:
+        identifier (str): The identifier of the document sequence, e.g. "documents".
+
+    Returns:
+        int: Size of the section's kind byte, size field and identifier.
+    """
+    return 1 + 4 + len(identifier.encode("utf-8")) + 1
+
+
+def sequence_header(identifier: str, documents: list[bytes]) -> bytes:
+    """
+    Serializes the start of a kind-1 document sequence section.
+
+    Args:
+        identifier (str): The command field the documents belong to, e.g. "documents".
+        documents (list[bytes]): The already BSON-encoded documents that follow it.
+
+    Returns:
+        bytes: The section's kind byte, size and identifier.
+    """
+    ident = identifier.encode("utf-8") + b"\x00"
+    size = 4 + len(ident) + sum(len(doc) for doc in documents)
+    return b"\x01" + struct.pack("<i", size) + ident
+
 
 class OP_MSG(ctypes.Structure):
     _pack_ = 1  # This will pack the structure without extra padding
@@ -47,12 +112,139 @@ class OP_MSG(ctypes.Structure):
     ]
 
     @staticmethod
-    def new(bson_doc: dict) -> bytes:
-        bson_bytes = bson.dumps(bson_doc)
+    def new(
+        bson_doc: dict,
+        request_id: int | None = None,
+        sequences: dict[str, list[bytes]] | None = None,
+        flag_bits: int = 0,
+    ) -> bytes:
+        """
+        Serializes a command document into an OP_MSG.
+
+        The command is always sent as the kind-0 section. Each entry of `sequences`
+        is appended as a kind-1 document sequence, which lets the server read large
+        arrays such as insert documents without them being nested in the command.
+
+        Args:
+            bson_doc (dict): The command document.
+            request_id (int | None): The requestID to stamp on the message.
+                                     Defaults to the next id from `next_request_id`.
+            sequences (dict[str, list[bytes]] | None): BSON-encoded documents keyed by
+                                     the command field they belong to. Defaults to None.
+            flag_bits (int): The message flags, e.g. `MORE_TO_COME`. Defaults to 0.
+
+        Returns:
+            bytes: The serialized message.
+        """
+        return b"".join(OP_MSG.new_parts(bson_doc, request_id, sequences, flag_bits))
+
+    @staticmethod
+    def new_parts(
+        bson_doc: dict,
+        request_id: int | None = None,
+        sequences: dict[str, list[bytes]] | None = None,
+        flag_bits: int = 0,
+    ) -> list[bytes]:
+        """
+        Serializes a command like `new`, but returns the message as a list of buffers.
+
+        The buffers can be handed to `transport.writelines` as they are, so encoded
+        documents of a sequence are never copied into one large bytes object.
+
+        Args:
+            bson_doc (dict): The command document.
+            request_id (int | None): The requestID to stamp on the message.
+                                     Defaults to the next id from `next_request_id`.
+            sequences (dict[str, list[bytes]] | None): BSON-encoded documents keyed by
+                                     the command field they belong to. Defaults to None.
+            flag_bits (int): The message flags, e.g. `MORE_TO_COME`. Defaults to 0.
+
+        Returns:
+            list[bytes]: The header followed by the sections of the message.
+        """
+        parts = [b"", bson.dumps(bson_doc)]
+        for identifier, documents in (sequences or {}).items():
+            parts.append(sequence_header(identifier, documents))
+            parts.extend(documents)
 
         msg = OP_MSG()
         msg.opCode = 2013
-        total_message_size = len(bytes(msg)) + len(bson_bytes)
-        msg.messageLength = total_message_size
+        msg.flagBits = flag_bits
+        msg.requestID = request_id if request_id is not None else next_request_id()
+        msg.messageLength = ctypes.sizeof(OP_MSG) + sum(len(part) for part in parts)
+        parts[0] = bytes(msg)
+
+        return parts
+
+
+class OP_COMPRESSED(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = [
+        ("messageLength", ctypes.c_uint32),
+        ("requestID", ctypes.c_uint32),
+        ("responseTo", ctypes.c_uint32),
+        ("opCode", ctypes.c_uint32),
+        ("originalOpcode", ctypes.c_uint32),
+        ("uncompressedSize", ctypes.c_uint32),
+        ("compressorId", ctypes.c_uint8),
+    ]
+
+    @staticmethod
+    def new(parts: list[bytes], compressor: Compressor) -> list[bytes]:
+        """
+        Wraps a serialized message in an OP_COMPRESSED message.
+
+        Args:
+            parts (list[bytes]): The message to compress, e.g. from `OP_MSG.new_parts`.
+            compressor (Compressor): The negotiated compressor.
+
+        Returns:
+            list[bytes]: The OP_COMPRESSED header and the compressed message.
+        """
+        original = OP_MSG.from_buffer_copy(parts[0])
+        # The original header is not compressed, only what follows it
+        body = b"".join(parts)[_MSG_HEADER_SIZE:]
+        compressed = compressor.compress(body)
+
+        msg = OP_COMPRESSED()
+        msg.opCode = 2012
+        msg.requestID = original.requestID
+        msg.responseTo = original.responseTo
+        msg.originalOpcode = original.opCode
+        msg.uncompressedSize = len(body)
+        msg.compressorId = compressor.compressor_id
+        msg.messageLength = ctypes.sizeof(OP_COMPRESSED) + len(compressed)
+
+        return [bytes(msg), compressed]
+
+    @staticmethod
+    def decompress(frame: bytes | bytearray) -> bytes:
+        """
+        Restores the message wrapped in an OP_COMPRESSED message.
+
+        Args:
+            frame (bytes | bytearray): The complete OP_COMPRESSED message.
+
+        Returns:
+            bytes: The original message, with its own header.
+
+        Raises:
+            ProtocolError: If the decompressed size does not match the header.
+        """
+        header = OP_COMPRESSED.from_buffer_copy(frame)
+        compressor = get_compressor_by_id(header.compressorId)
+        body = compressor.decompress(memoryview(frame)[ctypes.sizeof(OP_COMPRESSED) :])
+        if len(body) != header.uncompressedSize:
+            raise ProtocolError(
+                f"Expected {header.uncompressedSize} bytes after decompression, "
+                f"got {len(body)}"
+            )
 
-        return bytes(msg) + bson_bytes
+        original = struct.pack(
+            "<iiii",
+            _MSG_HEADER_SIZE + len(body),
+            header.requestID,
+            header.responseTo,
+            header.originalOpcode,
+        )
+        return original + body
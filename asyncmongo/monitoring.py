@@ -0,0 +1,226 @@
+from dataclasses import dataclass
+
+# Commands whose contents are never handed to listeners, as they carry credentials
+SENSITIVE_COMMANDS = frozenset(
+    [
+        "authenticate",
+        "saslstart",
+        "saslcontinue",
+        "getnonce",
+        "createuser",
+        "updateuser",
+        "copydbgetnonce",
+        "copydbsaslstart",
+        "copydb",
+    ]
+)
+
+
+@dataclass
+class CommandStartedEvent:
+    """
+    Published when a command has been written to the connection.
+    """
+
+    command_name: str
+    database_name: str
+    request_id: int
+    connection_id: tuple[str, int]
+    command: dict | None
+    bytes_sent: int
+
+
+@dataclass
+class CommandSucceededEvent:
+    """
+    Published when the reply to a command has been received and decoded.
+
+    `bytes_received` is the size of the reply on the wire, which is smaller than
+    `reply_size`, the size of the reply document, when the reply was compressed.
+    """
+
+    command_name: str
+    database_name: str
+    request_id: int
+    connection_id: tuple[str, int]
+    duration: float
+    bytes_sent: int
+    bytes_received: int
+    reply_size: int
+    reply: dict | None
+
+
+@dataclass
+class CommandFailedEvent:
+    """
+    Published when a command raised instead of returning a reply, e.g. because the
+    connection was lost while it was in flight, or when the server replied with
+    `ok: 0`. In that case `failure` is an OperationFailure holding the reply.
+    """
+
+    command_name: str
+    database_name: str
+    request_id: int
+    connection_id: tuple[str, int]
+    duration: float
+    bytes_sent: int
+    failure: BaseException
+
+
+class CommandListener:
+    """
+    Base class for command listeners. Subclass it and override the events of
+    interest, then pass instances to the client:
+
+        client = await AsyncMongoClient.create(event_listeners=[MyListener()])
+
+    Listeners are called synchronously on the event loop, so they should return
+    quickly and must not block.
+    """
+
+    def started(self, event: CommandStartedEvent):
+        """
+        Called when a command has been sent.
+
+        Args:
+            event (CommandStartedEvent): The event.
+        """
+
+    def succeeded(self, event: CommandSucceededEvent):
+        """
+        Called when a command has received a successful reply.
+
+        Args:
+            event (CommandSucceededEvent): The event.
+        """
+
+    def failed(self, event: CommandFailedEvent):
+        """
+        Called when a command raised, or the server replied with `ok: 0`.
+
+        Args:
+            event (CommandFailedEvent): The event.
+        """
+
+
+class LatencyHistogram:
+    """
+    A histogram of command latencies with power-of-two microsecond buckets.
+
+    Recording is a handful of integer operations, so histograms are always kept.
+    Percentiles are approximate: they are reported as the upper bound of the
+    bucket they fall into, i.e. at most twice the actual value.
+    """
+
+    __slots__ = ("buckets", "count", "failures", "total", "max")
+
+    # Bucket i counts latencies in [2 ** (i - 1), 2 ** i) microseconds; the last
+    # bucket also holds everything above 2 ** 31 microseconds (about 36 minutes)
+    BUCKETS = 33
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float):
+        """
+        Adds the latency of a completed command.
+
+        Args:
+            duration (float): The latency in seconds.
+        """
+        index = int(duration * 1_000_000).bit_length()
+        self.buckets[index if index < self.BUCKETS else self.BUCKETS - 1] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    @property
+    def mean(self) -> float:
+        """
+        The mean latency in seconds, or 0.0 if nothing was recorded.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimates a latency percentile.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The upper bound in seconds of the bucket holding the percentile,
+            capped at the largest recorded latency. 0.0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(percent / 100 * self.count, 1)
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min((1 << index) / 1_000_000, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        """
+        Summarizes the histogram.
+
+        Returns:
+            dict: The count, failures, mean, p50, p99 and max latency in seconds.
+        """
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class CommandLatencies:
+    """
+    Latency histograms for every command a client has run, keyed by command name.
+    """
+
+    def __init__(self):
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    def __getitem__(self, command_name: str) -> LatencyHistogram:
+        """
+        Returns the histogram of a command, e.g. `latencies["find"]`.
+
+        Args:
+            command_name (str): The command name, as sent on the wire.
+
+        Returns:
+            LatencyHistogram: The histogram. Empty if the command was never run.
+        """
+        histogram = self._histograms.get(command_name)
+        if histogram is None:
+            histogram = self._histograms[command_name] = LatencyHistogram()
+        return histogram
+
+    def __iter__(self):
+        return iter(self._histograms)
+
+    def to_dict(self) -> dict[str, dict]:
+        """
+        Summarizes every histogram.
+
+        Returns:
+            dict[str, dict]: `LatencyHistogram.to_dict` of each command by name.
+        """
+        return {name: h.to_dict() for name, h in self._histograms.items()}
+
+    def reset(self):
+        """
+        Discards everything recorded so far.
+        """
+        self._histograms.clear()
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import ClassVar
+
+
+@dataclass
+class InsertOne:
+    """
+    Inserts a single document as part of a `Collection.bulk_write`.
+    """
+
+    document: dict
+
+    _command: ClassVar[str] = "insert"
+
+    def _to_document(self) -> dict:
+        return self.document
+
+
+@dataclass
+class UpdateOne:
+    """
+    Updates the first document matching `filter` as part of a `Collection.bulk_write`.
+    """
+
+    filter: dict
+    update: dict
+    upsert: bool = False
+
+    _command: ClassVar[str] = "update"
+    _multi: ClassVar[bool] = False
+
+    def _to_document(self) -> dict:
+        return {
+            "q": self.filter,
+            "u": self.update,
+            "multi": self._multi,
+            "upsert": self.upsert,
+        }
+
+
+@dataclass
+class UpdateMany(UpdateOne):
+    """
+    Updates every document matching `filter` as part of a `Collection.bulk_write`.
+    """
+
+    _multi: ClassVar[bool] = True
+
+
+@dataclass
+class ReplaceOne:
+    """
+    Replaces the first document matching `filter` as part of a `Collection.bulk_write`.
+    """
+
+    filter: dict
+    replacement: dict
+    upsert: bool = False
+
+    _command: ClassVar[str] = "update"
+
+    def _to_document(self) -> dict:
+        replacement = {k: v for k, v in self.replacement.items() if k != "_id"}
+        return {
+            "q": self.filter,
+            "u": replacement,
+            "multi": False,
+            "upsert": self.upsert,
+        }
+
+
+@dataclass
+class DeleteOne:
+    """
+    Deletes the first document matching `filter` as part of a `Collection.bulk_write`.
+    """
+
+    filter: dict
+
+    _command: ClassVar[str] = "delete"
+    _limit: ClassVar[int] = 1
+
+    def _to_document(self) -> dict:
+        return {"q": self.filter, "limit": self._limit}
+
+
+@dataclass
+class DeleteMany(DeleteOne):
+    """
+    Deletes every document matching `filter` as part of a `Collection.bulk_write`.
+    """
+
+    _limit: ClassVar[int] = 0
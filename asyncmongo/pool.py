@@ -0,0 +1,240 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator
+
+from asyncmongo.connection import AsyncMongoConnection
+from asyncmongo.exceptions import ConnectionClosedError, WaitQueueTimeoutError
+
+from .client_options import ClientOptions
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    Maintains a set of authenticated connections to a single MongoDB server.
+
+    Operations check a connection out for their duration and return it afterwards,
+    so concurrent operations spread across up to `max_pool_size` sockets. At least
+    `min_pool_size` connections are kept open, and connections left idle for longer
+    than `max_idle_time_ms` are closed.
+    """
+
+    maintenance_interval: float = 10.0
+
+    def __init__(self, host: str, port: int, options: ClientOptions):
+        """
+        Initializes an empty ConnectionPool.
+
+        Args:
+            host (str): Hostname or IP address of the MongoDB server.
+            port (int): Port number of the MongoDB server.
+            options (ClientOptions): Client options, including the pool limits.
+        """
+        self.host = host
+        self.port = port
+        self.options = options
+
+        # Idle connections with the time they were checked in, most recent last
+        self._idle: deque[tuple[AsyncMongoConnection, float]] = deque()
+        self._size = 0  # idle, checked out and currently opening connections
+        self._semaphore = asyncio.Semaphore(options.max_pool_size)
+        self._maintenance_task: asyncio.Task | None = None
+        self._closed = False
+
+    @classmethod
+    async def create(
+        cls, host: str, port: int, options: ClientOptions | None = None
+    ) -> "ConnectionPool":
+        """
+        Creates a pool and pre-warms it with `min_pool_size` connections.
+
+        Args:
+            host (str): Hostname or IP address of the MongoDB server.
+            port (int): Port number of the MongoDB server.
+            options (ClientOptions | None): Client options. Defaults to ClientOptions().
+
+        Returns:
+            ConnectionPool: The pool, ready for checkouts.
+        """
+        self = cls(host, port, options or ClientOptions())
+        await self.open()
+        return self
+
+    async def open(self):
+        """
+        Pre-warms the pool with `min_pool_size` connections and starts the task that
+        evicts idle connections and keeps the pool topped up. Only the first call
+        has any effect.
+        """
+        if self._maintenance_task is not None:
+            return
+        self._maintenance_task = asyncio.create_task(self._maintain())
+        await self._fill()
+
+    @property
+    def size(self) -> int:
+        """
+        The number of connections currently owned by the pool, idle or checked out.
+
+        Returns:
+            int: The number of open connections.
+        """
+        return self._size
+
+    @contextlib.asynccontextmanager
+    async def checkout(self) -> AsyncIterator[AsyncMongoConnection]:
+        """
+        Checks a connection out of the pool for the duration of the `async with` block.
+
+        Yields:
+            AsyncMongoConnection: A connection reserved for the caller.
+
+        Raises:
+            WaitQueueTimeoutError: If no connection became available within `wait_queue_timeout_ms`.
+            ConnectionClosedError: If the pool has been closed.
+        """
+        if self._closed:
+            raise ConnectionClosedError("Connection pool closed")
+
+        timeout = self.options.wait_queue_timeout_ms
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(),
+                timeout / 1000 if timeout is not None else None,
+            )
+        except asyncio.TimeoutError:
+            raise WaitQueueTimeoutError(
+                f"Timed out after {timeout}ms waiting for a connection to "
+                f"{self.host}:{self.port}"
+            ) from None
+
+        try:
+            connection = await self._get_idle_or_connect()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+        try:
+            yield connection
+        finally:
+            self._checkin(connection)
+            self._semaphore.release()
+
+    async def close(self):
+        """
+        Closes the pool and every idle connection. Checked-out connections are
+        closed when they are returned.
+        """
+        self._closed = True
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+        idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            self._size -= 1
+            await connection.close()
+
+    async def _get_idle_or_connect(self) -> AsyncMongoConnection:
+        """
+        Returns the most recently used healthy idle connection, or opens a new one.
+
+        Returns:
+            AsyncMongoConnection: An open connection.
+        """
+        while self._idle:
+            connection, last_used = self._idle.pop()
+            if connection.closed or self._is_stale(last_used):
+                self._discard(connection)
+                continue
+            return connection
+
+        return await self._connect()
+
+    async def _connect(self) -> AsyncMongoConnection:
+        """
+        Opens and authenticates a new connection owned by the pool.
+
+        Returns:
+            AsyncMongoConnection: The new connection.
+
+        Raises:
+            TimeoutError: If connecting and the handshake took longer than
+                          `connect_timeout_ms`.
+        """
+        self._size += 1
+        try:
+            return await asyncio.wait_for(
+                AsyncMongoConnection.create(self.host, self.port, self.options),
+                self.options.connect_timeout_ms / 1000,
+            )
+        except BaseException:
+            self._size -= 1
+            raise
+
+    def _checkin(self, connection: AsyncMongoConnection):
+        """
+        Returns a connection to the idle set, or closes it if it can no longer be used.
+
+        Args:
+            connection (AsyncMongoConnection): The connection being returned.
+        """
+        if self._closed or connection.closed:
+            self._discard(connection)
+        else:
+            self._idle.append((connection, time.monotonic()))
+
+    def _discard(self, connection: AsyncMongoConnection):
+        """
+        Drops a connection from the pool and closes it in the background.
+
+        Args:
+            connection (AsyncMongoConnection): The connection to close.
+        """
+        self._size -= 1
+        asyncio.ensure_future(connection.close())
+
+    def _is_stale(self, last_used: float) -> bool:
+        """
+        Checks whether an idle connection exceeded `max_idle_time_ms`.
+
+        Args:
+            last_used (float): The monotonic time the connection was checked in.
+
+        Returns:
+            bool: True if the connection should be evicted.
+        """
+        max_idle = self.options.max_idle_time_ms
+        return max_idle is not None and time.monotonic() - last_used > max_idle / 1000
+
+    async def _fill(self):
+        """
+        Opens connections until the pool holds at least `min_pool_size` of them.
+        """
+        while not self._closed and self._size < self.options.min_pool_size:
+            connection = await self._connect()
+            # Fresh connections go to the right end, keeping the deque in age order
+            self._idle.append((connection, time.monotonic()))
+
+    async def _maintain(self):
+        """
+        Periodically evicts idle connections and tops the pool back up to `min_pool_size`.
+        """
+        while not self._closed:
+            await asyncio.sleep(self.maintenance_interval)
+            # The oldest idle connections sit at the left end of the deque
+            while self._idle and self._is_stale(self._idle[0][1]):
+                connection, _ = self._idle.popleft()
+                self._discard(connection)
+            try:
+                await self._fill()
+            except Exception:
+                # E.g. the server is unreachable; try again on the next round
+                logger.warning(
+                    "Could not fill the pool of %s:%s",
+                    self.host,
+                    self.port,
+                    exc_info=True,
+                )
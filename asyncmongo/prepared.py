@@ -0,0 +1,135 @@
+import struct
+from io import BytesIO
+
+from bson.codec import encode_value
+
+from asyncmongo.exceptions import OperationFailure
+from asyncmongo.message import next_request_id
+from asyncmongo.raw_bson import RawBSONDocument
+
+# The OP_MSG header, flagBits and the kind byte of the body section
+_OP_MSG_PREFIX = struct.Struct("<iiiiIb")
+_int32 = struct.Struct("<i")
+
+
+def _encode_elements(document: dict) -> bytes:
+    """
+    Encodes the elements of a document without its length prefix and trailing NUL,
+    so they can be spliced into a larger document.
+
+    Args:
+        document (dict): The fields to encode, in order.
+
+    Returns:
+        bytes: The encoded elements.
+    """
+    buffer = BytesIO()
+    for name, value in document.items():
+        encode_value(name, value, buffer, [], None)
+    return buffer.getvalue()
+
+
+class PreparedFindOne:
+    """
+    A `find_one` whose filter always matches the same fields, encoded ahead of time.
+
+    Everything but the filter values is serialized once, when the command is prepared.
+    Each call only encodes the values and splices them between the pre-encoded parts,
+    skipping the command dict, the full BSON encoding and the ctypes header that
+    `Collection.find_one` goes through. Queries use the read preference the
+    collection had when the command was prepared.
+    """
+
+    def __init__(self, collection, fields: list[str], raw: bool = False):
+        """
+        Initializes a PreparedFindOne. Use `Collection.prepare_find_one` instead.
+
+        Args:
+            collection (Collection): The collection to query.
+            fields (list[str]): The names of the filter fields, in the order their
+                                values are passed when the command is run.
+            raw (bool): Return RawBSONDocuments instead of dicts. Defaults to False.
+        """
+        self._collection = collection
+        self.fields = list(fields)
+        self.raw = raw
+        self.read_preference = collection.read_preference
+
+        # {"find": <name>, "filter": {<fields>}, "limit": 1, "singleBatch": True, "$db": <db>}
+        suffix = {"limit": 1, "singleBatch": True, "$db": collection._database.name}
+        if self.read_preference.mode != "primary":
+            suffix["$readPreference"] = self.read_preference.document
+        self._prefix = _encode_elements({"find": collection._name}) + b"\x03filter\x00"
+        self._suffix = _encode_elements(suffix) + b"\x00"
+
+    def encode(self, *values, request_id: int | None = None) -> list[bytes]:
+        """
+        Serializes the command for one set of filter values.
+
+        Args:
+            *values: The value of each filter field, in the order of `fields`.
+            request_id (int | None): The requestID to stamp on the message.
+                                     Defaults to the next id from `next_request_id`.
+
+        Returns:
+            list[bytes]: The serialized OP_MSG, as accepted by `AsyncMongoConnection.send`.
+
+        Raises:
+            TypeError: If the number of values does not match the number of fields.
+        """
+        if len(values) != len(self.fields):
+            raise TypeError(
+                f"Expected {len(self.fields)} filter values, got {len(values)}"
+            )
+
+        elements = _encode_elements(dict(zip(self.fields, values)))
+        filter_size = 4 + len(elements) + 1
+        body_size = 4 + len(self._prefix) + filter_size + len(self._suffix)
+        header = _OP_MSG_PREFIX.pack(
+            _OP_MSG_PREFIX.size + body_size,
+            request_id if request_id is not None else next_request_id(),
+            0,
+            2013,
+            0,
+            0,
+        )
+        return [
+            header,
+            _int32.pack(body_size),
+            self._prefix,
+            _int32.pack(filter_size),
+            elements,
+            b"\x00",
+            self._suffix,
+        ]
+
+    async def __call__(self, *values) -> dict | RawBSONDocument | None:
+        """
+        Runs the query for one set of filter values.
+
+        Args:
+            *values: The value of each filter field, in the order of `fields`.
+
+        Returns:
+            dict | RawBSONDocument | None: The first matching document, or None if no match is found.
+
+        Raises:
+            OperationFailure: If the server failed the query.
+        """
+        payload = self.encode(*values)
+        database = self._collection._database
+        async with database._get_connection(
+            read_preference=self.read_preference
+        ) as conn:
+            reply = await conn.send_command(
+                "find", database.name, payload, raw=self.raw
+            )
+
+        if not reply.get("ok"):
+            raise OperationFailure(
+                reply.get("errmsg", "Query failed"), reply.get("code"), reply
+            )
+        batch = reply["cursor"]["firstBatch"]
+        if not batch:
+            return None
+        return batch[0]
@@ -0,0 +1,214 @@
+import struct
+from binascii import b2a_hex
+from collections.abc import Iterator, Mapping
+from datetime import datetime, timezone
+from uuid import UUID
+
+import bson
+
+_int32 = struct.Struct("<i")
+_int64 = struct.Struct("<q")
+_uint64 = struct.Struct("<Q")
+_double = struct.Struct("<d")
+
+# Size of the fixed-width BSON element values, keyed by element type
+_FIXED_SIZES = {
+    0x01: 8,  # double
+    0x06: 0,  # undefined
+    0x07: 12,  # ObjectId
+    0x08: 1,  # boolean
+    0x09: 8,  # UTC datetime
+    0x0A: 0,  # null
+    0x10: 4,  # int32
+    0x11: 8,  # timestamp
+    0x12: 8,  # int64
+    0x13: 16,  # decimal128
+    0x7F: 0,  # max key
+    0xFF: 0,  # min key
+}
+
+
+def _find_nul(buffer, start: int) -> int:
+    """
+    Returns the position of the first NUL byte at or after `start`.
+    """
+    if isinstance(buffer, memoryview):
+        end = start
+        while buffer[end]:
+            end += 1
+        return end
+    return buffer.index(0, start)
+
+
+def _value_end(buffer, element_type: int, start: int) -> int:
+    """
+    Returns the offset just past the value of an element.
+
+    Args:
+        buffer: The buffer holding the element.
+        element_type (int): The BSON element type.
+        start (int): Offset of the element's value.
+
+    Returns:
+        int: The offset of the next element.
+
+    Raises:
+        ValueError: If the element type is unknown.
+    """
+    size = _FIXED_SIZES.get(element_type)
+    if size is not None:
+        return start + size
+    if element_type in (0x02, 0x0D, 0x0E):  # string, code, symbol
+        return start + 4 + _int32.unpack_from(buffer, start)[0]
+    if element_type in (0x03, 0x04, 0x0F):  # document, array, code with scope
+        return start + _int32.unpack_from(buffer, start)[0]
+    if element_type == 0x05:  # binary
+        return start + 5 + _int32.unpack_from(buffer, start)[0]
+    if element_type == 0x0B:  # regex, two cstrings
+        return _find_nul(buffer, _find_nul(buffer, start) + 1) + 1
+    if element_type == 0x0C:  # DBPointer
+        return start + 4 + _int32.unpack_from(buffer, start)[0] + 12
+    raise ValueError(f"Unknown BSON element type {element_type:#04x}")
+
+
+def _decode_value(buffer, element_type: int, start: int, end: int):
+    """
+    Decodes a single element value, matching the types produced by `bson.loads`.
+    Embedded documents are returned as RawBSONDocument without being decoded.
+
+    Raises:
+        ValueError: If the element type is not supported.
+    """
+    if element_type == 0x01:
+        return _double.unpack_from(buffer, start)[0]
+    if element_type == 0x02:
+        return bytes(buffer[start + 4 : end - 1]).decode("utf-8")
+    if element_type == 0x03:
+        return RawBSONDocument(buffer, start)
+    if element_type == 0x04:
+        return [
+            _decode_value(buffer, *element)
+            for _, element in _iter_elements(buffer, start, end)
+        ]
+    if element_type == 0x05:
+        subtype = buffer[start + 4]
+        value = bytes(buffer[start + 5 : end])
+        return UUID(bytes=value) if subtype in (0x03, 0x04) else value
+    if element_type == 0x07:
+        return b2a_hex(buffer[start:end])
+    if element_type == 0x08:
+        return bool(buffer[start])
+    if element_type == 0x09:
+        millis = _int64.unpack_from(buffer, start)[0]
+        return datetime.fromtimestamp(millis / 1000.0, timezone.utc)
+    if element_type == 0x0A:
+        return None
+    if element_type == 0x10:
+        return _int32.unpack_from(buffer, start)[0]
+    if element_type == 0x11:
+        return _uint64.unpack_from(buffer, start)[0]
+    if element_type == 0x12:
+        return _int64.unpack_from(buffer, start)[0]
+    raise ValueError(f"Unsupported BSON element type {element_type:#04x}")
+
+
+def _iter_elements(buffer, start: int, end: int) -> Iterator[tuple[bytes, tuple]]:
+    """
+    Walks the elements of the document spanning [start, end) without decoding them.
+
+    Yields:
+        tuple[bytes, tuple]: The raw element name and (type, value start, value end).
+    """
+    position = start + 4
+    end -= 1  # trailing NUL
+    while position < end:
+        element_type = buffer[position]
+        name_end = _find_nul(buffer, position + 1)
+        name = bytes(buffer[position + 1 : name_end])
+        value_start = name_end + 1
+        value_end = _value_end(buffer, element_type, value_start)
+        yield name, (element_type, value_start, value_end)
+        position = value_end
+
+
+class RawBSONDocument(Mapping):
+    """
+    A read-only BSON document that keeps a reference to the buffer it was read from
+    and only decodes fields when they are accessed.
+
+    Embedded documents are themselves RawBSONDocuments sharing the same buffer, so
+    reading a few fields of a wide document, or forwarding its bytes elsewhere,
+    costs far less than decoding it into a dict.
+    """
+
+    __slots__ = ("_buffer", "_start", "_end", "_elements")
+
+    def __init__(self, buffer: bytes | bytearray | memoryview, offset: int = 0):
+        """
+        Initializes a RawBSONDocument over part of a buffer. No data is copied.
+
+        Args:
+            buffer (bytes | bytearray | memoryview): The buffer holding the document.
+            offset (int): Offset of the document within the buffer. Defaults to 0.
+        """
+        self._buffer = buffer
+        self._start = offset
+        self._end = offset + _int32.unpack_from(buffer, offset)[0]
+        self._elements: dict[str, tuple] | None = None
+
+    @property
+    def raw(self) -> bytes:
+        """
+        The encoded document, e.g. to pass through to another service.
+
+        Returns:
+            bytes: A copy of the document's BSON bytes.
+        """
+        return bytes(self.view)
+
+    @property
+    def view(self) -> memoryview:
+        """
+        A zero-copy view of the encoded document.
+
+        Returns:
+            memoryview: The document's BSON bytes within the original buffer.
+        """
+        return memoryview(self._buffer)[self._start : self._end]
+
+    def to_dict(self) -> dict:
+        """
+        Fully decodes the document.
+
+        Returns:
+            dict: The document, as `bson.loads` would return it.
+        """
+        return bson.loads(self.raw)
+
+    def _index(self) -> dict[str, tuple]:
+        """
+        Locates every element of the document, on first use only.
+
+        Returns:
+            dict[str, tuple]: The (type, value start, value end) of each field by name.
+        """
+        if self._elements is None:
+            self._elements = {
+                name.decode("utf-8"): element
+                for name, element in _iter_elements(
+                    self._buffer, self._start, self._end
+                )
+            }
+        return self._elements
+
+    def __getitem__(self, key: str):
+        return _decode_value(self._buffer, *self._index()[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __repr__(self) -> str:
+        return f"RawBSONDocument({self.raw!r})"
@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+
+from asyncmongo.exceptions import ConfigurationError
+
+# Read preference modes, as sent in $readPreference
+MODES = ("primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest")
+
+# How often a primary writes to its oplog when idle, which bounds how precisely
+# the staleness of a secondary can be estimated
+_IDLE_WRITE_PERIOD = 10.0
+# The smallest maxStalenessSeconds servers accept
+SMALLEST_MAX_STALENESS_SECONDS = 90
+
+
+@dataclass(frozen=True)
+class ReadPreference:
+    """
+    Which replica set members reads may be sent to.
+
+    With `tag_sets`, only secondaries whose tags include every tag of the first
+    matching tag set are eligible; `({},)` as the last set falls back to any
+    secondary. With `max_staleness_seconds`, secondaries estimated to lag the
+    primary by more than that are not eligible.
+
+    Read preferences only affect reads; writes always go to the primary.
+    """
+
+    mode: str = "primary"
+    tag_sets: tuple[dict, ...] | None = None
+    max_staleness_seconds: int = -1
+
+    def __post_init__(self):
+        """
+        Validates the read preference.
+
+        Raises:
+            ValueError: If the mode is unknown, or if tags or a maximum staleness are
+                        combined with "primary".
+            ConfigurationError: If the maximum staleness is below 90 seconds.
+        """
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown read preference mode {self.mode!r}")
+        if self.tag_sets is not None:
+            object.__setattr__(self, "tag_sets", tuple(self.tag_sets))
+        if self.mode == "primary" and (
+            self.tag_sets or self.max_staleness_seconds != -1
+        ):
+            raise ValueError(
+                "Read preference primary cannot be combined with tags or maxStalenessSeconds"
+            )
+        if 0 <= self.max_staleness_seconds < SMALLEST_MAX_STALENESS_SECONDS:
+            raise ConfigurationError(
+                f"maxStalenessSeconds must be at least {SMALLEST_MAX_STALENESS_SECONDS}"
+            )
+
+    @property
+    def document(self) -> dict:
+        """
+        The read preference as sent to the server in `$readPreference`.
+
+        Returns:
+            dict: The mode, and the tags and maxStalenessSeconds if set.
+        """
+        document = {"mode": self.mode}
+        if self.tag_sets:
+            document["tags"] = list(self.tag_sets)
+        if self.max_staleness_seconds != -1:
+            document["maxStalenessSeconds"] = self.max_staleness_seconds
+        return document
+
+    def select(self, descriptions: list, heartbeat_frequency: float) -> list:
+        """
+        Selects the servers eligible for a read.
+
+        Outside of a replica set, every mongos or standalone is eligible whatever
+        the mode; the preference is forwarded to mongos in `$readPreference`.
+
+        Args:
+            descriptions (list[ServerDescription]): The known servers.
+            heartbeat_frequency (float): Seconds between heartbeats, used to
+                                         estimate staleness.
+
+        Returns:
+            list[ServerDescription]: The eligible servers.
+
+        Raises:
+            ConfigurationError: If `max_staleness_seconds` is below the heartbeat
+                                frequency plus the primary's idle write period, as
+                                staleness cannot be estimated that precisely.
+        """
+        others = [d for d in descriptions if d.server_type in ("Mongos", "Standalone")]
+        if others:
+            return others
+
+        smallest = heartbeat_frequency + _IDLE_WRITE_PERIOD
+        if 0 <= self.max_staleness_seconds < smallest:
+            raise ConfigurationError(
+                f"maxStalenessSeconds must be at least {smallest:g} with a "
+                f"heartbeat frequency of {heartbeat_frequency:g} seconds"
+            )
+
+        primaries = [d for d in descriptions if d.server_type == "RSPrimary"]
+        if self.mode == "primary":
+            return primaries
+        if self.mode == "primaryPreferred" and primaries:
+            return primaries
+
+        secondaries = [d for d in descriptions if d.server_type == "RSSecondary"]
+        secondaries = self._filter_stale(secondaries, primaries, heartbeat_frequency)
+        if self.mode == "nearest":
+            return self._filter_tags(primaries + secondaries)
+
+        secondaries = self._filter_tags(secondaries)
+        if self.mode == "secondaryPreferred" and not secondaries:
+            return primaries
+        return secondaries
+
+    def _filter_tags(self, descriptions: list) -> list:
+        """
+        Keeps the servers matching the first tag set that matches any server.
+        """
+        if not self.tag_sets:
+            return descriptions
+        for tag_set in self.tag_sets:
+            matching = [
+                d
+                for d in descriptions
+                if all(d.hello.get("tags", {}).get(k) == v for k, v in tag_set.items())
+            ]
+            if matching:
+                return matching
+        return []
+
+    def _filter_stale(
+        self, secondaries: list, primaries: list, heartbeat_frequency: float
+    ) -> list:
+        """
+        Drops the secondaries whose estimated lag exceeds `max_staleness_seconds`.
+        """
+        if self.max_staleness_seconds == -1:
+            return secondaries
+
+        def staleness(description) -> float:
+            if primaries:
+                primary = primaries[0]
+                return (
+                    (description.last_update_time - description.last_write_date)
+                    - (primary.last_update_time - primary.last_write_date)
+                    + heartbeat_frequency
+                )
+            latest = max(s.last_write_date for s in secondaries)
+            return latest - description.last_write_date + heartbeat_frequency
+
+        return [s for s in secondaries if staleness(s) <= self.max_staleness_seconds]
+
+
+PRIMARY = ReadPreference("primary")
+PRIMARY_PREFERRED = ReadPreference("primaryPreferred")
+SECONDARY = ReadPreference("secondary")
+SECONDARY_PREFERRED = ReadPreference("secondaryPreferred")
+NEAREST = ReadPreference("nearest")
+
+
+def parse_tag_set(value: str) -> dict:
+    """
+    Parses a `readPreferenceTags` URI option such as "dc:ny,rack:1".
+
+    Args:
+        value (str): The option value. An empty string matches any server.
+
+    Returns:
+        dict: The tag set.
+    """
+    return dict(tag.split(":", 1) for tag in value.split(",") if tag)
@@ -0,0 +1,169 @@
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Command fields that do not change which documents a query returns
+_IGNORED_FIELDS = frozenset(
+    ["batchSize", "singleBatch", "maxTimeMS", "comment", "$readPreference", "$db"]
+)
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a ResultCache.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        The fraction of lookups answered from the cache, or 0.0 before any lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _freeze(value, sort_keys: bool = False):
+    """
+    Converts a BSON value into a hashable equivalent.
+
+    Values of different types stay distinct, so `True`, `1` and `1.0` never share
+    a key. Keys of query operator documents such as `{"$gte": 1, "$lt": 5}` are
+    sorted, as their order does not matter; keys of other embedded documents are
+    not, as the server matches those documents field by field in order.
+    """
+    if isinstance(value, dict):
+        items = [
+            (key, _freeze(item, key.startswith("$"))) for key, item in value.items()
+        ]
+        if sort_keys or any(key.startswith("$") for key in value):
+            items.sort()
+        return ("dict", tuple(items))
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(_freeze(item) for item in value))
+    return (type(value).__name__, value)
+
+
+def cache_key(command: dict):
+    """
+    Builds the cache key of a `find` command, so equivalent queries share entries.
+
+    The top-level fields and the fields of the filter are sorted, and fields that
+    only affect how results are delivered, such as `batchSize`, are ignored.
+
+    Args:
+        command (dict): The `find` command.
+
+    Returns:
+        tuple: A hashable key.
+    """
+    return tuple(
+        sorted(
+            (key, _freeze(value, sort_keys=key == "filter"))
+            for key, value in command.items()
+            if key not in _IGNORED_FIELDS
+        )
+    )
+
+
+class ResultCache:
+    """
+    A client-side LRU cache of query results with a time to live.
+
+    Enable it per collection with `Collection.enable_cache`. Entries are dropped
+    when they expire, when the cache holds more than `max_entries` of them, and
+    whenever a write goes through a Collection of the same namespace. Writes made
+    by other clients, or through other means, are only seen once entries expire,
+    so the TTL bounds how stale a result may be.
+
+    Documents are copied in and out of the cache, so callers may modify them.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, ttl: float = 60.0, max_documents: int = 100
+    ):
+        """
+        Initializes a ResultCache instance.
+
+        Args:
+            max_entries (int): Maximum number of cached queries. Defaults to 1024.
+            ttl (float): Seconds an entry stays valid. Defaults to 60.
+            max_documents (int): Queries returning more documents are not cached.
+                                 Defaults to 100.
+
+        Raises:
+            ValueError: If `max_entries` is smaller than 1 or `ttl` is not positive.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_documents = max_documents
+        self.stats = CacheStats()
+        # Bumped by every invalidation, so results of queries that were in flight
+        # during a write are not cached
+        self.generation = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key) -> list | None:
+        """
+        Looks up the result of a query.
+
+        Args:
+            key: The key built by `cache_key`.
+
+        Returns:
+            list | None: A copy of the cached documents, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def put(self, key, documents: list, generation: int):
+        """
+        Caches the result of a query.
+
+        Args:
+            key: The key built by `cache_key`.
+            documents (list): Every document the query returned.
+            generation (int): The `generation` of the cache when the query was sent.
+                              The result is discarded if a write happened since.
+        """
+        if generation != self.generation or len(documents) > self.max_documents:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(documents))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self):
+        """
+        Drops every entry, e.g. after a write to the collection.
+        """
+        self._entries.clear()
+        self.generation += 1
+        self.stats.invalidations += 1
@@ -0,0 +1,556 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+
+from asyncmongo.connection import AsyncMongoConnection
+from asyncmongo.exceptions import (
+    ConnectionClosedError,
+    OperationFailure,
+    ProtocolError,
+    ServerSelectionTimeoutError,
+)
+from asyncmongo.pool import ConnectionPool
+from asyncmongo.read_preferences import PRIMARY_PREFERRED, ReadPreference
+from asyncmongo.uri_parser import parse_host
+
+from .client_options import ClientOptions
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the moving average of a server's round trip time
+_RTT_ALPHA = 0.2
+# Shortest pause between two checks of the same server, even if one is requested
+_MIN_HEARTBEAT_INTERVAL = 0.5
+# Errors that mean a server could not be reached, as opposed to a failed command
+_NETWORK_ERRORS = (OSError, ConnectionClosedError, ProtocolError, asyncio.TimeoutError)
+
+# Server types a write can be sent to
+WRITABLE_SERVER_TYPES = frozenset(["Standalone", "RSPrimary", "Mongos"])
+# Server types that belong to a replica set
+REPLICA_SET_SERVER_TYPES = frozenset(
+    ["RSPrimary", "RSSecondary", "RSArbiter", "RSOther", "RSGhost"]
+)
+
+
+def server_type(hello: dict) -> str:
+    """
+    Classifies a server from its `hello` reply.
+
+    Args:
+        hello (dict): The reply to the `hello` command.
+
+    Returns:
+        str: One of "Standalone", "Mongos", "RSPrimary", "RSSecondary", "RSArbiter",
+        "RSOther", "RSGhost" or "Unknown".
+    """
+    if not hello.get("ok"):
+        return "Unknown"
+    if hello.get("isreplicaset"):
+        return "RSGhost"
+    if hello.get("setName"):
+        if hello.get("hidden"):
+            return "RSOther"
+        if hello.get("isWritablePrimary") or hello.get("ismaster"):
+            return "RSPrimary"
+        if hello.get("secondary"):
+            return "RSSecondary"
+        if hello.get("arbiterOnly"):
+            return "RSArbiter"
+        return "RSOther"
+    if hello.get("msg") == "isdbgrid":
+        return "Mongos"
+    return "Standalone"
+
+
+@dataclass
+class ServerDescription:
+    """
+    What the last heartbeat learned about a server.
+    """
+
+    address: tuple[str, int]
+    server_type: str = "Unknown"
+    round_trip_time: float | None = None
+    hello: dict = field(default_factory=dict)
+    error: Exception | None = None
+    last_update_time: float = field(default_factory=time.monotonic)
+
+    @property
+    def is_known(self) -> bool:
+        """
+        Whether the server answered its last heartbeat.
+        """
+        return self.server_type != "Unknown"
+
+    @property
+    def set_name(self) -> str | None:
+        """
+        The name of the replica set the server belongs to, if any.
+        """
+        return self.hello.get("setName")
+
+    @property
+    def last_write_date(self) -> float:
+        """
+        When the server last wrote to its oplog, in seconds since the epoch.
+        0.0 if it did not report it.
+        """
+        last_write = self.hello.get("lastWrite") or {}
+        date = last_write.get("lastWriteDate")
+        return date.timestamp() if date is not None else 0.0
+
+    @property
+    def members(self) -> set[tuple[str, int]]:
+        """
+        The addresses of every replica set member the server knows about.
+        """
+        hosts = (
+            self.hello.get("hosts", [])
+            + self.hello.get("passives", [])
+            + self.hello.get("arbiters", [])
+        )
+        return {parse_host(host) for host in hosts}
+
+
+def writable_server_selector(
+    descriptions: list[ServerDescription],
+) -> list[ServerDescription]:
+    """
+    Selects the servers that accept writes: the primary, a standalone or mongoses.
+
+    Args:
+        descriptions (list[ServerDescription]): The known servers.
+
+    Returns:
+        list[ServerDescription]: The suitable servers.
+    """
+    return [d for d in descriptions if d.server_type in WRITABLE_SERVER_TYPES]
+
+
+class Server:
+    """
+    A member of the topology: its connection pool, and a monitor that sends it a
+    `hello` every `heartbeat_frequency_ms` to track its type and round trip time.
+    """
+
+    def __init__(self, address: tuple[str, int], topology: "Topology"):
+        """
+        Initializes a Server. The pool is not opened and the monitor not started.
+
+        Args:
+            address (tuple[str, int]): The host and port of the server.
+            topology (Topology): The topology the server belongs to.
+        """
+        self.address = address
+        self.description = ServerDescription(address)
+        self.pool = ConnectionPool(*address, topology.options)
+        self.checked = asyncio.Event()  # set once the first check completes
+
+        self._topology = topology
+        self._monitor_options = ClientOptions(
+            connect_timeout_ms=topology.options.connect_timeout_ms
+        )
+        self._monitor_connection: AsyncMongoConnection | None = None
+        self._monitor_task: asyncio.Task | None = None
+        self._check_requested = asyncio.Event()
+        self._pool_opened = False
+
+    def start(self):
+        """
+        Starts monitoring the server in the background.
+        """
+        self._monitor_task = asyncio.create_task(self._monitor())
+
+    def request_check(self):
+        """
+        Asks the monitor to check the server now instead of at the next heartbeat.
+        """
+        self._check_requested.set()
+
+    async def open_pool(self):
+        """
+        Pre-warms the server's pool. Only the first call has any effect.
+        """
+        if not self._pool_opened:
+            self._pool_opened = True
+            await self.pool.open()
+
+    async def close(self):
+        """
+        Stops the monitor and closes every connection to the server.
+        """
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+        if self._monitor_connection is not None:
+            await self._monitor_connection.close()
+        await self.pool.close()
+
+    async def check(self) -> ServerDescription:
+        """
+        Sends a `hello` to the server on the monitor's own connection.
+
+        Returns:
+            ServerDescription: The new description, with the round trip time folded
+            into the moving average. Unknown, with the error, if the server could
+            not be reached or the `hello` failed.
+        """
+        timeout = self._topology.options.connect_timeout_ms / 1000
+        try:
+            start = time.perf_counter()
+            if self._monitor_connection is None or self._monitor_connection.closed:
+                # The handshake of a new connection is a hello of its own
+                self._monitor_connection = await asyncio.wait_for(
+                    AsyncMongoConnection.create(*self.address, self._monitor_options),
+                    timeout,
+                )
+                hello = self._monitor_connection.hello
+            else:
+                hello = await asyncio.wait_for(
+                    self._monitor_connection.command("admin", {"hello": 1}), timeout
+                )
+            round_trip_time = time.perf_counter() - start
+            hello = hello or {}
+            if not hello.get("ok"):
+                raise OperationFailure(
+                    hello.get("errmsg", "hello failed"), hello.get("code"), hello
+                )
+        except Exception as e:
+            if not isinstance(e, _NETWORK_ERRORS):
+                logger.warning(
+                    "Checking %s:%s failed: %r", *self.address, e, exc_info=True
+                )
+            if self._monitor_connection is not None:
+                await self._monitor_connection.close()
+                self._monitor_connection = None
+            return ServerDescription(self.address, error=e)
+
+        previous = self.description.round_trip_time
+        if previous is not None:
+            round_trip_time = _RTT_ALPHA * round_trip_time + (1 - _RTT_ALPHA) * previous
+        return ServerDescription(
+            self.address, server_type(hello), round_trip_time, hello
+        )
+
+    async def _monitor(self):
+        """
+        Checks the server every `heartbeat_frequency_ms`, or sooner when requested.
+        """
+        interval = self._topology.options.heartbeat_frequency_ms / 1000
+        while True:
+            self._check_requested.clear()
+            try:
+                description = await self.check()
+                self._topology._on_description(self, description)
+            except Exception as e:
+                # Keep heartbeating, the server may recover
+                logger.exception("Monitoring %s:%s failed", *self.address)
+                self._topology._on_description(
+                    self, ServerDescription(self.address, error=e)
+                )
+            self.checked.set()
+
+            await asyncio.sleep(_MIN_HEARTBEAT_INTERVAL)
+            try:
+                await asyncio.wait_for(
+                    self._check_requested.wait(),
+                    max(interval - _MIN_HEARTBEAT_INTERVAL, 0),
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+class Topology:
+    """
+    Tracks the servers of a deployment and selects one for each operation.
+
+    Starting from the seed list, every server is monitored in the background.
+    Replica set members reported by any member are added, and servers that turn
+    out not to belong to the set are removed. Operations go to the lowest-latency
+    suitable server, or to a random one among those whose round trip time is within
+    `local_threshold_ms` of the fastest.
+    """
+
+    def __init__(self, seeds: list[tuple[str, int]], options: ClientOptions):
+        """
+        Initializes a Topology. Use `Topology.create` instead.
+
+        Args:
+            seeds (list[tuple[str, int]]): The (host, port) of the initial servers.
+            options (ClientOptions): Client options, including the selection settings.
+        """
+        self.options = options
+        self.replica_set = options.replica_set
+        self.servers: dict[tuple[str, int], Server] = {}
+
+        direct = options.direct_connection
+        if direct is None:
+            direct = len(seeds) == 1 and options.replica_set is None
+        # A direct connection sends everything to its only server, whatever its type
+        self.single = direct
+        self._seeds = seeds
+        self._changed = asyncio.Event()
+        self._opened = False
+        self._closed = False
+
+    @classmethod
+    async def create(
+        cls, seeds: list[tuple[str, int]], options: ClientOptions | None = None
+    ) -> "Topology":
+        """
+        Creates a topology, waits for the first heartbeat of every server it
+        discovers and pre-warms their pools.
+
+        Args:
+            seeds (list[tuple[str, int]]): The (host, port) of the initial servers.
+            options (ClientOptions | None): Client options. Defaults to ClientOptions().
+
+        Returns:
+            Topology: The topology, ready for server selection.
+        """
+        self = cls(seeds, options or ClientOptions())
+        for address in seeds:
+            self._add_server(address)
+
+        # Wait for the servers discovered along the way as well
+        deadline = time.monotonic() + self.options.connect_timeout_ms / 1000
+        while True:
+            pending = [
+                s.checked.wait()
+                for s in self.servers.values()
+                if not s.checked.is_set()
+            ]
+            if not pending:
+                break
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*pending), max(deadline - time.monotonic(), 0)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        self._opened = True
+        await asyncio.gather(
+            *(
+                s.open_pool()
+                for s in list(self.servers.values())
+                if s.description.is_known
+            )
+        )
+        return self
+
+    def get_server(self, address: tuple[str, int]) -> Server:
+        """
+        Returns a server by address, e.g. to run a getMore where its cursor lives.
+
+        Args:
+            address (tuple[str, int]): The host and port of the server.
+
+        Returns:
+            Server: The server.
+
+        Raises:
+            ConnectionClosedError: If the server is no longer part of the topology.
+        """
+        server = self.servers.get(address)
+        if server is None:
+            raise ConnectionClosedError(f"Server {address[0]}:{address[1]} was removed")
+        return server
+
+    def read_preference(self, read_preference: ReadPreference) -> ReadPreference:
+        """
+        Adapts a read preference to the topology. A direct connection to a replica
+        set member reads with primaryPreferred instead of primary, as a secondary
+        rejects reads that do not allow secondaries.
+
+        Args:
+            read_preference (ReadPreference): The read preference of the read.
+
+        Returns:
+            ReadPreference: The read preference to send with the read.
+        """
+        if not self.single or read_preference.mode != "primary":
+            return read_preference
+        if any(
+            s.description.server_type in REPLICA_SET_SERVER_TYPES
+            for s in self.servers.values()
+        ):
+            return PRIMARY_PREFERRED
+        return read_preference
+
+    async def select_server(
+        self, read_preference: ReadPreference | None = None
+    ) -> Server:
+        """
+        Selects a server for an operation, waiting for one to become available
+        for up to `server_selection_timeout_ms`.
+
+        Args:
+            read_preference (ReadPreference | None): The members a read may use.
+                Defaults to None, which selects a server that accepts writes.
+
+        Returns:
+            Server: A suitable server within the latency window of the fastest one.
+
+        Raises:
+            ServerSelectionTimeoutError: If no suitable server was found in time.
+        """
+        timeout = self.options.server_selection_timeout_ms / 1000
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise ConnectionClosedError("Client closed")
+            server = self._select(read_preference)
+            if server is not None:
+                return server
+
+            for server in self.servers.values():
+                server.request_check()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                errors = ", ".join(
+                    f"{s.address[0]}:{s.address[1]}: "
+                    f"{s.description.error or s.description.server_type}"
+                    for s in self.servers.values()
+                )
+                raise ServerSelectionTimeoutError(
+                    f"No suitable server found after {timeout:g}s ({errors})"
+                )
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def _select(self, read_preference: ReadPreference | None = None) -> Server | None:
+        """
+        Applies a read preference and the latency window to the known servers.
+
+        Args:
+            read_preference (ReadPreference | None): The members a read may use, or
+                                                     None to select a writable server.
+
+        Returns:
+            Server | None: A random server among the suitable ones within the
+            latency window, or None if no server is suitable.
+        """
+        known = [s.description for s in self.servers.values() if s.description.is_known]
+        if self.single:
+            candidates = known
+        elif read_preference is None:
+            candidates = writable_server_selector(known)
+        else:
+            heartbeat_frequency = self.options.heartbeat_frequency_ms / 1000
+            candidates = read_preference.select(known, heartbeat_frequency)
+        if not candidates:
+            return None
+
+        fastest = min(d.round_trip_time or 0.0 for d in candidates)
+        window = fastest + self.options.local_threshold_ms / 1000
+        eligible = [d for d in candidates if (d.round_trip_time or 0.0) <= window]
+        return self.servers[random.choice(eligible).address]
+
+    def mark_unknown(self, server: Server, error: Exception):
+        """
+        Marks a server as unreachable after an operation failed with a network
+        error, so it is not selected again until a heartbeat succeeds.
+
+        Args:
+            server (Server): The server the operation ran on.
+            error (Exception): The error the operation failed with.
+        """
+        if self.servers.get(server.address) is server:
+            self._on_description(server, ServerDescription(server.address, error=error))
+            server.request_check()
+
+    async def close(self):
+        """
+        Stops every monitor and closes every connection.
+        """
+        self._closed = True
+        servers, self.servers = list(self.servers.values()), {}
+        await asyncio.gather(*(server.close() for server in servers))
+        self._notify()
+
+    def _add_server(self, address: tuple[str, int]):
+        if address in self.servers or self._closed:
+            return
+        server = Server(address, self)
+        self.servers[address] = server
+        server.start()
+
+    def _remove_server(self, address: tuple[str, int]):
+        server = self.servers.pop(address, None)
+        if server is not None:
+            logger.debug("Removed %s:%s from the topology", *address)
+            asyncio.ensure_future(server.close())
+
+    def _on_description(self, server: Server, description: ServerDescription):
+        """
+        Updates the topology with the outcome of a server check.
+
+        Args:
+            server (Server): The server that was checked.
+            description (ServerDescription): Its new description.
+        """
+        if self.servers.get(server.address) is not server:
+            return  # removed while it was being checked
+        if description.server_type != server.description.server_type:
+            logger.debug("%s:%s is now %s", *server.address, description.server_type)
+        server.description = description
+
+        if not self.single:
+            self._update_members(server, description)
+        if (
+            self._opened
+            and description.is_known
+            and not server._pool_opened
+            and server.address in self.servers
+        ):
+            asyncio.ensure_future(self._open_pool(server))
+        self._notify()
+
+    def _update_members(self, server: Server, description: ServerDescription):
+        """
+        Applies what a server said about the replica set to the set of servers.
+        """
+        kind = description.server_type
+        if kind == "Standalone" and len(self.servers) > 1:
+            # A standalone cannot be part of a multi-server deployment
+            self._remove_server(server.address)
+        elif kind in REPLICA_SET_SERVER_TYPES and kind != "RSGhost":
+            if self.replica_set is None:
+                self.replica_set = description.set_name
+            if description.set_name != self.replica_set:
+                self._remove_server(server.address)
+                return
+
+            for address in description.members:
+                self._add_server(address)
+
+            if kind == "RSPrimary":
+                # The primary's view of the set is authoritative
+                for address in list(self.servers):
+                    if address not in description.members and address != server.address:
+                        self._remove_server(address)
+                for other in self.servers.values():
+                    if (
+                        other is not server
+                        and other.description.server_type == "RSPrimary"
+                    ):
+                        # A stale primary from before an election
+                        other.description = ServerDescription(other.address)
+                        other.request_check()
+
+    async def _open_pool(self, server: Server):
+        try:
+            await server.open_pool()
+        except Exception:
+            logger.exception("Could not pre-warm the pool of %s:%s", *server.address)
+
+    def _notify(self):
+        """
+        Wakes up operations waiting for server selection.
+        """
+        self._changed.set()
+        self._changed = asyncio.Event()
@@ -0,0 +1,518 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import itertools
+import os
+import random
+import struct
+import threading
+import zlib
+from collections import deque
+
+import bson
+
+_MSG_HEADER = struct.Struct("<iiii")
+_int32 = struct.Struct("<i")
+
+# Flag bit of an OP_MSG whose sender does not expect a reply
+_MORE_TO_COME = 1 << 1
+# Flag bit of a request whose sender accepts a stream of replies
+_EXHAUST_ALLOWED = 1 << 16
+
+
+def _matches(document: dict, filter: dict | None) -> bool:
+    """
+    Evaluates the subset of query operators the benchmarks and tests use: equality,
+    $gt, $gte, $lt, $lte and $in on top-level fields, and $and.
+
+    Args:
+        document (dict): The stored document.
+        filter (dict | None): The query filter.
+
+    Returns:
+        bool: True if the document matches the filter.
+    """
+    for field, condition in (filter or {}).items():
+        if field == "$and":
+            if not all(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        value = document.get(field)
+        if isinstance(condition, dict) and all(k.startswith("$") for k in condition):
+            for operator, operand in condition.items():
+                if operator == "$in":
+                    if value not in operand:
+                        return False
+                elif value is None:
+                    return False
+                elif operator == "$gt" and not value > operand:
+                    return False
+                elif operator == "$gte" and not value >= operand:
+                    return False
+                elif operator == "$lt" and not value < operand:
+                    return False
+                elif operator == "$lte" and not value <= operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _parse_op_msg(body: bytes) -> tuple[int, dict]:
+    """
+    Parses the body of an OP_MSG, merging kind-1 document sequences into the command.
+
+    Args:
+        body (bytes): The message without its header.
+
+    Returns:
+        tuple[int, dict]: The flagBits and the command document.
+    """
+    flags = struct.unpack_from("<I", body)[0]
+    position = 4
+    command, sequences = None, {}
+    while position < len(body):
+        kind = body[position]
+        size = _int32.unpack_from(body, position + 1)[0]
+        if kind == 0:
+            command = bson.loads(body[position + 1 : position + 1 + size])
+        else:
+            end = position + 1 + size
+            name_end = body.index(b"\x00", position + 5)
+            documents = []
+            offset = name_end + 1
+            while offset < end:
+                length = _int32.unpack_from(body, offset)[0]
+                documents.append(bson.loads(body[offset : offset + length]))
+                offset += length
+            sequences[body[position + 5 : name_end].decode("utf-8")] = documents
+        position += 1 + size
+    command.update(sequences)
+    return flags, command
+
+
+class FakeServer:
+    """
+    An in-memory stand-in for mongod that speaks just enough of the OP_MSG protocol
+    to drive the client: hello with compression negotiation, SCRAM-SHA-256, CRUD
+    commands and cursors.
+
+    Replies can be delayed by a fixed `latency` to model a network round trip.
+    Requests are served concurrently, so pipelined commands overlap like they would
+    against a real server.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        compressors: list[str] | None = None,
+        users: dict[str, str] | None = None,
+        retain_writes: bool = True,
+    ):
+        """
+        Initializes a FakeServer. Call `start` to begin listening.
+
+        Args:
+            latency (float): Seconds to wait before sending each reply. Defaults to 0.
+            compressors (list[str] | None): Compressors to accept during the handshake.
+                                            Only "zlib" is supported. Defaults to None.
+            users (dict[str, str] | None): Passwords by username for SCRAM-SHA-256.
+                                           Defaults to {"user": "pencil"}.
+            retain_writes (bool): Store inserted documents. Disable it to keep memory
+                                  flat while benchmarking writes. Defaults to True.
+        """
+        self.latency = latency
+        self.compressors = [c for c in compressors or [] if c == "zlib"]
+        self.users = users if users is not None else {"user": "pencil"}
+        self.retain_writes = retain_writes
+        self.iterations = 4096
+        self.salt = os.urandom(16)
+
+        self.collections: dict[str, list[dict]] = {}
+        self.cursors: dict[int, list[dict]] = {}
+        # The most recent commands received, for inspection
+        self.commands: deque[dict] = deque(maxlen=1000)
+        self.port: int | None = None
+        # Extra fields of the hello reply, e.g. to pose as a replica set member
+        self.hello: dict = {}
+
+        self._server: asyncio.AbstractServer | None = None
+        self._handlers: set[asyncio.Task] = set()
+        self._request_ids = itertools.count(1)
+        self._cursor_ids = itertools.count(1 << 40)
+        self._conversation_ids = itertools.count(1)
+        self._conversations: dict[int, tuple[str, bytes, bytes]] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> "FakeServer":
+        """
+        Starts listening on the running event loop.
+
+        Args:
+            host (str): The interface to bind. Defaults to "127.0.0.1".
+            port (int): The port to bind. Defaults to 0 (any free port).
+
+        Returns:
+            FakeServer: The server, with `port` set.
+        """
+        self._server = await asyncio.start_server(self._serve, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """
+        Stops listening and closes every client connection.
+        """
+        self._server.close()
+        for handler in self._handlers:
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def seed(self, namespace: str, documents: list[dict]):
+        """
+        Replaces the contents of a collection without going through the wire.
+
+        Args:
+            namespace (str): The "<database>.<collection>" to fill.
+            documents (list[dict]): The documents to store.
+        """
+        self.collections[namespace] = list(documents)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Reads messages from one client connection until it is closed.
+        """
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                header = await reader.readexactly(_MSG_HEADER.size)
+                length, request_id, _, op_code = _MSG_HEADER.unpack(header)
+                body = await reader.readexactly(length - _MSG_HEADER.size)
+
+                compressed = op_code == 2012
+                if compressed:
+                    op_code = _int32.unpack_from(body)[0]
+                    body = zlib.decompress(body[9:])
+
+                flags, command = _parse_op_msg(body)
+                self.commands.append(command)
+                asyncio.ensure_future(
+                    self._reply(writer, request_id, flags, command, compressed)
+                )
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # The client went away, or the server is stopping
+            pass
+        finally:
+            self._handlers.discard(handler)
+            writer.close()
+
+    async def _reply(
+        self,
+        writer: asyncio.StreamWriter,
+        request_id: int,
+        flags: int,
+        command: dict,
+        compressed: bool,
+    ):
+        """
+        Runs a command and sends its reply, compressed like the request was.
+
+        A `getMore` allowing an exhaust reply is answered with every remaining batch,
+        each reply flagged moreToCome but the last and responding to the previous one.
+        """
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        reply = self._dispatch(command)
+        if flags & _MORE_TO_COME or writer.is_closing():
+            return
+
+        exhaust = flags & _EXHAUST_ALLOWED and "getMore" in command
+        while exhaust and reply.get("cursor", {}).get("id"):
+            request_id = self._write_reply(
+                writer, request_id, reply, compressed, _MORE_TO_COME
+            )
+            try:
+                await writer.drain()
+            except ConnectionError:
+                return
+            if writer.is_closing():
+                return
+            reply = self._dispatch(command)
+        self._write_reply(writer, request_id, reply, compressed)
+
+    def _write_reply(
+        self,
+        writer: asyncio.StreamWriter,
+        response_to: int,
+        reply: dict,
+        compressed: bool,
+        flags: int = 0,
+    ) -> int:
+        """
+        Writes a reply message.
+
+        Returns:
+            int: The requestID of the reply.
+        """
+        request_id = next(self._request_ids)
+        body = struct.pack("<IB", flags, 0) + bson.dumps(reply)
+        if compressed and self.compressors:
+            data = zlib.compress(body)
+            header = _MSG_HEADER.pack(
+                _MSG_HEADER.size + 9 + len(data), request_id, response_to, 2012
+            )
+            writer.write(header + struct.pack("<iiB", 2013, len(body), 2) + data)
+        else:
+            header = _MSG_HEADER.pack(
+                _MSG_HEADER.size + len(body), request_id, response_to, 2013
+            )
+            writer.write(header + body)
+        return request_id
+
+    def _dispatch(self, command: dict) -> dict:
+        """
+        Runs a command against the in-memory collections.
+
+        Args:
+            command (dict): The command document, including `$db`.
+
+        Returns:
+            dict: The reply document.
+        """
+        name = next(iter(command))
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            return {"ok": 0.0, "errmsg": f"no such command: '{name}'", "code": 59}
+        return handler(command)
+
+    def _collection(self, command: dict, name: str) -> list[dict]:
+        return self.collections.setdefault(f"{command['$db']}.{name}", [])
+
+    def _cursor_reply(
+        self, namespace: str, documents: list[dict], batch_size: int, key: str
+    ) -> dict:
+        """
+        Returns the first `batch_size` documents, keeping the rest for getMore.
+        """
+        batch, rest = documents[: batch_size or 101], documents[batch_size or 101 :]
+        cursor_id = 0
+        if rest:
+            cursor_id = next(self._cursor_ids)
+            self.cursors[cursor_id] = rest
+        return {"cursor": {key: batch, "id": cursor_id, "ns": namespace}, "ok": 1.0}
+
+    def _cmd_hello(self, command: dict) -> dict:
+        reply = {
+            "isWritablePrimary": True,
+            "maxBsonObjectSize": 16 * 1024 * 1024,
+            "maxMessageSizeBytes": 48000000,
+            "maxWriteBatchSize": 100000,
+            "minWireVersion": 0,
+            "maxWireVersion": 21,
+            "ok": 1.0,
+            **self.hello,
+        }
+        requested = command.get("compression") or []
+        if self.compressors and requested:
+            reply["compression"] = [c for c in requested if c in self.compressors]
+        return reply
+
+    _cmd_ismaster = _cmd_hello
+
+    def _cmd_ping(self, command: dict) -> dict:
+        return {"ok": 1.0}
+
+    def _cmd_insert(self, command: dict) -> dict:
+        if self.retain_writes:
+            self._collection(command, command["insert"]).extend(command["documents"])
+        return {"n": len(command["documents"]), "ok": 1.0}
+
+    def _cmd_update(self, command: dict) -> dict:
+        documents = self._collection(command, command["update"])
+        n = 0
+        for update in command["updates"]:
+            for document in documents:
+                if _matches(document, update["q"]):
+                    document.update(update["u"].get("$set", update["u"]))
+                    n += 1
+                    if not update.get("multi"):
+                        break
+        return {"n": n, "nModified": n, "ok": 1.0}
+
+    def _cmd_delete(self, command: dict) -> dict:
+        documents = self._collection(command, command["delete"])
+        n = 0
+        for delete in command["deletes"]:
+            kept, removed = [], 0
+            for document in documents:
+                if _matches(document, delete["q"]) and not (
+                    delete.get("limit") and removed
+                ):
+                    removed += 1
+                else:
+                    kept.append(document)
+            documents[:] = kept
+            n += removed
+        return {"n": n, "ok": 1.0}
+
+    def _cmd_drop(self, command: dict) -> dict:
+        self.collections.pop(f"{command['$db']}.{command['drop']}", None)
+        return {"ok": 1.0}
+
+    def _cmd_find(self, command: dict) -> dict:
+        documents = [
+            document
+            for document in self._collection(command, command["find"])
+            if _matches(document, command.get("filter"))
+        ][command.get("skip", 0) :]
+        if command.get("limit"):
+            documents = documents[: abs(command["limit"])]
+        batch_size = command.get("batchSize", 101)
+        if command.get("singleBatch"):
+            documents = documents[: batch_size or None]
+        namespace = f"{command['$db']}.{command['find']}"
+        return self._cursor_reply(namespace, documents, batch_size, "firstBatch")
+
+    def _cmd_aggregate(self, command: dict) -> dict:
+        documents = list(self._collection(command, command["aggregate"]))
+        for stage in command.get("pipeline", []):
+            if "$match" in stage:
+                documents = [d for d in documents if _matches(d, stage["$match"])]
+            elif "$limit" in stage:
+                documents = documents[: stage["$limit"]]
+            elif "$sample" in stage:
+                size = min(stage["$sample"]["size"], len(documents))
+                documents = random.sample(documents, size)
+            elif "$project" in stage:
+                # Inclusion projections only
+                fields = [f for f, include in stage["$project"].items() if include]
+                documents = [{f: d[f] for f in fields if f in d} for d in documents]
+            elif "$sort" in stage:
+                for field, direction in reversed(stage["$sort"].items()):
+                    documents = sorted(
+                        documents, key=lambda d: d.get(field), reverse=direction < 0
+                    )
+            elif "$out" in stage:
+                # Replaces the target collection, given by name only
+                self.collections[f"{command['$db']}.{stage['$out']}"] = documents
+                documents = []
+        namespace = f"{command['$db']}.{command['aggregate']}"
+        batch_size = command.get("cursor", {}).get("batchSize", 101)
+        return self._cursor_reply(namespace, documents, batch_size, "firstBatch")
+
+    def _cmd_getmore(self, command: dict) -> dict:
+        documents = self.cursors.pop(command["getMore"], None)
+        if documents is None:
+            return {"ok": 0.0, "errmsg": "cursor not found", "code": 43}
+        namespace = f"{command['$db']}.{command['collection']}"
+        reply = self._cursor_reply(
+            namespace, documents, command.get("batchSize", 101), "nextBatch"
+        )
+        if reply["cursor"]["id"]:
+            # Keep the id stable across getMores, like the server does
+            self.cursors[command["getMore"]] = self.cursors.pop(reply["cursor"]["id"])
+            reply["cursor"]["id"] = command["getMore"]
+        return reply
+
+    def _cmd_killcursors(self, command: dict) -> dict:
+        for cursor_id in command["cursors"]:
+            self.cursors.pop(cursor_id, None)
+        return {"cursorsKilled": command["cursors"], "ok": 1.0}
+
+    def _cmd_listcollections(self, command: dict) -> dict:
+        prefix = f"{command['$db']}."
+        batch = [
+            {"name": namespace[len(prefix) :], "type": "collection"}
+            for namespace in self.collections
+            if namespace.startswith(prefix)
+        ]
+        return {
+            "cursor": {"firstBatch": batch, "id": 0, "ns": f"{prefix}$cmd"},
+            "ok": 1.0,
+        }
+
+    def _cmd_saslstart(self, command: dict) -> dict:
+        client_first = bytes(command["payload"])[3:]  # strip the "n,," GS2 header
+        fields = dict(item.split(b"=", 1) for item in client_first.split(b","))
+        nonce = fields[b"r"] + base64.b64encode(os.urandom(18))
+        server_first = b"r=%s,s=%s,i=%d" % (
+            nonce,
+            base64.b64encode(self.salt),
+            self.iterations,
+        )
+        conversation_id = next(self._conversation_ids)
+        self._conversations[conversation_id] = (
+            fields[b"n"].decode("utf-8"),
+            client_first,
+            server_first,
+        )
+        return {
+            "conversationId": conversation_id,
+            "done": False,
+            "payload": server_first,
+            "ok": 1.0,
+        }
+
+    def _cmd_saslcontinue(self, command: dict) -> dict:
+        conversation_id = command["conversationId"]
+        payload = bytes(command["payload"])
+        if not payload:
+            return {
+                "conversationId": conversation_id,
+                "done": True,
+                "payload": b"",
+                "ok": 1.0,
+            }
+
+        username, client_first, server_first = self._conversations.pop(conversation_id)
+        without_proof, proof = payload.rsplit(b",p=", 1)
+        password = self.users.get(username, "").encode("utf-8")
+        salted = hashlib.pbkdf2_hmac("sha256", password, self.salt, self.iterations)
+        client_key = hmac.digest(salted, b"Client Key", "sha256")
+        server_key = hmac.digest(salted, b"Server Key", "sha256")
+        auth_message = b",".join((client_first, server_first, without_proof))
+        signature = hmac.digest(
+            hashlib.sha256(client_key).digest(), auth_message, "sha256"
+        )
+        expected = bytes(a ^ b for a, b in zip(client_key, signature))
+        if username not in self.users or base64.b64encode(expected) != proof:
+            return {"ok": 0.0, "errmsg": "Authentication failed.", "code": 18}
+
+        verifier = base64.b64encode(hmac.digest(server_key, auth_message, "sha256"))
+        return {
+            "conversationId": conversation_id,
+            "done": True,
+            "payload": b"v=" + verifier,
+            "ok": 1.0,
+        }
+
+
+class FakeServerThread:
+    """
+    Runs a FakeServer on its own event loop in a background thread, so the work of
+    serving requests is kept off the event loop of the client being measured.
+    """
+
+    def __init__(self, server: FakeServer):
+        """
+        Initializes a FakeServerThread. Use it as a context manager.
+
+        Args:
+            server (FakeServer): The server to run.
+        """
+        self.server = server
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def __enter__(self) -> FakeServer:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self._loop).result()
+        return self.server
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,419 @@
+"""
+Runs the driver benchmarks against an in-process FakeServer and writes the results
+as JSON, so runs before and after a change can be compared:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from asyncmongo import AsyncMongoClient, AsyncMongoConnection
+from asyncmongo.client_options import ClientOptions
+
+from .fake_server import FakeServer, FakeServerThread
+
+DATABASE = "bench"
+COLLECTION = "docs"
+
+
+@dataclass
+class BenchmarkConfig:
+    latency_ms: float = 0.0
+    ops: int = 2000
+    auth_ops: int = 100
+    concurrency: int = 1
+    batch_size: int = 101
+    scan_size: int = 1000
+    shape: str = "small"
+    compressors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    ops: int
+    seconds: float
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_bytes: int
+    docs_per_sec: float | None = None
+
+
+def make_document(i: int, shape: str) -> dict:
+    """
+    Builds the i-th benchmark document.
+
+    Args:
+        i (int): The document number, used as its `_id`.
+        shape (str): "small" (4 fields), "medium" (about 25 fields, one nested
+                     document) or "large" (medium plus an array of 100 subdocuments).
+
+    Returns:
+        dict: The document.
+    """
+    document = {"_id": i, "name": f"user{i}", "age": i % 100, "active": i % 2 == 0}
+    if shape in ("medium", "large"):
+        document.update({f"field{n}": f"value {n} of document {i}" for n in range(10)})
+        document.update({f"count{n}": i * n for n in range(10)})
+        document["address"] = {
+            "street": f"{i} Main St",
+            "city": "Kochi",
+            "zip": "682001",
+        }
+    if shape == "large":
+        document["items"] = [
+            {"sku": f"SKU-{n}", "qty": n, "price": n * 1.25} for n in range(100)
+        ]
+    return document
+
+
+async def measure(
+    name: str,
+    op: Callable[[int], Awaitable[int | None]],
+    ops: int,
+    concurrency: int,
+) -> BenchmarkResult:
+    """
+    Times `ops` calls of `op` spread over `concurrency` concurrent workers, then
+    repeats a shorter run under tracemalloc to record peak memory.
+
+    Args:
+        name (str): The name of the benchmark.
+        op (Callable[[int], Awaitable[int | None]]): Runs one operation given its
+            number, optionally returning the number of documents it read.
+        ops (int): The number of operations to time.
+        concurrency (int): The number of operations kept in flight.
+
+    Returns:
+        BenchmarkResult: The throughput, latency percentiles and peak memory.
+    """
+    latencies: list[float] = []
+    documents = 0
+
+    async def worker(numbers):
+        nonlocal documents
+        for i in numbers:
+            start = time.perf_counter()
+            read = await op(i)
+            latencies.append(time.perf_counter() - start)
+            documents += read or 0
+
+    # Warm up connections, caches and the server's state
+    await asyncio.gather(
+        *(worker(range(i, max(ops // 10, 1), concurrency)) for i in range(concurrency))
+    )
+    latencies.clear()
+    documents = 0
+
+    numbers = itertools.count()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            worker(itertools.takewhile(lambda i: i < ops, numbers))
+            for _ in range(concurrency)
+        )
+    )
+    seconds = time.perf_counter() - start
+    docs_per_sec = documents / seconds if documents else None
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        await asyncio.gather(
+            *(
+                worker(range(i, max(ops // 10, 1), concurrency))
+                for i in range(concurrency)
+            )
+        )
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=name,
+        ops=ops,
+        seconds=seconds,
+        ops_per_sec=ops / seconds,
+        p50_ms=percentiles[49] * 1000,
+        p99_ms=percentiles[98] * 1000,
+        peak_memory_bytes=peak_memory,
+        docs_per_sec=docs_per_sec,
+    )
+
+
+def _collection(client: AsyncMongoClient):
+    return getattr(getattr(client, DATABASE), COLLECTION)
+
+
+async def bench_insert_one(client, server, config) -> BenchmarkResult:
+    collection = _collection(client)
+    server.retain_writes = False
+
+    async def op(i):
+        await collection.insert_one(make_document(i, config.shape))
+
+    try:
+        return await measure("insert_one", op, config.ops, config.concurrency)
+    finally:
+        server.retain_writes = True
+
+
+async def bench_find_one(client, server, config) -> BenchmarkResult:
+    collection = _collection(client)
+    size = config.scan_size
+    server.seed(
+        f"{DATABASE}.{COLLECTION}",
+        [make_document(i, config.shape) for i in range(size)],
+    )
+
+    async def op(i):
+        return int(await collection.find_one({"_id": i % size}) is not None)
+
+    return await measure("find_one", op, config.ops, config.concurrency)
+
+
+async def bench_find_one_prepared(client, server, config) -> BenchmarkResult:
+    collection = _collection(client)
+    size = config.scan_size
+    server.seed(
+        f"{DATABASE}.{COLLECTION}",
+        [make_document(i, config.shape) for i in range(size)],
+    )
+    by_id = collection.prepare_find_one()
+
+    async def op(i):
+        return int(await by_id(i % size) is not None)
+
+    return await measure("find_one_prepared", op, config.ops, config.concurrency)
+
+
+async def bench_find_scan(client, server, config) -> BenchmarkResult:
+    collection = _collection(client)
+    server.seed(
+        f"{DATABASE}.{COLLECTION}",
+        [make_document(i, config.shape) for i in range(config.scan_size)],
+    )
+
+    async def op(i):
+        count = 0
+        async for _ in collection.find({}, batch_size=config.batch_size):
+            count += 1
+        return count
+
+    # Each scan reads `scan_size` documents, so run fewer of them
+    ops = max(config.ops // 20, 10)
+    return await measure("find_scan", op, ops, config.concurrency)
+
+
+async def bench_find_scan_batches(client, server, config) -> BenchmarkResult:
+    collection = _collection(client)
+    server.seed(
+        f"{DATABASE}.{COLLECTION}",
+        [make_document(i, config.shape) for i in range(config.scan_size)],
+    )
+
+    async def op(i):
+        count = 0
+        async for batch in collection.find({}, batch_size=config.batch_size).batches():
+            count += len(batch)
+        return count
+
+    ops = max(config.ops // 20, 10)
+    return await measure("find_scan_batches", op, ops, config.concurrency)
+
+
+async def bench_find_scan_exhaust(client, server, config) -> BenchmarkResult:
+    collection = _collection(client)
+    server.seed(
+        f"{DATABASE}.{COLLECTION}",
+        [make_document(i, config.shape) for i in range(config.scan_size)],
+    )
+
+    async def op(i):
+        cursor = collection.find({}, batch_size=config.batch_size, exhaust=True)
+        count = 0
+        async for batch in cursor.batches():
+            count += len(batch)
+        return count
+
+    ops = max(config.ops // 20, 10)
+    return await measure("find_scan_exhaust", op, ops, config.concurrency)
+
+
+async def bench_auth_handshake(client, server, config) -> BenchmarkResult:
+    async def op(i):
+        # Fresh options, so every handshake derives the SCRAM keys again
+        options = ClientOptions(username="user", password="pencil", database="admin")
+        connection = await AsyncMongoConnection.create(
+            "127.0.0.1", server.port, options
+        )
+        await connection.close()
+
+    return await measure("auth_handshake", op, config.auth_ops, config.concurrency)
+
+
+async def bench_auth_handshake_cached(client, server, config) -> BenchmarkResult:
+    options = ClientOptions(username="user", password="pencil", database="admin")
+
+    async def op(i):
+        connection = await AsyncMongoConnection.create(
+            "127.0.0.1", server.port, options
+        )
+        await connection.close()
+
+    return await measure(
+        "auth_handshake_cached", op, config.auth_ops, config.concurrency
+    )
+
+
+BENCHMARKS = {
+    "insert_one": bench_insert_one,
+    "find_one": bench_find_one,
+    "find_one_prepared": bench_find_one_prepared,
+    "find_scan": bench_find_scan,
+    "find_scan_batches": bench_find_scan_batches,
+    "find_scan_exhaust": bench_find_scan_exhaust,
+    "auth_handshake": bench_auth_handshake,
+    "auth_handshake_cached": bench_auth_handshake_cached,
+}
+
+
+async def run(config: BenchmarkConfig, names: list[str]) -> list[BenchmarkResult]:
+    """
+    Runs the selected benchmarks against a FakeServer running in a background thread.
+
+    Args:
+        config (BenchmarkConfig): The benchmark settings.
+        names (list[str]): The benchmarks to run, in order.
+
+    Returns:
+        list[BenchmarkResult]: One result per benchmark.
+    """
+    server = FakeServer(
+        latency=config.latency_ms / 1000, compressors=config.compressors
+    )
+    results = []
+    with FakeServerThread(server):
+        options = {"max_pool_size": max(config.concurrency, 1)}
+        if config.compressors:
+            options["compressors"] = config.compressors
+        client = await AsyncMongoClient.create("127.0.0.1", server.port, **options)
+        try:
+            for name in names:
+                results.append(await BENCHMARKS[name](client, server, config))
+                print(format_result(results[-1]), file=sys.stderr)
+        finally:
+            await client.close()
+    return results
+
+
+def format_result(result: BenchmarkResult) -> str:
+    line = (
+        f"{result.name:<24}{result.ops_per_sec:>12.1f} ops/s"
+        f"{result.p50_ms:>10.3f} ms p50{result.p99_ms:>10.3f} ms p99"
+        f"{result.peak_memory_bytes / 1024:>10.1f} KiB peak"
+    )
+    if result.docs_per_sec is not None:
+        line += f"{result.docs_per_sec:>12.0f} docs/s"
+    return line
+
+
+def compare(results: list[BenchmarkResult], baseline: dict) -> str:
+    """
+    Formats the change of each result against a previous run.
+
+    Args:
+        results (list[BenchmarkResult]): The results of this run.
+        baseline (dict): The JSON written by a previous run.
+
+    Returns:
+        str: One line per benchmark present in both runs.
+    """
+    previous = baseline["results"]
+    lines = []
+    for result in results:
+        if result.name not in previous:
+            continue
+        before = previous[result.name]
+        throughput = result.ops_per_sec / before["ops_per_sec"] - 1
+        p99 = result.p99_ms / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        lines.append(f"{result.name:<24}{throughput:>+10.1%} ops/s{p99:>+10.1%} p99")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda v: v.split(","),
+        default=list(BENCHMARKS),
+        help=f"comma-separated benchmarks to run, from: {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--auth-ops", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=101)
+    parser.add_argument("--scan-size", type=int, default=1000)
+    parser.add_argument(
+        "--shape", choices=["small", "medium", "large"], default="small"
+    )
+    parser.add_argument("--compressors", type=lambda v: v.split(","), default=[])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="a previous JSON result to compare against")
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(
+        latency_ms=args.latency_ms,
+        ops=args.ops,
+        auth_ops=args.auth_ops,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        scan_size=args.scan_size,
+        shape=args.shape,
+        compressors=args.compressors,
+    )
+    unknown = set(args.only) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    results = asyncio.run(run(config, args.only))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": asdict(config),
+        },
+        "results": {result.name: asdict(result) for result in results},
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(results, json.load(f)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import pytest_asyncio
+
+from asyncmongo.client import AsyncMongoClient
+from benchmarks.fake_server import FakeServer
+
+
+@pytest_asyncio.fixture
+async def fake_server():
+    """
+    An in-memory server speaking the wire protocol, for tests that run without mongod.
+    """
+    server = await FakeServer().start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def fake_client(fake_server):
+    """
+    A client connected to `fake_server`.
+    """
+    client = await AsyncMongoClient.create("127.0.0.1", fake_server.port)
+    yield client
+    await client.close()
@@ -0,0 +1,93 @@
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from asyncmongo.collection import Collection
+from asyncmongo.exceptions import InvalidOperation
+from asyncmongo.read_preferences import PRIMARY, SECONDARY
+
+database = SimpleNamespace(name="exampleDB", read_preference=SECONDARY)
+
+
+def test_aggregate_command():
+    collection = Collection(database, "orders")
+    cursor = collection.aggregate(
+        [{"$match": {"status": "A"}}],
+        allow_disk_use=True,
+        batch_size=50,
+        max_time_ms=1000,
+    )
+
+    assert cursor._create_command() == {
+        "aggregate": "orders",
+        "pipeline": [{"$match": {"status": "A"}}],
+        "cursor": {"batchSize": 50},
+        "allowDiskUse": True,
+        "maxTimeMS": 1000,
+        "$readPreference": {"mode": "secondary"},
+    }
+    cursor._id = 3
+    assert cursor._create_command() == {
+        "getMore": 3,
+        "collection": "orders",
+        "batchSize": 50,
+    }
+
+
+def test_aggregations_reject_find_options():
+    collection = Collection(database, "orders")
+    cursor = collection.aggregate([{"$match": {"status": "A"}}])
+
+    for method, value in [
+        (cursor.skip, 1),
+        (cursor.limit, 5),
+        (cursor.projection, ["status"]),
+        (cursor.sort, "status"),
+    ]:
+        with pytest.raises(InvalidOperation, match=method.__name__):
+            method(value)
+
+    cursor.hint("status_1").comment("report")
+    command = cursor._create_command()
+    assert command["hint"] == "status_1"
+    assert command["comment"] == "report"
+
+
+@pytest.mark.filterwarnings("ignore:aggregation writing to:RuntimeWarning")
+def test_aggregate_writing_stages_run_on_primary():
+    collection = Collection(database, "orders", read_preference=PRIMARY)
+    out = collection.aggregate([{"$out": "totals"}])
+    merge = collection.aggregate(
+        [{"$merge": {"into": {"db": "reports", "coll": "totals"}}}]
+    )
+
+    assert out._read_preference is None
+    assert out._output == "exampleDB.totals"
+    assert merge._output == "reports.totals"
+    assert "$readPreference" not in merge._create_command()
+    assert collection.aggregate([])._output is None
+
+
+@pytest.mark.asyncio
+async def test_awaiting_an_aggregation_runs_its_writes(fake_client, fake_server):
+    fake_server.seed("exampleDB.orders", [{"x": i} for i in range(5)])
+    collection = fake_client.exampleDB.orders
+
+    cursor = await collection.aggregate([{"$match": {"x": 3}}, {"$out": "totals"}])
+
+    assert fake_server.collections["exampleDB.totals"] == [{"x": 3}]
+    assert await cursor.to_list() == []
+    # Awaiting again does not rerun the pipeline
+    fake_server.collections.pop("exampleDB.totals")
+    await cursor
+    assert "exampleDB.totals" not in fake_server.collections
+
+
+def test_unrun_write_aggregations_warn():
+    collection = Collection(database, "orders")
+    cursor = collection.aggregate([{"$out": "totals"}])
+
+    with pytest.warns(RuntimeWarning, match="exampleDB.totals"):
+        del cursor
+        gc.collect()
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from asyncmongo import auth
+from asyncmongo.auth import ScramCache, _derive_keys
+from asyncmongo.exceptions import AuthenticationFailedError
+
+
+@pytest.mark.asyncio
+async def test_scram_cache_derives_keys_once(monkeypatch):
+    calls = []
+
+    def derive(password, salt, iterations):
+        calls.append((password, salt, iterations))
+        return _derive_keys(password, salt, iterations)
+
+    monkeypatch.setattr(auth, "_derive_keys", derive)
+    cache = ScramCache()
+
+    keys = await asyncio.gather(
+        *(cache.get_keys(b"pencil", b"salt", 4096) for _ in range(5))
+    )
+    assert keys == [_derive_keys(b"pencil", b"salt", 4096)] * 5
+    assert await cache.get_keys(b"pencil", b"salt", 4096) == keys[0]
+    assert len(calls) == 1
+
+    await cache.get_keys(b"pencil", b"other salt", 4096)
+    assert len(calls) == 2
+
+
+class _RejectingConnection:
+    """
+    Answers saslStart like a server, then fails saslContinue as for a bad password.
+    """
+
+    def __init__(self):
+        self.commands = []
+
+    async def command(self, command, database_name):
+        self.commands.append(command)
+        if "saslStart" in command:
+            client_nonce = command["payload"].split(b"r=")[1]
+            return {
+                "conversationId": 1,
+                "done": False,
+                "payload": b"r=" + client_nonce + b"xyz,s=c2FsdA==,i=4096",
+                "ok": 1.0,
+            }
+        return {"ok": 0.0, "errmsg": "Authentication failed.", "code": 18}
+
+
+@pytest.mark.asyncio
+async def test_rejected_credentials_raise_the_server_error():
+    credentials = auth.MongoCredential(
+        "SCRAM-SHA-256", "admin", "user", "wrong", "", ScramCache()
+    )
+    with pytest.raises(AuthenticationFailedError, match="Authentication failed.*18"):
+        await auth.try_authenticate(_RejectingConnection(), credentials)
@@ -0,0 +1,27 @@
+import pytest
+
+import asyncmongo.client
+from asyncmongo.operations import DeleteOne, InsertOne, UpdateMany, UpdateOne
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_bulk_write(ordered):
+    client = await asyncmongo.client.AsyncMongoClient.create()
+    collection = client.exampleDB.bulk_write
+    await collection.drop_collection()
+
+    resp = await collection.bulk_write(
+        [
+            InsertOne({"x": 1}),
+            InsertOne({"x": 2}),
+            UpdateOne({"x": 1}, {"$set": {"y": 1}}),
+            UpdateMany({}, {"$set": {"z": 1}}),
+            DeleteOne({"x": 2}),
+        ],
+        ordered=ordered,
+    )
+    assert resp["ok"] == 1.0
+    assert resp["nInserted"] == 2
+    assert resp["nRemoved"] == 1
+    assert resp["writeErrors"] == []
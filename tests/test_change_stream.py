@@ -0,0 +1,92 @@
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+
+from asyncmongo.change_stream import ChangeStream, _is_resumable
+from asyncmongo.exceptions import ConnectionClosedError, OperationFailure
+from asyncmongo.read_preferences import PRIMARY
+
+collection = SimpleNamespace(_name="events", read_preference=PRIMARY)
+
+
+def test_resumable_errors():
+    assert _is_resumable(ConnectionClosedError("Connection closed"))
+    assert _is_resumable(OperationFailure("cursor not found", 43))
+    assert _is_resumable(
+        OperationFailure("x", 280, {"errorLabels": ["ResumableChangeStreamError"]})
+    )
+    assert not _is_resumable(OperationFailure("bad value", 2))
+    assert not _is_resumable(ValueError())
+
+
+def test_change_stream_resumes_after_last_token():
+    stream = ChangeStream(
+        collection,
+        [{"$match": {"operationType": "insert"}}],
+        full_document="updateLookup",
+        start_after={"_data": "1"},
+        max_await_time_ms=500,
+    )
+    cmd = stream._create_cursor()._create_command()
+    assert cmd == {
+        "aggregate": "events",
+        "pipeline": [
+            {
+                "$changeStream": {
+                    "fullDocument": "updateLookup",
+                    "startAfter": {"_data": "1"},
+                }
+            },
+            {"$match": {"operationType": "insert"}},
+        ],
+        "cursor": {},
+    }
+
+    # Once a change was returned, resume after it rather than the start point
+    stream._resume_token = {"_data": "2"}
+    stream._returned_change = True
+    cursor = stream._create_cursor()
+    assert cursor._create_command()["pipeline"][0] == {
+        "$changeStream": {"fullDocument": "updateLookup", "resumeAfter": {"_data": "2"}}
+    }
+    cursor._id = 7
+    assert cursor._create_command() == {
+        "getMore": 7,
+        "collection": "events",
+        "maxTimeMS": 500,
+    }
+
+
+class _StubCursor:
+    def __init__(self, token=None, error=None):
+        self._data = deque()
+        self._post_batch_resume_token = token
+        self._error = error
+        self.closed = False
+
+    async def _refresh(self):
+        if self._error is not None:
+            raise self._error
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_resume_kills_the_cursor_and_keeps_the_initial_token():
+    stream = ChangeStream(collection)
+    # The `aggregate` returned no change yet, only a post-batch resume token
+    failed = _StubCursor({"_data": "1"}, OperationFailure("cursor not found", 43))
+    stream._cursor = failed
+    created = []
+
+    def create_cursor():
+        created.append(stream._resume_token)
+        return _StubCursor()
+
+    stream._create_cursor = create_cursor
+    await stream._refresh()
+
+    assert failed.closed
+    assert created == [{"_data": "1"}]
@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+import bson
+import pytest
+
+from asyncmongo.raw_bson import RawBSONDocument
+
+np = pytest.importorskip("numpy")
+
+from asyncmongo.columns import ColumnBuilder  # noqa: E402
+
+
+def raw_batch(documents: list[dict]) -> list[RawBSONDocument]:
+    return RawBSONDocument(bson.dumps({"batch": documents}))["batch"]
+
+
+def with_object_id(document: dict, oid: bytes) -> bytes:
+    # py-bson cannot encode ObjectIds, so append one by hand
+    encoded = bson.dumps(document)[:-1] + b"\x07_id\x00" + oid + b"\x00"
+    return len(encoded).to_bytes(4, "little") + encoded[4:]
+
+
+def test_columns_from_raw_documents():
+    builder = ColumnBuilder(["n", "x", "when", "name", "missing"])
+    builder.add(
+        raw_batch(
+            [
+                {"n": 1, "x": 0.5, "when": datetime(2024, 1, 1, tzinfo=timezone.utc)},
+                {"n": 2**40, "x": 2, "name": "b"},
+                {"n": 3, "x": None, "name": "c"},
+            ]
+        )
+    )
+    builder.add([{"n": 4, "x": 1.5, "name": "d"}])  # Already decoded
+    columns = builder.build()
+
+    assert columns["n"].dtype == np.int64
+    assert columns["n"].tolist() == [1, 2**40, 3, 4]
+    assert columns["x"].dtype == np.float64
+    assert columns["x"].tolist() == [0.5, 2.0, None, 1.5]
+    assert columns["when"][0] == np.datetime64("2024-01-01T00:00:00.000")
+    assert columns["when"].mask.tolist() == [False, True, True, True]
+    assert columns["name"].tolist() == [None, "b", "c", "d"]
+    assert columns["missing"].mask.all()
+
+
+def test_object_ids_and_explicit_dtypes():
+    # Its trailing NULs must survive, which rules out NumPy's S dtypes
+    oid = bytes(range(1, 11)) + b"\x00\x00"
+    batch = [RawBSONDocument(with_object_id({"v": 7}, oid))]
+
+    columns = ColumnBuilder(["_id", "v"], dtypes={"v": "float32"}).build()
+    assert columns["v"].dtype == np.float32
+
+    builder = ColumnBuilder(["_id", "v"], dtypes={"v": "float32"}, mask=False)
+    builder.add(batch)
+    columns = builder.build()
+    assert columns["_id"].dtype == np.dtype("V12")
+    assert columns["_id"].tolist() == [oid]
+    assert columns["v"].dtype == np.float32
+
+    builder = ColumnBuilder(["v"], dtypes={"v": "bool"})
+    with pytest.raises(TypeError):
+        builder.add(batch)
+
+
+def test_decoded_documents_get_the_raw_dtypes():
+    oid = bytes(range(1, 11)) + b"\x00\x00"
+    when = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    documents = [
+        bson.loads(with_object_id(document, oid))
+        for document in [
+            {"n": 1, "x": 1, "ok": True, "when": when, "tags": ["a", "b"]},
+            {"n": 2, "x": 0.5, "ok": False, "when": when, "tags": ["c"]},
+            {"n": 3, "x": 2, "ok": True, "when": when, "tags": {"d": 1}},
+        ]
+    ]
+    builder = ColumnBuilder(["_id", "n", "x", "ok", "when", "tags"])
+    builder.add(documents)
+    columns = builder.build()
+
+    assert columns["_id"].dtype == np.dtype("V12")
+    assert columns["_id"].tolist() == [oid] * 3
+    assert columns["n"].dtype == np.int64
+    assert columns["x"].dtype == np.float64
+    assert columns["ok"].dtype == np.bool_
+    assert columns["when"].dtype == np.dtype("datetime64[ms]")
+    assert columns["when"][0] == np.datetime64("2024-01-01T00:00:00.000")
+    assert columns["tags"].dtype == np.dtype("object")
+    assert columns["tags"].tolist() == [["a", "b"], ["c"], {"d": 1}]
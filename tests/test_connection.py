@@ -0,0 +1,183 @@
+import asyncio
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import bson
+import pytest
+
+from asyncmongo.client_options import ClientOptions
+from asyncmongo.connection import AsyncMongoConnection, _MongoProtocol
+from asyncmongo.message import EXHAUST_ALLOWED, MORE_TO_COME, OP_MSG
+from asyncmongo.monitoring import CommandListener
+from benchmarks.fake_server import FakeServer
+
+
+def _reply(
+    request_id: int, doc: dict, response_to: int | None = None, flags: int = 0
+) -> bytes:
+    body = struct.pack("<IB", flags, 0) + bson.dumps(doc)
+    if response_to is None:
+        response_to = request_id
+    return struct.pack("<iiii", 16 + len(body), request_id, response_to, 2013) + body
+
+
+def test_protocol_reassembles_messages_across_reads():
+    sizes = [0, 10, 100_000, 5, 300_000]
+    frames = [_reply(i, {"i": i, "pad": "x" * size}) for i, size in enumerate(sizes)]
+    stream = b"".join(frames)
+
+    received = []
+    protocol = _MongoProtocol(received.append, lambda exc: None)
+    position = 0
+    while position < len(stream):
+        buffer = protocol.get_buffer(-1)
+        nbytes = min(len(buffer), 7_000, len(stream) - position)
+        buffer[:nbytes] = stream[position : position + nbytes]
+        protocol.buffer_updated(nbytes)
+        position += nbytes
+
+    assert [bytes(frame) for frame in received] == frames
+
+
+@pytest.mark.asyncio
+async def test_large_replies_are_decoded_in_the_executor():
+    decoded_in = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            decoded_in.append(len(args[0]))
+            return super().submit(fn, *args)
+
+    with RecordingExecutor(1) as executor:
+        connection = AsyncMongoConnection()
+        connection.options = ClientOptions(
+            decode_executor=executor, decode_threshold=1000
+        )
+        small = _reply(1, {"n": 1})
+        large = _reply(2, {"pad": "x" * 1000})
+
+        assert await connection._decode_reply(small, raw=False) == {"n": 1}
+        assert await connection._decode_reply(large, raw=False) == {"pad": "x" * 1000}
+        assert (await connection._decode_reply(large, raw=True))["pad"] == "x" * 1000
+
+    assert decoded_in == [len(large)]
+
+
+@pytest.mark.asyncio
+async def test_more_to_come_commands_do_not_wait_for_a_reply():
+    written = []
+
+    class Transport:
+        def writelines(self, parts):
+            written.append(b"".join(parts))
+
+    connection = AsyncMongoConnection()
+    connection.options = ClientOptions()
+    connection._transport = Transport()
+    connection._protocol = _MongoProtocol(None, None)
+
+    cmd = {"insert": "c", "documents": [{"x": 1}], "writeConcern": {"w": 0}}
+    assert await connection.command("db", cmd, flag_bits=MORE_TO_COME) is None
+    assert OP_MSG.from_buffer_copy(written[0]).flagBits == MORE_TO_COME
+    assert connection._pending == {}
+
+
+@pytest.mark.asyncio
+async def test_streamed_replies_are_read_without_requests():
+    written = []
+
+    class Transport:
+        reading = True
+
+        def writelines(self, parts):
+            written.append(b"".join(parts))
+
+        def pause_reading(self):
+            self.reading = False
+
+        def resume_reading(self):
+            self.reading = True
+
+    connection = AsyncMongoConnection()
+    connection.options = ClientOptions()
+    connection._transport = Transport()
+    connection._protocol = _MongoProtocol(None, None)
+
+    cmd = {"getMore": 1, "collection": "c"}
+    task = asyncio.create_task(connection.command("db", cmd, flag_bits=EXHAUST_ALLOWED))
+    await asyncio.sleep(0)
+    request = OP_MSG.from_buffer_copy(written[0])
+    assert request.flagBits == EXHAUST_ALLOWED
+
+    # Every batch arrives before the caller reads any of them
+    connection._on_message(_reply(50, {"n": 1}, request.requestID, MORE_TO_COME))
+    connection._on_message(_reply(51, {"n": 2}, 50, MORE_TO_COME))
+    connection._on_message(_reply(52, {"n": 3}, 51))
+
+    assert await task == {"n": 1}
+    assert connection.more_to_come
+    assert not connection._transport.reading
+    assert await connection.read() == {"n": 2}
+    assert await connection.read() == {"n": 3}
+    assert not connection.more_to_come
+    assert connection._transport.reading
+    assert len(written) == 1
+
+
+@pytest.mark.asyncio
+async def test_replies_are_compressed_end_to_end(caplog):
+    server = await FakeServer(compressors=["zlib"]).start()
+    server.seed("db.c", [{"_id": i, "text": "compressible " * 20} for i in range(50)])
+    succeeded = []
+
+    class Listener(CommandListener):
+        def succeeded(self, event):
+            succeeded.append(event)
+
+    options = ClientOptions(
+        compressors=["snappy", "zlib"], event_listeners=[Listener()]
+    )
+    try:
+        connection = await AsyncMongoConnection.create(
+            "127.0.0.1", server.port, options
+        )
+        reply = await connection.command("db", {"find": "c"})
+        await connection.close()
+    finally:
+        await server.stop()
+
+    assert "snappy" in caplog.text
+    assert server.commands[0]["compression"] == ["zlib"]
+    assert connection.compressor.name == "zlib"
+    assert len(reply["cursor"]["firstBatch"]) == 50
+    assert succeeded[-1].bytes_received < succeeded[-1].reply_size
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_replies_reach_their_callers():
+    written = []
+
+    class Transport:
+        def writelines(self, parts):
+            written.append(b"".join(parts))
+
+    connection = AsyncMongoConnection()
+    connection.options = ClientOptions()
+    connection._transport = Transport()
+    connection._protocol = _MongoProtocol(None, None)
+
+    tasks = [
+        asyncio.create_task(connection.command("db", {"ping": 1, "i": i}))
+        for i in range(5)
+    ]
+    await asyncio.sleep(0)
+    assert len(written) == 5
+
+    # Answer the last request first, echoing each request's "i"
+    for request in reversed(written):
+        request_id = OP_MSG.from_buffer_copy(request).requestID
+        command = bson.loads(request[21:])
+        connection._on_message(_reply(99, {"i": command["i"]}, request_id))
+
+    assert [await task for task in tasks] == [{"i": i} for i in range(5)]
+    assert connection._pending == {}
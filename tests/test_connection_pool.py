@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import deque
+
+import pytest
+
+import asyncmongo.client
+from asyncmongo.client_options import ClientOptions
+from asyncmongo.pool import ConnectionPool
+
+
+@pytest.mark.asyncio
+async def test_pool_prewarms_and_bounds_connections():
+    client = await asyncmongo.client.AsyncMongoClient.create(
+        min_pool_size=2, max_pool_size=4
+    )
+    pool = client.topology.servers[("localhost", 27017)].pool
+    assert pool.size == 2
+
+    products = client.exampleDB.products
+    resps = await asyncio.gather(*[products.insert_one({"x": i}) for i in range(20)])
+    assert all(resp["ok"] == 1.0 for resp in resps)
+    assert 2 <= pool.size <= 4
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_maintaining_after_errors(fake_server, monkeypatch):
+    options = ClientOptions(min_pool_size=1)
+    pool = ConnectionPool("127.0.0.1", fake_server.port, options)
+    pool.maintenance_interval = 0.01
+    failures = [ValueError("handshake failed")] * 2
+    connect = pool._connect
+
+    async def flaky_connect():
+        if failures:
+            raise failures.pop()
+        return await connect()
+
+    monkeypatch.setattr(pool, "_connect", flaky_connect)
+    with pytest.raises(ValueError):
+        await pool.open()
+    for _ in range(100):
+        if pool.size:
+            break
+        await asyncio.sleep(0.01)
+    assert pool.size == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_stale_connections_behind_fresh_ones(fake_server):
+    options = ClientOptions(min_pool_size=1, max_idle_time_ms=500)
+    pool = ConnectionPool("127.0.0.1", fake_server.port, options)
+    pool.maintenance_interval = 0.01
+    await pool.open()
+    stale, _ = pool._idle[0]
+
+    # Topping the pool up adds a fresh connection next to the old one
+    options.min_pool_size = 2
+    await pool._fill()
+    pool._idle = deque(
+        (connection, time.monotonic() - (1 if connection is stale else 0))
+        for connection, _ in pool._idle
+    )
+    await asyncio.sleep(0.1)
+
+    assert stale not in [connection for connection, _ in pool._idle]
+    assert pool.size == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_connect_times_out():
+    # Accepts connections but never answers the handshake
+    server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    pool = ConnectionPool("127.0.0.1", port, ClientOptions(connect_timeout_ms=50))
+    try:
+        with pytest.raises(TimeoutError):
+            async with pool.checkout():
+                pass
+        assert pool.size == 0
+    finally:
+        await pool.close()
+        server.close()
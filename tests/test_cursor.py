@@ -0,0 +1,201 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+import asyncmongo.client
+from asyncmongo.collection import Collection
+from asyncmongo.exceptions import InvalidOperation
+from asyncmongo.read_preferences import PRIMARY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 2])
+async def test_find_with_batch_size(fake_client, fake_server, prefetch):
+    fake_server.seed("exampleDB.cursor", [{"x": i} for i in range(250)])
+    collection = fake_client.exampleDB.cursor
+
+    cursor = collection.find(batch_size=50, prefetch=prefetch)
+    docs = [doc async for doc in cursor]
+    assert [doc["x"] for doc in docs] == list(range(250))
+    assert not cursor.alive
+
+
+def test_find_command_options():
+    database = SimpleNamespace(name="exampleDB", read_preference=PRIMARY)
+    cursor = (
+        Collection(database, "cursor")
+        .find({"x": {"$gt": 1}}, projection=["x"], max_time_ms=500)
+        .sort([("x", -1), ("y", 1)])
+        .hint("x_1")
+        .comment("report")
+    )
+
+    assert cursor._create_command() == {
+        "find": "cursor",
+        "filter": {"x": {"$gt": 1}},
+        "projection": {"x": 1},
+        "sort": {"x": -1, "y": 1},
+        "hint": "x_1",
+        "maxTimeMS": 500,
+        "comment": "report",
+    }
+    with pytest.raises(ValueError):
+        cursor.sort("x", 2)
+
+
+def test_hint_accepts_index_types():
+    database = SimpleNamespace(name="exampleDB", read_preference=PRIMARY)
+    collection = Collection(database, "cursor")
+
+    cursor = collection.find().hint([("loc", "2dsphere"), ("x", 1)])
+    assert cursor._create_command()["hint"] == {"loc": "2dsphere", "x": 1}
+    for index_type in ("text", "hashed", "2d"):
+        assert collection.find().hint({"f": index_type})._hint == {"f": index_type}
+    with pytest.raises(ValueError):
+        collection.find().hint([("x", "sideways")])
+    with pytest.raises(ValueError):
+        collection.find().sort("x", "hashed")
+
+
+def test_negative_limit_requests_a_single_batch():
+    database = SimpleNamespace(name="exampleDB", read_preference=PRIMARY)
+    cursor = Collection(database, "cursor").find(limit=-3)
+
+    assert cursor._create_command() == {
+        "find": "cursor",
+        "limit": 3,
+        "singleBatch": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_find_with_projection_sort_and_hint():
+    client = await asyncmongo.client.AsyncMongoClient.create()
+    collection = client.exampleDB.cursor
+    await collection.drop_collection()
+    await collection.insert_many([{"x": i, "y": -i} for i in range(10)])
+
+    cursor = collection.find({"x": {"$lt": 3}}, projection={"_id": 0, "x": 1})
+    docs = [doc async for doc in cursor.sort("x", -1).hint([("_id", 1)])]
+    assert docs == [{"x": 2}, {"x": 1}, {"x": 0}]
+    with pytest.raises(InvalidOperation):
+        cursor.limit(1)
+
+    plan = await collection.find({"x": 1}).explain()
+    assert "queryPlanner" in plan
+    doc = await collection.find_one(sort=[("y", 1)], projection=["x"])
+    assert set(doc) == {"_id", "x"}
+    assert doc["x"] == 9
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 2])
+async def test_batches_and_to_list(fake_client, fake_server, prefetch):
+    fake_server.seed("exampleDB.cursor", [{"x": i} for i in range(25)])
+    collection = fake_client.exampleDB.cursor
+
+    cursor = collection.find(batch_size=10, prefetch=prefetch)
+    assert [len(batch) async for batch in cursor.batches()] == [10, 10, 5]
+
+    cursor = collection.find(batch_size=10, prefetch=prefetch)
+    first = await cursor.to_list(13)
+    rest = await cursor.to_list()
+    assert [doc["x"] for doc in first + rest] == list(range(25))
+    assert await cursor.to_list() == []
+    assert not cursor.alive
+
+
+@pytest.mark.asyncio
+async def test_exhaust_cursor(fake_client, fake_server):
+    fake_server.seed("exampleDB.cursor", [{"x": i} for i in range(250)])
+    collection = fake_client.exampleDB.cursor
+
+    cursor = collection.find(batch_size=20, exhaust=True)
+    assert [doc["x"] async for doc in cursor] == list(range(250))
+
+    # The connection of an abandoned stream is not reused
+    async with collection.find(batch_size=20, exhaust=True) as cursor:
+        assert len(await cursor.to_list(30)) == 30
+    assert await collection.find_one({"x": 7}) is not None
+
+
+@pytest.mark.asyncio
+async def test_exhaust_cursor_streams_at_the_consumer_pace(fake_client, fake_server):
+    fake_server.seed(
+        "exampleDB.cursor", [{"_id": i, "pad": "x" * 10000} for i in range(5000)]
+    )
+    cursor = fake_client.exampleDB.cursor.find(batch_size=100, exhaust=True)
+
+    batches = cursor.batches()
+    assert len(await anext(batches)) == 100
+    await asyncio.sleep(0.2)
+    # The server is blocked on a full socket rather than done streaming. Socket
+    # buffers hold some batches, over a thousand documents on loopback
+    assert sum(len(rest) for rest in fake_server.cursors.values()) > 2000
+    assert sum([len(batch) async for batch in batches]) == 4900
+    assert sum("getMore" in command for command in fake_server.commands) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_size_and_prefetch(fake_client, fake_server):
+    fake_server.seed("exampleDB.cursor", [{"_id": i} for i in range(25)])
+    cursor = fake_client.exampleDB.cursor.find(batch_size=10, prefetch=2)
+
+    assert (await anext(cursor))["_id"] == 0
+    await asyncio.sleep(0.05)
+    # Both remaining batches were fetched while the first was being consumed
+    commands = [c for c in fake_server.commands if "find" in c or "getMore" in c]
+    assert [c.get("batchSize") for c in commands] == [10, 10, 10]
+    assert [doc["_id"] async for doc in cursor] == list(range(1, 25))
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan(fake_client, fake_server):
+    fake_server.seed("exampleDB.cursor", [{"_id": i, "x": i % 2} for i in range(1000)])
+    collection = fake_client.exampleDB.cursor
+
+    cursors = await collection.parallel_scan(4, batch_size=100)
+    assert 1 < len(cursors) <= 4
+    partitions = [[doc["_id"] for doc in await cursor.to_list()] for cursor in cursors]
+    assert sorted(sum(partitions, [])) == list(range(1000))
+    # The partitions are disjoint, consecutive ranges of _id
+    assert all(max(a) < min(b) for a, b in zip(partitions, partitions[1:]))
+
+    ids = [doc["_id"] async for doc in collection.parallel_find(4, {"x": 0})]
+    assert sorted(ids) == list(range(0, 1000, 2))
+
+
+@pytest.mark.asyncio
+async def test_cursors_are_killed_when_abandoned(fake_client, fake_server):
+    fake_server.seed("exampleDB.cursor", [{"_id": i} for i in range(100)])
+    collection = fake_client.exampleDB.cursor
+
+    def kills():
+        return [c["cursors"] for c in fake_server.commands if "killCursors" in c]
+
+    async with collection.find(batch_size=10) as cursor:
+        async for _ in cursor:
+            break
+        cursor_id = cursor._id
+    assert kills() == [[cursor_id]]
+    assert not cursor.alive
+    assert await cursor.to_list() == []
+    assert cursor_id not in fake_server.cursors
+
+    # Garbage collected cursors are killed in the background
+    cursor = collection.find(batch_size=10)
+    await anext(cursor)
+    cursor_id = cursor._id
+    del cursor
+    gc.collect()
+    await asyncio.sleep(0.05)
+    assert kills()[-1] == [cursor_id]
+
+    # find_one never leaves a cursor open, exhausted cursors need no kill
+    assert (await collection.find_one({"_id": 5}))["_id"] == 5
+    assert [c for c in fake_server.commands if "find" in c][-1]["singleBatch"]
+    assert len(await collection.find(batch_size=30).to_list()) == 100
+    assert len(kills()) == 2
+    assert fake_server.cursors == {}
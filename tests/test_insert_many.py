@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+import asyncmongo.client
+from asyncmongo.client import AsyncMongoClient
+from asyncmongo.operations import DeleteOne, InsertOne
+
+
+@pytest.mark.asyncio
+async def test_insert_many():
+    client = await asyncmongo.client.AsyncMongoClient.create()
+    db = client.exampleDB
+    products = db.products
+    resp = await products.insert_many([{"x": i} for i in range(1000)])
+    assert resp["ok"] == 1.0
+    assert resp["n"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_insert_many_unacknowledged():
+    client = await asyncmongo.client.AsyncMongoClient.create()
+    collection = client.exampleDB.unacknowledged
+    await collection.drop_collection()
+
+    resp = await collection.insert_many(
+        [{"x": i} for i in range(1000)], write_concern={"w": 0}
+    )
+    assert resp is None
+    # The server applies the writes in the background
+    for _ in range(100):
+        if len(await collection.find().to_list()) == 1000:
+            break
+        await asyncio.sleep(0.01)
+    assert len(await collection.find().to_list()) == 1000
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_insert_many_without_documents(fake_client, fake_server, ordered):
+    resp = await fake_client.exampleDB.products.insert_many([], ordered=ordered)
+    assert resp == {"n": 0, "ok": 1.0}
+    assert not [c for c in fake_server.commands if "insert" in c]
+
+
+@pytest.mark.asyncio
+async def test_insert_many_splits_batches(fake_server):
+    fake_server.hello = {"maxWriteBatchSize": 10, "maxMessageSizeBytes": 4000}
+    client = await AsyncMongoClient.create("127.0.0.1", fake_server.port)
+    try:
+        # Split by count, then by size: 20 documents of about 500 bytes
+        small = [{"x": i} for i in range(25)]
+        large = [{"x": i, "pad": "x" * 500} for i in range(20)]
+        assert (await client.exampleDB.small.insert_many(small))["n"] == 25
+        assert (await client.exampleDB.large.insert_many(large))["n"] == 20
+    finally:
+        await client.close()
+
+    inserts = [c for c in fake_server.commands if "insert" in c]
+    assert [len(c["documents"]) for c in inserts if c["insert"] == "small"] == [
+        10,
+        10,
+        5,
+    ]
+    large_batches = [len(c["documents"]) for c in inserts if c["insert"] == "large"]
+    assert len(large_batches) >= 3
+    assert max(large_batches) <= 7
+    assert fake_server.collections["exampleDB.small"] == small
+    assert fake_server.collections["exampleDB.large"] == large
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_pool_size", [1, 2])
+async def test_unordered_batches_do_not_exhaust_the_pool(fake_server, max_pool_size):
+    fake_server.hello = {"maxWriteBatchSize": 10}
+    client = await AsyncMongoClient.create(
+        "127.0.0.1", fake_server.port, max_pool_size=max_pool_size
+    )
+    collection = client.exampleDB.unordered
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                collection.insert_many([{"x": i} for i in range(25)], ordered=False),
+                collection.insert_many([{"x": i} for i in range(25)], ordered=False),
+                collection.bulk_write(
+                    [InsertOne({"x": i}) for i in range(25)] + [DeleteOne({"x": 0})],
+                    ordered=False,
+                ),
+            ),
+            5,
+        )
+    finally:
+        await client.close()
+
+    assert [result.get("n", result.get("nInserted")) for result in results] == [
+        25,
+        25,
+        25,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unacknowledged_writes_do_not_wait(fake_client, fake_server):
+    collection = fake_client.exampleDB.telemetry
+    await collection.find_one()  # Opens a pooled connection
+    # Every acknowledged write would take at least this long
+    fake_server.latency = 0.5
+
+    async def writes():
+        assert await collection.insert_one({"x": 0}, write_concern={"w": 0}) is None
+        docs = [{"x": i} for i in range(1, 100)]
+        assert await collection.insert_many(docs, write_concern={"w": 0}) is None
+        await collection.update_one({"x": 0}, {"x": -1}, write_concern={"w": 0})
+
+    await asyncio.wait_for(writes(), 0.25)
+    inserts = [c for c in fake_server.commands if "insert" in c]
+    assert all(c["writeConcern"] == {"w": 0} for c in inserts)
+
+    # The server still applies them, after its delay
+    stored = fake_server.collections.setdefault("exampleDB.telemetry", [])
+    for _ in range(200):
+        if {doc["x"] for doc in stored} == set(range(-1, 100)) - {0}:
+            break
+        await asyncio.sleep(0.01)
+    assert {doc["x"] for doc in stored} == set(range(-1, 100)) - {0}
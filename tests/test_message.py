@@ -0,0 +1,48 @@
+import bson
+
+from asyncmongo.compression import get_compressor
+from asyncmongo.message import OP_COMPRESSED, OP_MSG, next_request_id
+
+
+def test_request_ids_are_monotonic():
+    first = next_request_id()
+    second = next_request_id()
+    assert 0 < first < second
+
+
+def test_op_msg_new_stamps_request_id():
+    payload = OP_MSG.new({"ping": 1, "$db": "admin"}, request_id=42)
+    header = OP_MSG.from_buffer_copy(payload)
+    assert header.requestID == 42
+    assert header.opCode == 2013
+    assert header.messageLength == len(payload)
+    assert bson.loads(payload[21:]) == {"ping": 1, "$db": "admin"}
+
+    assert OP_MSG.from_buffer_copy(OP_MSG.new({"ping": 1})).requestID > 0
+
+
+def test_op_msg_new_appends_document_sequences():
+    docs = [bson.dumps({"x": 1}), bson.dumps({"x": 2})]
+    payload = OP_MSG.new({"insert": "c", "$db": "db"}, sequences={"documents": docs})
+    header = OP_MSG.from_buffer_copy(payload)
+    assert header.messageLength == len(payload)
+
+    command = bson.dumps({"insert": "c", "$db": "db"})
+    section = payload[21 + len(command) :]
+    assert section[0] == 1
+    assert int.from_bytes(section[1:5], "little") == len(section) - 1
+    assert section[5:15] == b"documents\x00"
+    assert section[15:] == b"".join(docs)
+
+
+def test_op_compressed_round_trip():
+    parts = OP_MSG.new_parts({"find": "c", "filter": {"x": "y" * 1000}, "$db": "db"})
+    original = b"".join(parts)
+    compressed = b"".join(OP_COMPRESSED.new(parts, get_compressor("zlib")))
+
+    header = OP_COMPRESSED.from_buffer_copy(compressed)
+    assert header.opCode == 2012
+    assert header.originalOpcode == 2013
+    assert header.compressorId == 2
+    assert header.messageLength == len(compressed) < len(original)
+    assert OP_COMPRESSED.decompress(compressed) == original
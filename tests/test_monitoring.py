@@ -0,0 +1,80 @@
+import pytest
+
+from asyncmongo.client import AsyncMongoClient
+from asyncmongo.exceptions import OperationFailure
+from asyncmongo.monitoring import (
+    CommandFailedEvent,
+    CommandLatencies,
+    CommandListener,
+    CommandStartedEvent,
+    CommandSucceededEvent,
+    LatencyHistogram,
+)
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.record(0.0001)  # 100us, in the [64us, 128us) bucket
+    histogram.record(0.05)
+    histogram.record(0.2)
+
+    assert histogram.count == 100
+    assert histogram.max == 0.2
+    assert histogram.percentile(50) == 128 / 1_000_000
+    assert histogram.percentile(99) == 65536 / 1_000_000
+    assert histogram.percentile(100) == 0.2
+
+
+def test_command_latencies_are_kept_per_command():
+    latencies = CommandLatencies()
+    latencies["find"].record(0.001)
+    latencies["insert"].failures += 1
+
+    assert latencies.to_dict()["find"]["count"] == 1
+    assert latencies.to_dict()["insert"]["failures"] == 1
+    assert latencies["getMore"].percentile(99) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_listeners_see_started_succeeded_and_failed_commands(fake_server):
+    events = []
+
+    class Listener(CommandListener):
+        def started(self, event):
+            events.append(event)
+
+        def succeeded(self, event):
+            events.append(event)
+
+        def failed(self, event):
+            events.append(event)
+
+    client = await AsyncMongoClient.create(
+        "127.0.0.1", fake_server.port, event_listeners=[Listener()]
+    )
+    collection = client.exampleDB.products
+    try:
+        await collection.find_one({"x": 1})
+        fake_server._cmd_find = lambda command: {
+            "ok": 0.0,
+            "errmsg": "unknown operator: $bad",
+            "code": 2,
+        }
+        with pytest.raises(OperationFailure):
+            await collection.find_one({"x": {"$bad": 1}})
+    finally:
+        await client.close()
+
+    finds = [event for event in events if event.command_name == "find"]
+    assert [type(event) for event in finds] == [
+        CommandStartedEvent,
+        CommandSucceededEvent,
+        CommandStartedEvent,
+        CommandFailedEvent,
+    ]
+    assert finds[0].command["filter"] == {"x": 1}
+    assert finds[1].reply["ok"] == 1.0
+    assert finds[3].failure.code == 2
+    assert client.command_latencies["find"].failures == 1
+    assert client.command_latencies["find"].count == 1
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+
+from asyncmongo.collection import Collection
+from asyncmongo.exceptions import OperationFailure
+from asyncmongo.message import OP_MSG
+from asyncmongo.read_preferences import PRIMARY
+
+
+def test_prepared_find_one_matches_op_msg():
+    collection = Collection(
+        SimpleNamespace(name="exampleDB", read_preference=PRIMARY), "users"
+    )
+    prepared = collection.prepare_find_one(fields=["name", "age"])
+
+    expected = OP_MSG.new(
+        {
+            "find": "users",
+            "filter": {"name": "James", "age": 21},
+            "limit": 1,
+            "singleBatch": True,
+            "$db": "exampleDB",
+        },
+        request_id=7,
+    )
+    assert b"".join(prepared.encode("James", 21, request_id=7)) == expected
+
+
+@pytest.mark.asyncio
+async def test_prepared_find_one_raises_server_errors(fake_client, fake_server):
+    fake_server.seed("exampleDB.users", [{"name": "James", "age": 21}])
+    prepared = fake_client.exampleDB.users.prepare_find_one(fields=["name"])
+    assert (await prepared("James"))["age"] == 21
+
+    fake_server._cmd_find = lambda command: {
+        "ok": 0.0,
+        "errmsg": "unknown operator: $bad",
+        "code": 2,
+    }
+    with pytest.raises(OperationFailure) as error:
+        await prepared("James")
+    assert error.value.code == 2
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+import bson
+
+from asyncmongo.raw_bson import RawBSONDocument
+
+
+def test_raw_document_decodes_fields_on_access():
+    doc = {
+        "name": "James",
+        "age": 21,
+        "big": 2**40,
+        "score": 1.5,
+        "active": True,
+        "nothing": None,
+        "born": datetime(2000, 1, 1, tzinfo=timezone.utc),
+        "blob": b"\x00\x01",
+        "address": {"city": "Kochi"},
+        "tags": ["a", {"b": 1}],
+    }
+    raw = RawBSONDocument(bson.dumps(doc))
+
+    assert list(raw) == list(doc)
+    assert len(raw) == len(doc)
+    for key in ("name", "age", "big", "score", "active", "nothing", "born", "blob"):
+        assert raw[key] == doc[key]
+    assert isinstance(raw["address"], RawBSONDocument)
+    assert raw["address"]["city"] == "Kochi"
+    assert raw["tags"][0] == "a"
+    assert raw["tags"][1]["b"] == 1
+    assert raw.to_dict() == bson.loads(bson.dumps(doc))
+
+
+def test_raw_document_shares_the_buffer():
+    encoded = bson.dumps({"cursor": {"firstBatch": [{"x": 1}, {"x": 2}]}})
+    reply = RawBSONDocument(memoryview(encoded))
+    batch = reply["cursor"]["firstBatch"]
+
+    assert [doc["x"] for doc in batch] == [1, 2]
+    assert batch[1].raw == bson.dumps({"x": 2})
+    assert batch[1].view.obj is encoded
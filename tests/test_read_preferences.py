@@ -0,0 +1,87 @@
+import pytest
+
+from asyncmongo.client import AsyncMongoClient
+from asyncmongo.client_options import parse_uri_options
+from asyncmongo.exceptions import ConfigurationError
+from asyncmongo.read_preferences import ReadPreference
+from asyncmongo.topology import ServerDescription
+from asyncmongo.uri_parser import parse_uri
+
+
+def _member(port: int, server_type: str, dc: str) -> ServerDescription:
+    hello = {"ok": 1.0, "setName": "rs0", "tags": {"dc": dc}}
+    return ServerDescription(("localhost", port), server_type, 0.001, hello)
+
+
+SERVERS = [
+    _member(27017, "RSPrimary", "ny"),
+    _member(27018, "RSSecondary", "ny"),
+    _member(27019, "RSSecondary", "sf"),
+]
+
+
+def _ports(read_preference: ReadPreference, servers=SERVERS) -> list[int]:
+    return [d.address[1] for d in read_preference.select(servers, 10.0)]
+
+
+def test_modes_select_members():
+    assert _ports(ReadPreference("primary")) == [27017]
+    assert _ports(ReadPreference("primaryPreferred")) == [27017]
+    assert _ports(ReadPreference("primaryPreferred"), SERVERS[1:]) == [27018, 27019]
+    assert _ports(ReadPreference("secondary")) == [27018, 27019]
+    assert _ports(ReadPreference("secondaryPreferred"), SERVERS[:1]) == [27017]
+    assert _ports(ReadPreference("nearest")) == [27017, 27018, 27019]
+
+
+def test_tag_sets_use_first_match():
+    tags = [{"dc": "la"}, {"dc": "sf"}, {}]
+    assert _ports(ReadPreference("secondary", tags)) == [27019]
+    assert _ports(ReadPreference("secondary", [{"dc": "la"}])) == []
+
+
+def test_invalid_read_preferences():
+    with pytest.raises(ValueError):
+        ReadPreference("fastest")
+    with pytest.raises(ValueError):
+        ReadPreference("primary", [{"dc": "ny"}])
+    with pytest.raises(ConfigurationError):
+        ReadPreference("secondary", max_staleness_seconds=30)
+    # The smallest maxStalenessSeconds also grows with the heartbeat frequency
+    with pytest.raises(ConfigurationError):
+        ReadPreference("secondary", max_staleness_seconds=100).select(SERVERS, 100.0)
+
+
+def test_read_preference_uri_options():
+    options = {"readPreference": "nearest", "readPreferenceTags": "dc:ny,rack:1"}
+    read_preference = parse_uri_options(options)["read_preference"]
+    assert read_preference.document == {
+        "mode": "nearest",
+        "tags": [{"dc": "ny", "rack": "1"}],
+    }
+
+
+def test_repeated_read_preference_tags_uri_options():
+    uri = parse_uri(
+        "mongodb://localhost/?readPreference=secondary"
+        "&readPreferenceTags=dc:ny,rack:1&readPreferenceTags=dc:sf&readPreferenceTags="
+    )
+    read_preference = parse_uri_options(uri["options"])["read_preference"]
+    assert read_preference.tag_sets == ({"dc": "ny", "rack": "1"}, {"dc": "sf"}, {})
+
+
+@pytest.mark.asyncio
+async def test_direct_connection_to_secondary_reads_primary_preferred(fake_server):
+    fake_server.hello = {
+        "setName": "rs0",
+        "isWritablePrimary": False,
+        "secondary": True,
+    }
+    fake_server.seed("exampleDB.users", [{"name": "ada"}])
+    client = await AsyncMongoClient.create("127.0.0.1", fake_server.port)
+    try:
+        assert await client.exampleDB.users.find_one({}) == {"name": "ada"}
+    finally:
+        await client.close()
+
+    find = next(c for c in fake_server.commands if "find" in c)
+    assert find["$readPreference"] == {"mode": "primaryPreferred"}
@@ -0,0 +1,46 @@
+from asyncmongo.result_cache import ResultCache, cache_key
+
+
+def test_cache_key_normalizes_equivalent_finds():
+    a = cache_key({"find": "c", "filter": {"a": 1, "b": {"$lt": 5, "$gte": 1}}})
+    b = cache_key(
+        {"filter": {"b": {"$gte": 1, "$lt": 5}, "a": 1}, "find": "c", "batchSize": 10}
+    )
+
+    assert a == b
+    assert cache_key({"find": "c", "filter": {"a": 1}}) != cache_key(
+        {"find": "c", "filter": {"a": True}}
+    )
+    # Embedded documents only match with their fields in the same order
+    assert cache_key({"find": "c", "filter": {"a": {"x": 1, "y": 2}}}) != cache_key(
+        {"find": "c", "filter": {"a": {"y": 2, "x": 1}}}
+    )
+
+
+def test_result_cache_lru_and_stats():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", [{"_id": 1}], cache.generation)
+    cache.put("b", [{"_id": 2}], cache.generation)
+    cache.get("a")[0]["_id"] = 5  # Results are copies
+    cache.put("c", [{"_id": 3}], cache.generation)
+
+    assert cache.get("a") == [{"_id": 1}]
+    assert cache.get("b") is None
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+    assert cache.stats.evictions == 1
+
+
+def test_result_cache_invalidation_and_ttl(monkeypatch):
+    cache = ResultCache(ttl=10)
+    generation = cache.generation
+    cache.put("a", [{"_id": 1}], generation)
+    cache.invalidate()
+    # Results of queries sent before the write are dropped
+    cache.put("a", [{"_id": 1}], generation)
+    assert cache.get("a") is None
+
+    cache.put("a", [{"_id": 1}], cache.generation)
+    monkeypatch.setattr("time.monotonic", lambda: float("inf"))
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1